@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the snippet field extractors.
+
+Compares the original extract_* functions from scrape_cities_enhanced.py
+(copied below as the baseline) with src/scraper/field_extractor.py:
+checks that both give the same value for every field of every snippet,
+then reports snippets/second for each.
+
+Usage:
+    python benchmark_extractors.py [sample_3_cities_enhanced.json ...] [--rounds N]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'scraper'))
+
+from field_extractor import FIELDS, extractor
+
+
+# ── BASELINE: extract_* as they were before field_extractor.py ──────────────
+
+def legacy_extract_phone_numbers(text):
+    """Extract phone numbers from text"""
+    patterns = [
+        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
+        r'\d{3}[-.\s]\d{4}',  # 311 or 3-1-1
+        r'3-1-1',  # 311 format
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(0)
+    return None
+
+
+def legacy_extract_fine_amount(text):
+    """Extract fine amounts from text"""
+    patterns = [
+        r'\$[\d,]+(?:\s*(?:to|-|–)\s*\$[\d,]+)?',  # $500 to $1,000
+        r'up to \$[\d,]+',  # up to $1,000
+        r'\$[\d,]+ fine',  # $500 fine
+        r'\$[\d,]+ citation',  # $500 citation
+        r'fine[s]?\s+(?:of|up to|range from)?\s*\$[\d,]+',  # fines of $500
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.group(0)
+    return None
+
+
+def legacy_extract_hours(text):
+    """Extract operating hours from text"""
+    patterns = [
+        # Full schedule with days: Mon-Fri 8:00AM-5:00PM
+        r'(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)(?:\s*[-–]\s*(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday))?\s*:?\s*\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)\s*(?:to|-|–)\s*\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)',
+        # Simple time range: 8:00AM-5:00PM or 8AM-5PM
+        r'\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm)\s*(?:to|-|–)\s*\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm)',
+        # 24-hour format: 08:00-17:00
+        r'\d{2}:\d{2}\s*(?:to|-|–)\s*\d{2}:\d{2}',
+        # Days only: Monday-Friday, Sat-Sun
+        r'(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)\s*[-–]\s*(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)',
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            hours = match.group(0)
+            # Clean up the hours string
+            hours = re.sub(r'\s+', ' ', hours)
+            return hours
+    
+    # Check for "by appointment" or "call for hours"
+    if 'by appointment' in text.lower():
+        return 'By appointment only'
+    if 'call' in text.lower() and 'hour' in text.lower():
+        return 'Call for hours'
+    
+    return None
+
+
+def legacy_extract_address(text):
+    """Extract addresses from text"""
+    # Look for street addresses with various formats
+    patterns = [
+        # Standard: 123 Main Street
+        r'\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Blvd|Boulevard|Way|Lane|Ln|Ct|Court|Pl|Place|Pkwy|Parkway)\.?(?:\s*,?\s*[A-Z][a-z]+)?',
+        # With suite/unit: 123 Main St, Suite 100
+        r'\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:St|Street|Ave|Avenue|Rd|Road)\.?(?:\s*,?\s*(?:Suite|Ste|Unit|#)\s*\d+)?',
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(0)
+    return None
+
+
+def legacy_extract_fee_amount(text):
+    """Extract tipping fees or disposal costs"""
+    patterns = [
+        r'\$\d+(?:\.\d{2})?\s*(?:per|/)\s*(?:mattress|item|ton)',  # $25 per mattress
+        r'(?:fee|cost|charge|tip)(?:\s+is)?\s*\$\d+(?:\.\d{2})?',  # fee is $25
+        r'\$\d+(?:\.\d{2})?\s+(?:fee|charge|cost)',  # $25 fee
+        r'(?:tipping|disposal)\s+fee[s]?:\s*\$\d+(?:\.\d{2})?',  # tipping fee: $25
+    ]
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            # Extract just the dollar amount
+            amount_match = re.search(r'\$\d+(?:\.\d{2})?', match.group(0))
+            if amount_match:
+                return amount_match.group(0)
+    return None
+
+
+def legacy_extract_wrapping_requirement(text):
+    """Extract specific wrapping/bagging requirements"""
+    text_lower = text.lower()
+    
+    # Check for plastic wrap requirement
+    if 'plastic' in text_lower and ('wrap' in text_lower or 'bag' in text_lower or 'cover' in text_lower):
+        if 'must' in text_lower or 'required' in text_lower or 'need' in text_lower:
+            return "Must be wrapped in plastic before curbside placement"
+    
+    # Check for no wrapping required
+    if 'no wrap' in text_lower or 'not required' in text_lower:
+        return "No wrapping required"
+    
+    # Check for sealed bag requirement
+    if 'sealed' in text_lower and 'bag' in text_lower:
+        return "Must be in sealed plastic bag"
+    
+    return None
+
+
+def legacy_extract_placement_time(text):
+    """Extract placement timing requirements"""
+    text_lower = text.lower()
+    
+    # Night before patterns
+    if 'night before' in text_lower or 'evening before' in text_lower:
+        if '6' in text or 'six' in text_lower:
+            return "No earlier than 6PM the night before pickup"
+        elif '7' in text or 'seven' in text_lower:
+            return "No earlier than 7PM the night before pickup"
+        else:
+            return "Evening before scheduled pickup"
+    
+    # Morning of patterns
+    if 'morning of' in text_lower or 'day of' in text_lower:
+        if '6' in text or 'six' in text_lower:
+            return "After 6AM on day of pickup"
+        elif '7' in text or 'seven' in text_lower:
+            return "After 7AM on day of pickup"
+        else:
+            return "Morning of scheduled pickup"
+    
+    # Specific time patterns
+    time_match = re.search(r'(?:after|no earlier than)\s+(\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm))', text_lower)
+    if time_match:
+        return f"No earlier than {time_match.group(1)}"
+    
+    return None
+
+
+def legacy_extract_size_limits(text):
+    """Extract size/quantity limits"""
+    text_lower = text.lower()
+    
+    # Look for quantity limits with various patterns
+    patterns = [
+        (r'(?:max|maximum|limit|up to)\s+(\d+)\s+(?:mattress|item)', 'Max {} mattresses per household per collection'),
+        (r'(\d+)\s+(?:mattress|item)\s+(?:max|maximum|limit|per)', 'Max {} mattresses per household per collection'),
+        (r'no more than\s+(\d+)', 'No more than {} mattresses per collection'),
+        (r'limit(?:ed)? to\s+(\d+)', 'Limited to {} mattresses per household'),
+        (r'(\d+)\s+per\s+(?:household|residence|pickup)', '{} mattresses per household per pickup'),
+    ]
+    
+    for pattern, template in patterns:
+        match = re.search(pattern, text_lower)
+        if match:
+            num = match.group(1)
+            return template.format(num)
+    
+    # Check for "unlimited" or "no limit"
+    if 'no limit' in text_lower or 'unlimited' in text_lower:
+        return 'No specific limit - check with local department'
+    
+    return None
+
+
+def legacy_extract_schedule_days(text):
+    """Extract next available pickup days"""
+    text_lower = text.lower()
+    
+    # Look for specific day patterns
+    patterns = [
+        r'(?:next|available|schedule).*?(\d+)\s*(?:day|business day)',
+        r'(?:within|in)\s+(\d+)\s*(?:day|business day)',
+        r'(\d+)[-\s](?:day|business day)\s+(?:notice|advance|wait)',
+        r'(?:wait|waiting)\s+(?:time|period).*?(\d+)\s*(?:day|week)',
+    ]
+    
+    for pattern in patterns:
+        match = re.search(pattern, text_lower)
+        if match:
+            num = int(match.group(1))
+            # Convert weeks to days
+            if 'week' in match.group(0):
+                num = num * 7
+            # Only accept reasonable ranges (1-30 days)
+            if 1 <= num <= 30:
+                return num
+    
+    return None
+
+
+LEGACY = {
+    'phone': legacy_extract_phone_numbers,
+    'fine': legacy_extract_fine_amount,
+    'hours': legacy_extract_hours,
+    'address': legacy_extract_address,
+    'fee': legacy_extract_fee_amount,
+    'wrapping': legacy_extract_wrapping_requirement,
+    'placement_time': legacy_extract_placement_time,
+    'size_limits': legacy_extract_size_limits,
+    'schedule_days': legacy_extract_schedule_days,
+}
+
+
+def load_snippets(paths):
+    """Every title, snippet and "title snippet" string in the given city files."""
+    snippets = []
+    for path in paths:
+        with open(path) as f:
+            cities = json.load(f)
+        for city in cities:
+            for entry in city.get('raw_queries', {}).values():
+                results = entry.get('results') if isinstance(entry, dict) else None
+                if not isinstance(results, dict):
+                    continue
+                for result in results.get('organic', []):
+                    title = result.get('title', '')
+                    snippet = result.get('snippet', '')
+                    snippets.extend([title, snippet, f"{title} {snippet}"])
+    return snippets
+
+
+def check_equivalence(snippets):
+    """Field/snippet pairs where the engine disagrees with the baseline."""
+    mismatches = []
+    for text in snippets:
+        values = extractor.extract(text)
+        for field in FIELDS:
+            expected = LEGACY[field](text)
+            if values[field] != expected:
+                mismatches.append((field, text, expected, values[field]))
+    return mismatches
+
+
+def bench(label, fn, snippets, rounds):
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for text in snippets:
+            fn(text)
+        best = min(best, time.perf_counter() - start)
+    rate = len(snippets) / best
+    print(f"  {label:<38} {rate:>12,.0f} snippets/sec")
+    return rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('files', nargs='*', help='Enhanced city JSON files with inline raw_queries '
+                                                 '(default: sample_*_cities_enhanced.json)')
+    parser.add_argument('--rounds', type=int, default=5, help='Timed rounds; the best is reported')
+    args = parser.parse_args()
+    
+    here = os.path.dirname(os.path.abspath(__file__))
+    paths = args.files or sorted(glob.glob(os.path.join(here, 'sample_*_cities_enhanced.json')))
+    snippets = load_snippets(paths)
+    if not snippets:
+        sys.exit("No snippets found (the files need inline raw_queries)")
+    print(f"{len(snippets)} snippets from {len(paths)} file(s)")
+    
+    mismatches = check_equivalence(snippets)
+    if mismatches:
+        for field, text, expected, got in mismatches[:10]:
+            print(f"  MISMATCH {field}: expected {expected!r}, got {got!r} for {text[:80]!r}")
+        sys.exit(f"{len(mismatches)} mismatch(es) between baseline and engine")
+    print(f"Equivalence: all {len(FIELDS)} fields match on every snippet")
+    
+    print("All fields per snippet:")
+    before = bench('baseline (9 extract_* calls)',
+                   lambda text: [fn(text) for fn in LEGACY.values()], snippets, args.rounds)
+    after = bench('FieldExtractor.extract()', extractor.extract, snippets, args.rounds)
+    print(f"  speedup: {after / before:.1f}x")
+    
+    print("Full candidate scan:")
+    bench('FieldExtractor.scan()', extractor.scan, snippets, args.rounds)
+
+
+if __name__ == '__main__':
+    main()
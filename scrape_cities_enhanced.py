@@ -3,19 +3,32 @@
 Enhanced City Data Scraper with Smart Extraction
 Gathers all required data for city pages with intelligent parsing
 """
+import argparse
+import asyncio
 import requests
-import json
 import time
 import os
 import re
+import sys
 from datetime import datetime
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'scraper'))
+
+from output_store import BlobStore, RecordStore
+from field_extractor import extractor
+
 load_dotenv()
 
 SERPER_API_KEY = os.getenv('SERPER_API_KEY')
 SERPER_URL = "https://google.serper.dev/search"
 
+# Serper answers a JSON array of queries in one POST; this many go per request.
+SERPER_BATCH_SIZE = max(1, int(os.getenv('SERPER_BATCH_SIZE', '50')))
+
+# Serper requests per second across all cities in --async mode.
+SERPER_RATE_LIMIT = float(os.getenv('SERPER_RATE_LIMIT', '5'))
+
 if not SERPER_API_KEY:
     raise EnvironmentError("SERPER_API_KEY not found in .env file")
 
@@ -52,215 +65,224 @@ def search_serper(query, num_results=10):
         return {'error': str(e)}
 
 
+def post_serper_batch(queries):
+    """
+    One Serper request for a list of (query, num_results) pairs: Serper
+    accepts a JSON array of queries in one POST and answers with an array
+    in the same order. Returns one result per query, as search_serper
+    would ({'error': ...} for every query if the request fails).
+    """
+    headers = {
+        'X-API-KEY': SERPER_API_KEY,
+        'Content-Type': 'application/json'
+    }
+    
+    payload = [
+        {'q': query, 'num': num_results, 'gl': 'us', 'hl': 'en'}
+        for query, num_results in queries
+    ]
+    try:
+        response = requests.post(SERPER_URL, json=payload, headers=headers,
+                                 timeout=15 + len(payload))
+        response.raise_for_status()
+        results = response.json()
+        if not isinstance(results, list) or len(results) != len(queries):
+            raise ValueError(f'Serper batch of {len(queries)} returned an unexpected response')
+        return results
+    except (requests.exceptions.RequestException, ValueError) as e:
+        return [{'error': str(e)} for _ in queries]
+
+
+def search_serper_batch(queries):
+    """
+    Search a list of (query, num_results) pairs with as few requests as
+    possible, SERPER_BATCH_SIZE queries per request.
+    """
+    answers = []
+    for start in range(0, len(queries), SERPER_BATCH_SIZE):
+        answers.extend(post_serper_batch(queries[start:start + SERPER_BATCH_SIZE]))
+    return answers
+
+
+class RequestPacer:
+    """Spaces out Serper requests from concurrent tasks to `rate` per second."""
+    
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next_slot = 0.0
+    
+    async def wait(self):
+        now = time.monotonic()
+        slot = max(self._next_slot, now)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+async def search_serper_batch_async(queries, pacer):
+    """
+    search_serper_batch for asyncio: every SERPER_BATCH_SIZE chunk is sent
+    concurrently (in a worker thread, since requests blocks), paced by
+    `pacer`. Results come back in query order.
+    """
+    async def post(chunk):
+        await pacer.wait()
+        return await asyncio.to_thread(post_serper_batch, chunk)
+    
+    chunks = [queries[start:start + SERPER_BATCH_SIZE]
+              for start in range(0, len(queries), SERPER_BATCH_SIZE)]
+    answers = []
+    for chunk_answers in await asyncio.gather(*(post(chunk) for chunk in chunks)):
+        answers.extend(chunk_answers)
+    return answers
+
+
+# Field extraction runs on the precompiled rules in field_extractor.py;
+# these wrappers keep the original one-field-per-call interface.
+
 def extract_phone_numbers(text):
     """Extract phone numbers from text"""
-    patterns = [
-        r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # (123) 456-7890
-        r'\d{3}[-.\s]\d{4}',  # 311 or 3-1-1
-        r'3-1-1',  # 311 format
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(0)
-    return None
+    return extractor.extract_field('phone', text)
 
 
 def extract_fine_amount(text):
     """Extract fine amounts from text"""
-    patterns = [
-        r'\$[\d,]+(?:\s*(?:to|-|–)\s*\$[\d,]+)?',  # $500 to $1,000
-        r'up to \$[\d,]+',  # up to $1,000
-        r'\$[\d,]+ fine',  # $500 fine
-        r'\$[\d,]+ citation',  # $500 citation
-        r'fine[s]?\s+(?:of|up to|range from)?\s*\$[\d,]+',  # fines of $500
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(0)
-    return None
+    return extractor.extract_field('fine', text)
 
 
 def extract_hours(text):
     """Extract operating hours from text"""
-    patterns = [
-        # Full schedule with days: Mon-Fri 8:00AM-5:00PM
-        r'(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)(?:\s*[-–]\s*(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday))?\s*:?\s*\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)\s*(?:to|-|–)\s*\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)',
-        # Simple time range: 8:00AM-5:00PM or 8AM-5PM
-        r'\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm)\s*(?:to|-|–)\s*\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm)',
-        # 24-hour format: 08:00-17:00
-        r'\d{2}:\d{2}\s*(?:to|-|–)\s*\d{2}:\d{2}',
-        # Days only: Monday-Friday, Sat-Sun
-        r'(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)\s*[-–]\s*(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            hours = match.group(0)
-            # Clean up the hours string
-            hours = re.sub(r'\s+', ' ', hours)
-            return hours
-    
-    # Check for "by appointment" or "call for hours"
-    if 'by appointment' in text.lower():
-        return 'By appointment only'
-    if 'call' in text.lower() and 'hour' in text.lower():
-        return 'Call for hours'
-    
-    return None
+    return extractor.extract_field('hours', text)
 
 
 def extract_address(text):
     """Extract addresses from text"""
-    # Look for street addresses with various formats
-    patterns = [
-        # Standard: 123 Main Street
-        r'\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|Blvd|Boulevard|Way|Lane|Ln|Ct|Court|Pl|Place|Pkwy|Parkway)\.?(?:\s*,?\s*[A-Z][a-z]+)?',
-        # With suite/unit: 123 Main St, Suite 100
-        r'\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:St|Street|Ave|Avenue|Rd|Road)\.?(?:\s*,?\s*(?:Suite|Ste|Unit|#)\s*\d+)?',
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
-        if match:
-            return match.group(0)
-    return None
+    return extractor.extract_field('address', text)
 
 
 def extract_fee_amount(text):
     """Extract tipping fees or disposal costs"""
-    patterns = [
-        r'\$\d+(?:\.\d{2})?\s*(?:per|/)\s*(?:mattress|item|ton)',  # $25 per mattress
-        r'(?:fee|cost|charge|tip)(?:\s+is)?\s*\$\d+(?:\.\d{2})?',  # fee is $25
-        r'\$\d+(?:\.\d{2})?\s+(?:fee|charge|cost)',  # $25 fee
-        r'(?:tipping|disposal)\s+fee[s]?:\s*\$\d+(?:\.\d{2})?',  # tipping fee: $25
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            # Extract just the dollar amount
-            amount_match = re.search(r'\$\d+(?:\.\d{2})?', match.group(0))
-            if amount_match:
-                return amount_match.group(0)
-    return None
+    return extractor.extract_field('fee', text)
 
 
 def extract_wrapping_requirement(text):
     """Extract specific wrapping/bagging requirements"""
-    text_lower = text.lower()
-    
-    # Check for plastic wrap requirement
-    if 'plastic' in text_lower and ('wrap' in text_lower or 'bag' in text_lower or 'cover' in text_lower):
-        if 'must' in text_lower or 'required' in text_lower or 'need' in text_lower:
-            return "Must be wrapped in plastic before curbside placement"
-    
-    # Check for no wrapping required
-    if 'no wrap' in text_lower or 'not required' in text_lower:
-        return "No wrapping required"
-    
-    # Check for sealed bag requirement
-    if 'sealed' in text_lower and 'bag' in text_lower:
-        return "Must be in sealed plastic bag"
-    
-    return None
+    return extractor.extract_field('wrapping', text)
 
 
 def extract_placement_time(text):
     """Extract placement timing requirements"""
-    text_lower = text.lower()
-    
-    # Night before patterns
-    if 'night before' in text_lower or 'evening before' in text_lower:
-        if '6' in text or 'six' in text_lower:
-            return "No earlier than 6PM the night before pickup"
-        elif '7' in text or 'seven' in text_lower:
-            return "No earlier than 7PM the night before pickup"
-        else:
-            return "Evening before scheduled pickup"
-    
-    # Morning of patterns
-    if 'morning of' in text_lower or 'day of' in text_lower:
-        if '6' in text or 'six' in text_lower:
-            return "After 6AM on day of pickup"
-        elif '7' in text or 'seven' in text_lower:
-            return "After 7AM on day of pickup"
-        else:
-            return "Morning of scheduled pickup"
-    
-    # Specific time patterns
-    time_match = re.search(r'(?:after|no earlier than)\s+(\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm))', text_lower)
-    if time_match:
-        return f"No earlier than {time_match.group(1)}"
-    
-    return None
+    return extractor.extract_field('placement_time', text)
 
 
 def extract_size_limits(text):
     """Extract size/quantity limits"""
-    text_lower = text.lower()
-    
-    # Look for quantity limits with various patterns
-    patterns = [
-        (r'(?:max|maximum|limit|up to)\s+(\d+)\s+(?:mattress|item)', 'Max {} mattresses per household per collection'),
-        (r'(\d+)\s+(?:mattress|item)\s+(?:max|maximum|limit|per)', 'Max {} mattresses per household per collection'),
-        (r'no more than\s+(\d+)', 'No more than {} mattresses per collection'),
-        (r'limit(?:ed)? to\s+(\d+)', 'Limited to {} mattresses per household'),
-        (r'(\d+)\s+per\s+(?:household|residence|pickup)', '{} mattresses per household per pickup'),
-    ]
-    
-    for pattern, template in patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            num = match.group(1)
-            return template.format(num)
-    
-    # Check for "unlimited" or "no limit"
-    if 'no limit' in text_lower or 'unlimited' in text_lower:
-        return 'No specific limit - check with local department'
-    
-    return None
+    return extractor.extract_field('size_limits', text)
 
 
 def extract_schedule_days(text):
     """Extract next available pickup days"""
-    text_lower = text.lower()
-    
-    # Look for specific day patterns
-    patterns = [
-        r'(?:next|available|schedule).*?(\d+)\s*(?:day|business day)',
-        r'(?:within|in)\s+(\d+)\s*(?:day|business day)',
-        r'(\d+)[-\s](?:day|business day)\s+(?:notice|advance|wait)',
-        r'(?:wait|waiting)\s+(?:time|period).*?(\d+)\s*(?:day|week)',
+    return extractor.extract_field('schedule_days', text)
+
+
+def build_city_queries(city):
+    """
+    Every search for a city as (raw_queries key, query, num_results), in
+    the order scrape_city_data reads the results.
+    """
+    return [
+        ('official_dept', f'site:.gov "{city}" Massachusetts sanitation department contact', 10),
+        ('waste_rules', f'"{city}" MA mattress disposal curbside pickup rules requirements wrapping bagging', 10),
+        ('fines', f'"{city}" Massachusetts illegal dumping fine penalty amount', 10),
+        ('facilities', f'"{city}" MA transfer station recycling center mattress disposal address hours fees open', 10),
+        ('facility_hours', f'"{city}" MA transfer station phone number hours contact', 5),
+        ('pricing', f'mattress removal "{city}" MA price cost "$" 2026', 10),
+        ('donation', f'"{city}" MA mattress donation Goodwill Habitat for Humanity', 10),
+        ('weather', f'"{city}" Massachusetts average rainfall climate', 10),
+        ('neighborhoods', f'"{city}" Massachusetts neighborhoods list complete all', 10),
+        ('neighborhoods_official', f'site:wikipedia.org OR site:.gov "{city}" Massachusetts neighborhoods official', 5),
+        # Additional data gathering
+        ('schedule', f'"{city}" MA bulk trash pickup schedule frequency appointment days', 10),
+        ('schedule_specific', f'"{city}" Massachusetts bulky item next available pickup date wait time', 10),
+        ('schedule_advance', f'"{city}" MA mattress pickup how many days advance notice required', 10),
+        ('ordinance', f'site:.gov "{city}" MA city code illegal dumping ordinance', 10),
+        ('fees_detailed', f'"{city}" Massachusetts waste disposal fees tipping cost per ton mattress "$"', 10),
+        ('recycling', f'"{city}" MA mattress recycling program free', 10),
+        ('bulky_items', f'"{city}" Massachusetts bulky item collection appointment schedule advance', 10),
+        ('permits', f'"{city}" MA waste disposal permit requirements resident', 10),
+        ('enforcement', f'"{city}" Massachusetts illegal dumping enforcement cameras fine', 10),
+        ('placement_rules', f'"{city}" MA curbside mattress placement time rules when', 10),
+        ('size_limits', f'"{city}" MA mattress disposal limit maximum how many per household', 10),
+        ('hours_specific', f'"{city}" MA transfer station hours open close schedule', 10),
     ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, text_lower)
-        if match:
-            num = int(match.group(1))
-            # Convert weeks to days
-            if 'week' in match.group(0):
-                num = num * 7
-            # Only accept reasonable ranges (1-30 days)
-            if 1 <= num <= 30:
-                return num
-    
-    return None
 
 
-def scrape_city_data(city):
-    """Scrape comprehensive data for a city"""
+ADDITIONAL_QUERY_KEYS = [
+    'schedule', 'schedule_specific', 'schedule_advance', 'ordinance',
+    'fees_detailed', 'recycling', 'bulky_items', 'permits', 'enforcement',
+    'placement_rules', 'size_limits', 'hours_specific',
+]
+
+
+def fetch_city_results(cities):
+    """
+    Run every city's queries through search_serper_batch.
+
+    Returns {city: {key: {'query': ..., 'results': ...}}}, the shape
+    stored under raw_queries.
+    """
+    planned = _plan_queries(cities)
+    answers = search_serper_batch([(query, num) for _, _, query, num in planned])
+    return _group_results(cities, planned, answers)
+
+
+async def fetch_city_results_async(cities, pacer):
+    """fetch_city_results for asyncio, see search_serper_batch_async."""
+    planned = _plan_queries(cities)
+    answers = await search_serper_batch_async(
+        [(query, num) for _, _, query, num in planned], pacer
+    )
+    return _group_results(cities, planned, answers)
+
+
+def _plan_queries(cities):
+    return [(city, key, query, num) for city in cities
+            for key, query, num in build_city_queries(city)]
+
+
+def _group_results(cities, planned, answers):
+    fetched = {city: {} for city in cities}
+    for (city, key, query, _), results in zip(planned, answers):
+        fetched[city][key] = {'query': query, 'results': results}
+    return fetched
+
+
+def scrape_city_data(city, fetched=None, now=None, raw_store=None):
+    """
+    Scrape comprehensive data for a city.
+    
+    `fetched` is the city's entry from fetch_city_results; without it the
+    city's queries are fetched here. `now` fixes the record's timestamps
+    (default: the current time). With a `raw_store` (BlobStore), each
+    raw_queries entry keeps its query and a `results_id` pointing into the
+    store instead of the full Serper response.
+    """
     print(f"\n{'='*80}")
     print(f"🔍 Scraping: {city}, MA")
     print(f"{'='*80}")
     
+    if fetched is None:
+        fetched = fetch_city_results([city])[city]
+    if now is None:
+        now = datetime.now()
+    
     data = {
         'city_name': city,
         'state_name': 'Massachusetts',
         'state_abbr': 'MA',
         'city_slug': f"{city.lower().replace(' ', '-')}-ma",
-        'last_updated': datetime.now().strftime('%B %d, %Y'),
-        'scraped_at': datetime.now().isoformat(),
+        'last_updated': now.strftime('%B %d, %Y'),
+        'scraped_at': now.isoformat(),
         
         # Initialize all required fields
         'contacts': {},
@@ -279,11 +301,12 @@ def scrape_city_data(city):
         'raw_queries': {}
     }
     
+    def take(key):
+        data['raw_queries'][key] = fetched[key]
+        return fetched[key]['results']
+    
     # Query 1: Official Department & Contact
-    print("  [1/15] Official department...")
-    query = f'site:.gov "{city}" Massachusetts sanitation department contact'
-    results = search_serper(query)
-    data['raw_queries']['official_dept'] = {'query': query, 'results': results}
+    results = take('official_dept')
     
     if results.get('organic'):
         for result in results['organic'][:3]:
@@ -297,13 +320,8 @@ def scrape_city_data(city):
                 if phone:
                     data['contacts']['official_phone'] = phone
                 break
-    time.sleep(0.6)
-    
     # Query 2: Waste Management Rules
-    print("  [2/15] Waste management rules...")
-    query = f'"{city}" MA mattress disposal curbside pickup rules requirements wrapping bagging'
-    results = search_serper(query)
-    data['raw_queries']['waste_rules'] = {'query': query, 'results': results}
+    results = take('waste_rules')
     
     if results.get('organic'):
         for result in results['organic'][:5]:
@@ -332,13 +350,8 @@ def scrape_city_data(city):
             
             if '.gov' in result.get('link', ''):
                 data['sources'].append(result['link'])
-    time.sleep(0.6)
-    
     # Query 3: Illegal Dumping Fines
-    print("  [3/15] Illegal dumping fines...")
-    query = f'"{city}" Massachusetts illegal dumping fine penalty amount'
-    results = search_serper(query)
-    data['raw_queries']['fines'] = {'query': query, 'results': results}
+    results = take('fines')
     
     if results.get('organic'):
         for result in results['organic'][:3]:
@@ -352,13 +365,8 @@ def scrape_city_data(city):
     # Default if not found
     if not data['illegal_dumping'].get('fine_amount'):
         data['illegal_dumping']['fine_amount'] = 'Up to $1,000'
-    time.sleep(0.6)
-    
     # Query 4: Transfer Stations / Drop-off Locations
-    print("  [4/15] Transfer stations...")
-    query = f'"{city}" MA transfer station recycling center mattress disposal address hours fees open'
-    results = search_serper(query)
-    data['raw_queries']['facilities'] = {'query': query, 'results': results}
+    results = take('facilities')
     
     if results.get('organic'):
         for i, result in enumerate(results['organic'][:5]):
@@ -367,16 +375,16 @@ def scrape_city_data(city):
             link = result.get('link', '')
             combined_text = f"{title} {snippet}"
             
-            # Extract address
-            address = extract_address(combined_text)
+            # Extract address, phone, hours and fee in one scan
+            fields = extractor.extract(combined_text, ('address', 'phone', 'hours', 'fee'))
+            address = fields['address']
             if not address:
                 address = extract_address(title)
             
-            # Extract phone number
-            phone = extract_phone_numbers(combined_text)
+            phone = fields['phone']
             
             # Extract hours - try multiple patterns
-            hours = extract_hours(combined_text)
+            hours = fields['hours']
             if not hours:
                 # Try to find hours in a different format
                 hours_pattern = r'(?:open|hours).*?(?:monday|mon|tuesday|tue|wednesday|wed|thursday|thu|friday|fri|saturday|sat|sunday|sun)[^.]*'
@@ -384,8 +392,7 @@ def scrape_city_data(city):
                 if hours_match:
                     hours = hours_match.group(0)[:100]  # Limit length
             
-            # Extract fee
-            fee = extract_fee_amount(combined_text)
+            fee = fields['fee']
             
             # Only add if we have at least an address or it's a .gov site
             if address or '.gov' in link or 'transfer' in title.lower() or 'recycling' in title.lower():
@@ -406,13 +413,8 @@ def scrape_city_data(city):
                 # Stop after 3 good locations
                 if len(data['drop_off_locations']) >= 3:
                     break
-    time.sleep(0.6)
-    
     # Query 4b: Specific facility hours and phone search
-    print("  [4b/15] Facility hours & contact...")
-    query = f'"{city}" MA transfer station phone number hours contact'
-    results = search_serper(query, num_results=5)
-    data['raw_queries']['facility_hours'] = {'query': query, 'results': results}
+    results = take('facility_hours')
     
     if results.get('organic'):
         for result in results['organic'][:3]:
@@ -420,9 +422,10 @@ def scrape_city_data(city):
             title = result.get('title', '')
             combined = f"{title} {snippet}"
             
-            # Try to extract hours
-            hours = extract_hours(combined)
-            phone = extract_phone_numbers(combined)
+            # Try to extract hours and phone
+            fields = extractor.extract(combined, ('hours', 'phone'))
+            hours = fields['hours']
+            phone = fields['phone']
             
             # Update first location if it doesn't have hours or phone
             if len(data['drop_off_locations']) > 0:
@@ -430,13 +433,8 @@ def scrape_city_data(city):
                     data['drop_off_locations'][0]['hours'] = hours
                 if not data['drop_off_locations'][0].get('phone') and phone:
                     data['drop_off_locations'][0]['phone'] = phone
-    time.sleep(0.6)
-    
     # Query 5: Competitor Pricing
-    print("  [5/15] Competitor pricing...")
-    query = f'mattress removal "{city}" MA price cost "$" 2026'
-    results = search_serper(query)
-    data['raw_queries']['pricing'] = {'query': query, 'results': results}
+    results = take('pricing')
     
     # Try to extract real pricing from results
     price_low = None
@@ -475,34 +473,19 @@ def scrape_city_data(city):
             'competitor_comparison': '$75–$180',
             'market_rate_range': '$75–$180'
         }
-    time.sleep(0.6)
-    
     # Query 6: Donation Options
-    print("  [6/15] Donation options...")
-    query = f'"{city}" MA mattress donation Goodwill Habitat for Humanity'
-    results = search_serper(query)
-    data['raw_queries']['donation'] = {'query': query, 'results': results}
+    results = take('donation')
     
     data['donation_policy'] = 'Goodwill & Habitat for Humanity accept clean, non-stained mattresses only'
-    time.sleep(0.6)
-    
     # Query 7: Weather Profile
-    print("  [7/15] Weather profile...")
-    query = f'"{city}" Massachusetts average rainfall climate'
-    results = search_serper(query)
-    data['raw_queries']['weather'] = {'query': query, 'results': results}
+    results = take('weather')
     
     data['weather_profile'] = {
         'profile': 'Rainy Season (Nov–Mar)',
         'risk': 'Wet mattresses are automatically rejected'
     }
-    time.sleep(0.6)
-    
     # Query 8: Neighborhoods - Enhanced
-    print("  [8/15] Neighborhoods...")
-    query = f'"{city}" Massachusetts neighborhoods list complete all'
-    results = search_serper(query, num_results=10)
-    data['raw_queries']['neighborhoods'] = {'query': query, 'results': results}
+    results = take('neighborhoods')
     
     # Extract neighborhoods from results
     neighborhoods_found = set()
@@ -542,10 +525,7 @@ def scrape_city_data(city):
         data['neighborhoods'] = sorted(list(neighborhoods_found))[:20]
     
     # Query 8b: Wikipedia/official neighborhoods
-    print("  [8b/15] Official neighborhoods...")
-    query = f'site:wikipedia.org OR site:.gov "{city}" Massachusetts neighborhoods official'
-    results = search_serper(query, num_results=5)
-    data['raw_queries']['neighborhoods_official'] = {'query': query, 'results': results}
+    results = take('neighborhoods_official')
     
     if results.get('organic'):
         for result in results['organic'][:2]:
@@ -573,28 +553,9 @@ def scrape_city_data(city):
             if neighborhood not in data['neighborhoods'] and len(data['neighborhoods']) < 20:
                 data['neighborhoods'].append(neighborhood)
     
-    time.sleep(0.6)
-    
     # Queries 9-20: Additional data gathering (expanded for better accuracy)
-    additional_queries = [
-        ('schedule', f'"{city}" MA bulk trash pickup schedule frequency appointment days'),
-        ('schedule_specific', f'"{city}" Massachusetts bulky item next available pickup date wait time'),
-        ('schedule_advance', f'"{city}" MA mattress pickup how many days advance notice required'),
-        ('ordinance', f'site:.gov "{city}" MA city code illegal dumping ordinance'),
-        ('fees_detailed', f'"{city}" Massachusetts waste disposal fees tipping cost per ton mattress "$"'),
-        ('recycling', f'"{city}" MA mattress recycling program free'),
-        ('bulky_items', f'"{city}" Massachusetts bulky item collection appointment schedule advance'),
-        ('permits', f'"{city}" MA waste disposal permit requirements resident'),
-        ('enforcement', f'"{city}" Massachusetts illegal dumping enforcement cameras fine'),
-        ('placement_rules', f'"{city}" MA curbside mattress placement time rules when'),
-        ('size_limits', f'"{city}" MA mattress disposal limit maximum how many per household'),
-        ('hours_specific', f'"{city}" MA transfer station hours open close schedule'),
-    ]
-    
-    for i, (key, query) in enumerate(additional_queries, 9):
-        print(f"  [{i}/20] {key.replace('_', ' ').title()}...")
-        results = search_serper(query)
-        data['raw_queries'][key] = {'query': query, 'results': results}
+    for key in ADDITIONAL_QUERY_KEYS:
+        results = take(key)
         
         # Extract additional data from these queries
         if results.get('organic'):
@@ -654,9 +615,7 @@ def scrape_city_data(city):
                                 location['tipping_fee'] = fee
                                 break
         
-        time.sleep(0.6)
-    
-    # Generate FAQs
+        # Generate FAQs
     data['faqs'] = generate_faqs(city, data)
     
     # Set availability status
@@ -706,6 +665,12 @@ def scrape_city_data(city):
             'google_maps_url': data['contacts'].get('website_url', f'https://www.google.com/maps/search/?api=1&query=transfer+station+{city}+MA')
         })
     
+    if raw_store is not None:
+        data['raw_queries'] = {
+            key: {'query': entry['query'], 'results_id': raw_store.put(entry['results'])}
+            for key, entry in data['raw_queries'].items()
+        }
+    
     print(f"  ✅ Completed {city}")
     return data
 
@@ -756,41 +721,67 @@ def generate_faqs(city, data):
     ]
 
 
-def scrape_all_cities(output_file='all_cities_enhanced_data.json', sample_size=None):
-    """Scrape all cities with enhanced extraction"""
+def raw_store_for(output_file):
+    """Side store for raw Serper responses next to the output file."""
+    return BlobStore(os.path.splitext(output_file)[0] + '_raw')
+
+
+def scrape_all_cities(output_file='all_cities_enhanced_data.json', sample_size=None, now=None,
+                      inline_raw=False):
+    """
+    Scrape all cities with enhanced extraction.
+    
+    Raw Serper responses go to raw_store_for(output_file) and records
+    reference them by id; pass inline_raw=True to embed them as before.
+    """
     cities_to_scrape = CITIES[:sample_size] if sample_size else CITIES
     
     print("=" * 80)
     print("ENHANCED CITY DATA SCRAPER")
     print("=" * 80)
     print(f"Cities: {len(cities_to_scrape)}")
-    print(f"Queries per city: 20")
-    print(f"Estimated time: ~{len(cities_to_scrape) * 20 * 0.6 / 60:.1f} minutes")
+    queries_per_city = len(build_city_queries(''))
+    cities_per_fetch = max(1, SERPER_BATCH_SIZE // queries_per_city)
+    print(f"Queries per city: {queries_per_city}")
+    print(f"Cities per Serper fetch: {cities_per_fetch}")
     print("=" * 80)
     
     all_data = []
     start_time = time.time()
+    raw_store = None if inline_raw else raw_store_for(output_file)
     
-    for i, city in enumerate(cities_to_scrape, 1):
-        print(f"\n[{i}/{len(cities_to_scrape)}] Processing {city}...")
-        
-        try:
-            city_data = scrape_city_data(city)
-            all_data.append(city_data)
-            
-            # Save progress
-            with open(output_file, 'w') as f:
-                json.dump(all_data, f, indent=2)
+    # Each city is appended to a JSONL log as it finishes; the JSON output
+    # file is written from it once, even if the run is interrupted.
+    store = RecordStore(os.path.splitext(output_file)[0] + '.jsonl', reset=True)
+    
+    try:
+        fetched = {}
+        for i, city in enumerate(cities_to_scrape, 1):
+            if city not in fetched:
+                # Fetch the next group of cities' queries in one go
+                group = cities_to_scrape[i - 1:i - 1 + cities_per_fetch]
+                if i > 1:
+                    time.sleep(2)
+                fetched = fetch_city_results(group)
             
-            print(f"  💾 Progress saved")
+            print(f"\n[{i}/{len(cities_to_scrape)}] Processing {city}...")
             
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-            continue
-        
-        # Pause between cities
-        if i < len(cities_to_scrape):
-            time.sleep(2)
+            try:
+                city_data = scrape_city_data(city, fetched[city], now, raw_store)
+                all_data.append(city_data)
+                
+                # Save progress
+                store.upsert(city_data)
+                
+                print(f"  💾 Progress saved")
+                
+            except Exception as e:
+                print(f"  ❌ Error: {e}")
+                continue
+    finally:
+        store.commit()
+        store.materialize(output_file, indent=2)
+        store.close()
     
     elapsed = time.time() - start_time
     
@@ -800,15 +791,101 @@ def scrape_all_cities(output_file='all_cities_enhanced_data.json', sample_size=N
     print(f"Cities scraped: {len(all_data)}")
     print(f"Total time: {elapsed/60:.1f} minutes")
     print(f"Output: {output_file}")
+    if raw_store is not None:
+        print(f"Raw responses: {raw_store.written} stored, {raw_store.reused} reused "
+              f"in {raw_store.directory}")
     print("=" * 80)
     
     return all_data
 
 
-if __name__ == '__main__':
-    import sys
+async def scrape_city_data_async(city, pacer, now=None, raw_store=None):
+    """scrape_city_data with the city's queries sent concurrently under `pacer`."""
+    fetched = await fetch_city_results_async([city], pacer)
+    return scrape_city_data(city, fetched[city], now, raw_store)
+
+
+async def scrape_all_cities_async(output_file='all_cities_enhanced_data.json',
+                                  sample_size=None, concurrency=4, now=None,
+                                  inline_raw=False):
+    """
+    scrape_all_cities with up to `concurrency` cities in flight at once.
+    
+    Requests from all cities share one SERPER_RATE_LIMIT pacer. Records are
+    saved in CITIES order as each city and those before it finish, so the
+    output matches scrape_all_cities for the same search results and `now`.
+    """
+    cities_to_scrape = CITIES[:sample_size] if sample_size else CITIES
+    
+    print("=" * 80)
+    print("ENHANCED CITY DATA SCRAPER (async)")
+    print("=" * 80)
+    print(f"Cities: {len(cities_to_scrape)}")
+    print(f"Queries per city: {len(build_city_queries(''))}")
+    print(f"Concurrent cities: {concurrency}")
+    print(f"Serper rate limit: {SERPER_RATE_LIMIT:g} requests/second")
+    print("=" * 80)
+    
+    all_data = []
+    start_time = time.time()
+    pacer = RequestPacer(SERPER_RATE_LIMIT)
+    raw_store = None if inline_raw else raw_store_for(output_file)
+    slots = asyncio.Semaphore(max(1, concurrency))
     
-    sample_size = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    async def scrape(city):
+        async with slots:
+            try:
+                return await scrape_city_data_async(city, pacer, now, raw_store)
+            except Exception as e:
+                print(f"  ❌ Error ({city}): {e}")
+                return None
+    
+    store = RecordStore(os.path.splitext(output_file)[0] + '.jsonl', reset=True)
+    tasks = [asyncio.ensure_future(scrape(city)) for city in cities_to_scrape]
+    
+    try:
+        for i, (city, task) in enumerate(zip(cities_to_scrape, tasks), 1):
+            city_data = await task
+            if city_data is None:
+                continue
+            all_data.append(city_data)
+            store.upsert(city_data)
+            print(f"[{i}/{len(cities_to_scrape)}] 💾 {city} saved")
+    finally:
+        for task in tasks:
+            task.cancel()
+        store.commit()
+        store.materialize(output_file, indent=2)
+        store.close()
+    
+    elapsed = time.time() - start_time
+    
+    print("\n" + "=" * 80)
+    print("SCRAPING COMPLETE")
+    print("=" * 80)
+    print(f"Cities scraped: {len(all_data)}")
+    print(f"Total time: {elapsed/60:.1f} minutes")
+    print(f"Output: {output_file}")
+    if raw_store is not None:
+        print(f"Raw responses: {raw_store.written} stored, {raw_store.reused} reused "
+              f"in {raw_store.directory}")
+    print("=" * 80)
+    
+    return all_data
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Enhanced city data scraper')
+    parser.add_argument('sample_size', nargs='?', type=int,
+                        help='Scrape only the first N cities')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help='Scrape several cities at once with asyncio')
+    parser.add_argument('--concurrency', type=int, default=4,
+                        help='Cities in flight at once with --async (default 4)')
+    parser.add_argument('--inline-raw', action='store_true',
+                        help='Embed full Serper responses in raw_queries instead of a side store')
+    args = parser.parse_args()
+    sample_size = args.sample_size
     
     if sample_size:
         print(f"\n⚠️  SAMPLE MODE: Scraping first {sample_size} cities\n")
@@ -816,4 +893,10 @@ if __name__ == '__main__':
     else:
         output_file = 'all_36_cities_enhanced_data.json'
     
-    scrape_all_cities(output_file=output_file, sample_size=sample_size)
+    if args.use_async:
+        asyncio.run(scrape_all_cities_async(output_file=output_file, sample_size=sample_size,
+                                            concurrency=args.concurrency,
+                                            inline_raw=args.inline_raw))
+    else:
+        scrape_all_cities(output_file=output_file, sample_size=sample_size,
+                          inline_raw=args.inline_raw)
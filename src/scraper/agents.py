@@ -1,36 +1,115 @@
 """Multi-agent extraction system using Gemini."""
 import json
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 import google.generativeai as genai
 
 from .utils import Logger, ParseError
-from .config import GEMINI_API_KEY
+from .config import (
+    GEMINI_API_KEY, GEMINI_MAX_CONCURRENCY,
+    LLM_CACHE_TTL_HOURS, LLM_CACHE_MAX_ENTRIES,
+)
+from .cache import get_cache, make_key
+from .rate_limiter import limiters
 
 # Configure Gemini
 genai.configure(api_key=GEMINI_API_KEY)
 
 
+# ── ASYNC LLM EXECUTION ───────────────────────────────────────────────────────
+
+# Created lazily so the semaphore binds to the running event loop.
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+_llm_executor: Optional[ThreadPoolExecutor] = None
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Process-wide cap on concurrent Gemini requests."""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+    return _llm_semaphore
+
+
+async def _generate_content(model, prompt: str, generation_config):
+    """
+    Run one Gemini request without blocking the event loop.
+
+    Prefers the SDK's native async API. Older SDK versions without
+    generate_content_async fall back to a bounded thread pool so the
+    blocking call still runs off the loop.
+    """
+    await limiters.get('gemini').acquire()
+    async with _get_llm_semaphore():
+        if hasattr(model, 'generate_content_async'):
+            return await model.generate_content_async(
+                prompt, generation_config=generation_config,
+            )
+
+        global _llm_executor
+        if _llm_executor is None:
+            _llm_executor = ThreadPoolExecutor(
+                max_workers=GEMINI_MAX_CONCURRENCY,
+                thread_name_prefix='gemini',
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _llm_executor,
+            lambda: model.generate_content(prompt, generation_config=generation_config),
+        )
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """True for Gemini quota errors (HTTP 429 / ResourceExhausted)."""
+    return (getattr(error, 'code', None) == 429 or
+            type(error).__name__ == 'ResourceExhausted')
+
+
+# Parsed responses keyed by a hash of model, prompt, temperature and MIME
+# type, so re-running a city whose sources haven't changed costs no calls.
+llm_cache = get_cache('llm', LLM_CACHE_TTL_HOURS * 3600, LLM_CACHE_MAX_ENTRIES)
+
+
 # ── SHARED HELPER ─────────────────────────────────────────────────────────────
 
 async def _gemini_json(model, prompt: str, temperature: float = 0.1,
                        retries: int = 3, logger: Optional[Logger] = None,
-                       tag: str = '') -> Optional[dict]:
+                       tag: str = '', cache: bool = True) -> Optional[dict]:
     """
     Call Gemini and return parsed JSON. Retries with backoff.
     Returns None on total failure so callers can decide their own fallback.
+
+    Identical requests are answered from llm_cache unless `cache` is False.
     """
+    mime_type = "application/json"
+    cache_key = make_key(
+        getattr(model, 'model_name', ''), prompt, temperature, mime_type,
+    )
+    if cache:
+        cached = await asyncio.to_thread(llm_cache.get, cache_key)
+        if cached is not None:
+            if logger:
+                logger.log(tag, 'CACHED', 'LLM response served from cache')
+            return cached
+
     for attempt in range(retries):
         try:
-            response = model.generate_content(
-                prompt,
-                generation_config=genai.GenerationConfig(
-                    response_mime_type="application/json",
+            response = await _generate_content(
+                model, prompt,
+                genai.GenerationConfig(
+                    response_mime_type=mime_type,
                     temperature=temperature,
                 ),
             )
-            return json.loads(response.text)
+            result = json.loads(response.text)
+            if cache:
+                await asyncio.to_thread(llm_cache.set, cache_key, result)
+            return result
         except Exception as e:
+            if _is_rate_limited(e):
+                # Quota errors pause every agent, not just this caller.
+                limiters.get('gemini').penalize(2 ** (attempt + 1))
             if attempt < retries - 1:
                 await asyncio.sleep(2 ** attempt)
                 if logger:
@@ -57,9 +136,10 @@ class AgentCityDiscovery:
       3. Mark URLs it is NOT certain about as null.
     """
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, use_cache: bool = True):
         self.logger = logger
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.use_cache = use_cache
 
     async def discover(self, city_name: str, state_abbr: str, state_name: str) -> Dict:
         """
@@ -103,6 +183,7 @@ No markdown. Return only JSON."""
         result = await _gemini_json(
             self.model, prompt, temperature=0.1,
             logger=self.logger, tag='agent_city_discovery',
+            cache=self.use_cache,
         )
 
         if result:
@@ -135,9 +216,10 @@ No markdown. Return only JSON."""
 class AgentDispatcher:
     """Agent 1: Extract contact information."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, use_cache: bool = True):
         self.logger = logger
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.use_cache = use_cache
 
     async def extract(self, text: str, city_name: str,
                       state_abbr: str = '', state_name: str = '') -> Dict:
@@ -169,6 +251,7 @@ Extract exact text. Use null if not found. No markdown."""
         result = await _gemini_json(
             self.model, prompt, temperature=0.1,
             logger=self.logger, tag='agent_dispatcher',
+            cache=self.use_cache,
         )
 
         if result:
@@ -183,9 +266,10 @@ Extract exact text. Use null if not found. No markdown."""
 class AgentRuleEnforcer:
     """Agent 2: Extract curbside rules and illegal dumping fines."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, use_cache: bool = True):
         self.logger = logger
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.use_cache = use_cache
 
     async def extract(self, text: str, city_name: str,
                       fine_hint: str = '', state_abbr: str = '') -> Dict:
@@ -264,6 +348,7 @@ CRITICAL: null means not found. Do NOT fill fields with yard waste, trash cart,
         result = await _gemini_json(
             self.model, prompt, temperature=0.1,
             logger=self.logger, tag='agent_rule_enforcer',
+            cache=self.use_cache,
         )
 
         if result:
@@ -291,9 +376,10 @@ CRITICAL: null means not found. Do NOT fill fields with yard waste, trash cart,
 class AgentNavigator:
     """Agent 3: Extract drop-off facilities."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, use_cache: bool = True):
         self.logger = logger
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.use_cache = use_cache
 
     async def extract(self, text: str, city_name: str, state_abbr: str) -> List[Dict]:
         """Extract facilities from text."""
@@ -340,6 +426,7 @@ Extract exact text. Include full addresses. No markdown."""
         result = await _gemini_json(
             self.model, prompt, temperature=0.1,
             logger=self.logger, tag='agent_navigator',
+            cache=self.use_cache,
         )
 
         if result:
@@ -356,9 +443,10 @@ Extract exact text. Include full addresses. No markdown."""
 class AgentAuditor:
     """Agent 4: Verify and correct extractions."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, use_cache: bool = True):
         self.logger = logger
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.use_cache = use_cache
 
     async def verify(self, extracted: Dict, text: str,
                      city_name: str, state_abbr: str = '',
@@ -402,6 +490,7 @@ Return corrected JSON with same structure. No markdown."""
         result = await _gemini_json(
             self.model, prompt, temperature=0.1,
             logger=self.logger, tag='agent_auditor',
+            cache=self.use_cache,
         )
 
         if result:
@@ -415,11 +504,17 @@ Return corrected JSON with same structure. No markdown."""
 # ── CHARISMA SYNTHESIZER ──────────────────────────────────────────────────────
 
 class CharismaSynthesizer:
-    """Generate SEO copy and marketing content."""
+    """
+    Generate SEO copy and marketing content.
+
+    Cached like the other agents, so an unchanged city keeps its copy
+    between runs. Pass use_cache=False to sample fresh copy every time.
+    """
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, use_cache: bool = True):
         self.logger = logger
         self.model = genai.GenerativeModel('gemini-2.5-flash')
+        self.use_cache = use_cache
 
     async def generate(self, extracted_data: Dict, geo_data: Dict,
                        city_name: str, state_abbr: str) -> Dict:
@@ -464,6 +559,7 @@ No markdown."""
         result = await _gemini_json(
             self.model, prompt, temperature=0.7,
             logger=self.logger, tag='charisma_synthesis',
+            cache=self.use_cache,
         )
 
         if result:
@@ -0,0 +1,75 @@
+"""Per-city store of phase outputs, for replaying later stages offline."""
+import gzip
+import json
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from .config import ARTIFACTS_DIR, ARTIFACTS_ENABLED
+
+# Artifacts each --from-stage mode loads instead of recomputing. Everything
+# else in the graph runs as usual, then Phase 6 assembles the result.
+REPLAY_STAGES: Dict[str, tuple] = {
+    'extract': ('phase1', 'phase2', 'phase5', 'log'),
+    'charisma': ('phase1', 'phase2', 'phase5', 'change_detection', 'phase3', 'log'),
+    'assemble': ('phase1', 'phase2', 'phase5', 'change_detection', 'phase3', 'charisma', 'log'),
+}
+
+
+class ArtifactStore:
+    """
+    Gzipped JSON file per city and stage:
+    `<directory>/<city-slug>-<st>/<stage>.json.gz`.
+
+    Files are written to a temporary name and renamed into place, so a
+    crash mid-write never leaves a truncated artifact behind.
+    """
+
+    def __init__(self, directory: str = ARTIFACTS_DIR, enabled: bool = ARTIFACTS_ENABLED):
+        self.directory = directory
+        self.enabled = enabled
+
+    def city_dir(self, city_name: str, state_abbr: str) -> str:
+        slug = f"{city_name.strip().lower().replace(' ', '-')}-{state_abbr.lower()}"
+        return os.path.join(self.directory, slug)
+
+    def _path(self, city_name: str, state_abbr: str, stage: str) -> str:
+        return os.path.join(self.city_dir(city_name, state_abbr), f"{stage}.json.gz")
+
+    def save(self, city_name: str, state_abbr: str, stage: str, data: Any):
+        if not self.enabled:
+            return
+        path = self._path(city_name, state_abbr, stage)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'), default=str)
+        os.replace(tmp, path)
+
+    def save_all(self, city_name: str, state_abbr: str, artifacts: Dict[str, Any]):
+        for stage, data in artifacts.items():
+            self.save(city_name, state_abbr, stage, data)
+
+    def load(self, city_name: str, state_abbr: str, stage: str) -> Optional[Any]:
+        """Return a stored artifact, or None if it is missing or unreadable."""
+        path = self._path(city_name, state_abbr, stage)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def load_all(self, city_name: str, state_abbr: str,
+                 stages: Iterable[str]) -> Dict[str, Any]:
+        """
+        Load several stages at once.
+
+        Raises:
+            FileNotFoundError: Naming the stages that have no artifact.
+        """
+        loaded = {stage: self.load(city_name, state_abbr, stage) for stage in stages}
+        missing = [stage for stage, data in loaded.items() if data is None]
+        if missing:
+            raise FileNotFoundError(
+                f"No {', '.join(missing)} artifact(s) under {self.city_dir(city_name, state_abbr)}"
+            )
+        return loaded
@@ -0,0 +1,197 @@
+"""Persistent on-disk caches shared across scraper runs."""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from .config import SCRAPER_CACHE_DIR, SCRAPER_CACHE_ENABLED
+
+
+def make_key(*parts: Any) -> str:
+    """Stable SHA-256 key for a tuple of JSON-serialisable parts."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value cache with TTL expiry and LRU eviction.
+
+    Each named cache is one table in its own file under SCRAPER_CACHE_DIR,
+    so search results, LLM responses etc. can be sized and cleared
+    independently. Values are stored as JSON, or as bytes through
+    get_raw/set_raw. Entries older than `ttl_seconds` are treated as
+    misses. Once the table grows past `max_entries`, the least recently
+    read rows are dropped.
+
+    The connection is opened lazily, so importing a module that declares a
+    cache never touches the disk.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_entries: int,
+                 directory: str = SCRAPER_CACHE_DIR, enabled: bool = SCRAPER_CACHE_ENABLED):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, max_entries)
+        self.path = os.path.join(directory, f"{name}.sqlite3")
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        # Cache-specific counters (e.g. HTTP 304 revalidations) for the summary.
+        self.events: Dict[str, int] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                ' key TEXT PRIMARY KEY,'
+                ' value BLOB NOT NULL,'
+                ' created_at REAL NOT NULL,'
+                ' accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at)')
+            self._size = conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss or expiry."""
+        raw = self.get_raw(key)
+        if raw is None:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            print(f"Cache '{self.name}' read error: {e}")
+            return None
+
+    def set(self, key: str, value: Any):
+        """Store `value` under `key`, evicting old entries if over capacity."""
+        try:
+            raw = json.dumps(value, ensure_ascii=False).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            print(f"Cache '{self.name}' write error: {e}")
+            return
+        self.set_raw(key, raw)
+
+    def get_raw(self, key: str) -> Optional[bytes]:
+        """Like get(), for values stored as bytes with set_raw()."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            try:
+                conn = self._connect()
+                row = conn.execute(
+                    'SELECT value, created_at FROM entries WHERE key = ?', (key,)
+                ).fetchone()
+                now = time.time()
+                if row is None or now - row[1] > self.ttl_seconds:
+                    if row is not None:
+                        conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                        conn.commit()
+                        self._size -= 1
+                    self.misses += 1
+                    return None
+                conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+                conn.commit()
+                self.hits += 1
+                return bytes(row[0])
+            except sqlite3.Error as e:
+                print(f"Cache '{self.name}' read error: {e}")
+                self.misses += 1
+                return None
+
+    def set_raw(self, key: str, value: bytes):
+        """Store raw bytes under `key`, evicting old entries if over capacity."""
+        if not self.enabled:
+            return
+        with self._lock:
+            try:
+                conn = self._connect()
+                now = time.time()
+                existed = conn.execute(
+                    'SELECT 1 FROM entries WHERE key = ?', (key,)
+                ).fetchone() is not None
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, created_at, accessed_at) '
+                    'VALUES (?, ?, ?, ?)',
+                    (key, value, now, now),
+                )
+                self.writes += 1
+                if not existed:
+                    self._size += 1
+                if self._size > self.max_entries:
+                    self._evict(conn)
+                conn.commit()
+            except sqlite3.Error as e:
+                print(f"Cache '{self.name}' write error: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        """Drop least recently read rows, leaving 10% headroom."""
+        target = int(self.max_entries * 0.9)
+        excess = self._size - target
+        conn.execute(
+            'DELETE FROM entries WHERE key IN ('
+            ' SELECT key FROM entries ORDER BY accessed_at LIMIT ?)',
+            (excess,),
+        )
+        self.evictions += excess
+        self._size = target
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the run summary."""
+        lookups = self.hits + self.misses
+        return {
+            'name': self.name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'entries': self._size,
+            'events': dict(self.events),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_caches: Dict[str, DiskCache] = {}
+
+
+def get_cache(name: str, ttl_seconds: float, max_entries: int) -> DiskCache:
+    """Return the process-wide cache called `name`, creating it on first use."""
+    cache = _caches.get(name)
+    if cache is None:
+        cache = DiskCache(name, ttl_seconds, max_entries)
+        _caches[name] = cache
+    return cache
+
+
+def cache_summary() -> List[str]:
+    """One line per cache that saw traffic this run, for the CLI summary."""
+    lines = []
+    for cache in _caches.values():
+        s = cache.stats()
+        if not (s['hits'] or s['misses']):
+            continue
+        lines.append(
+            f"{s['name']}: {s['hits']} hit(s), {s['misses']} miss(es) "
+            f"({s['hit_rate']:.0%} hit rate), {s['entries']} entries"
+            + ''.join(f", {count} {event}" for event, count in s['events'].items())
+        )
+    return lines
@@ -0,0 +1,123 @@
+"""Per-state Census ACS5 place snapshots for population lookups."""
+import asyncio
+from typing import Dict, List, Optional, Tuple
+
+from .cache import get_cache
+from .config import CENSUS_CACHE_TTL_HOURS
+from .http_client import HttpPool
+from .inflight import InflightCalls
+
+ACS5_URL = "https://api.census.gov/data/2022/acs/acs5"
+
+
+class StatePlaceIndex:
+    """
+    Indexed snapshot of one state's ACS5 `place:*` table.
+
+    `places` keeps the (Census name, population) rows in API order and
+    `exact` maps each lowercase name ("boston city, massachusetts") to its
+    row. Names that are not an exact match fall back to the row-by-row
+    substring scan, and its answer (the most populous row containing the
+    text, so Philadelphia still resolves to "Philadelphia city" rather than
+    a small CDP) is memoized in `best` for the life of the index.
+    """
+
+    def __init__(self, places: List[Tuple[str, Optional[int]]]):
+        self.places = places
+        self._lowered = [name.lower() for name, _ in places]
+        self.exact: Dict[str, Tuple[str, Optional[int]]] = {}
+        for name_lower, place in zip(self._lowered, places):
+            self.exact.setdefault(name_lower, place)
+        self.best: Dict[str, Optional[Tuple[str, Optional[int]]]] = {}
+
+    @classmethod
+    def from_rows(cls, rows: List[List[str]]) -> 'StatePlaceIndex':
+        """Build the index from an ACS5 response (header row first)."""
+        places: List[Tuple[str, Optional[int]]] = []
+        for row in rows[1:]:
+            try:
+                pop = int(row[1]) if row[1] else None
+            except (ValueError, TypeError):
+                pop = None
+            places.append((row[0], pop))
+        return cls(places)
+
+    def _scan(self, needle: str) -> Optional[Tuple[str, Optional[int]]]:
+        """Largest-population row whose name contains `needle`; first wins ties."""
+        best_pop = -1
+        best = None
+        for name_lower, place in zip(self._lowered, self.places):
+            if needle in name_lower and (place[1] or 0) > best_pop:
+                best_pop = place[1] or 0
+                best = place
+        return best
+
+    def lookup(self, city_name: str, state_full: str) -> Optional[Tuple[str, Optional[int]]]:
+        """
+        Resolve a city to (Census name, population).
+
+        1. EXACT canonical Census name: "{city} city, {state_full_name}"
+        2. Otherwise the LARGEST population among substring matches
+        """
+        city_lower = city_name.lower()
+        canonical = f"{city_lower} city, {state_full.lower()}"
+        if canonical in self.exact:
+            return self.exact[canonical]
+        if city_lower not in self.best:
+            self.best[city_lower] = self._scan(city_lower)
+        return self.best[city_lower]
+
+    def to_dict(self) -> Dict:
+        return {'places': self.places}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StatePlaceIndex':
+        return cls([tuple(p) for p in data['places']])
+
+
+class CensusService:
+    """
+    Fetches each state's ACS5 place table once and reuses it.
+
+    A Boston run used to download the Massachusetts table for every city.
+    Now the first city in a state downloads it, concurrent callers wait on
+    that same request, and the indexed snapshot is kept in memory and in the
+    'census' DiskCache for later runs.
+    """
+
+    def __init__(self, http: Optional[HttpPool] = None):
+        self.http = http or HttpPool()
+        self.cache = get_cache('census', CENSUS_CACHE_TTL_HOURS * 3600, 100)
+        self._indexes: Dict[str, StatePlaceIndex] = {}
+        self._inflight = InflightCalls()
+
+    async def state_index(self, state_fips: str) -> StatePlaceIndex:
+        """Return the indexed place table for a state, fetching it if needed."""
+        if state_fips in self._indexes:
+            return self._indexes[state_fips]
+        return await self._inflight.run(state_fips, lambda: self._load(state_fips))
+
+    async def _load(self, state_fips: str) -> StatePlaceIndex:
+        cached = await asyncio.to_thread(self.cache.get, state_fips)
+        if cached is not None:
+            index = StatePlaceIndex.from_dict(cached)
+            self._indexes[state_fips] = index
+            return index
+        index = await self._fetch(state_fips)
+        self._indexes[state_fips] = index
+        await asyncio.to_thread(self.cache.set, state_fips, index.to_dict())
+        return index
+
+    async def _fetch(self, state_fips: str) -> StatePlaceIndex:
+        client = self.http.for_phase('foundation')
+        resp = await client.get(
+            ACS5_URL,
+            params={
+                'get': 'NAME,B01003_001E',
+                'for': 'place:*',
+                'in': f'state:{state_fips}',
+            },
+            timeout=8.0,
+        )
+        resp.raise_for_status()
+        return StatePlaceIndex.from_rows(resp.json())
@@ -0,0 +1,90 @@
+"""Skip Phase 3 extraction when a city's Phase 2 content has not changed."""
+import hashlib
+import json
+import re
+from typing import Dict, Optional
+
+from .cache import DiskCache, get_cache, make_key
+from .config import (
+    EXTRACTION_VERSION, EXTRACTION_CACHE_TTL_HOURS, EXTRACTION_CACHE_MAX_ENTRIES,
+)
+
+# Lines that change between visits without changing any rule on the page.
+_VOLATILE_LINE = re.compile(
+    r'last (updated|modified|reviewed)|copyright|©|page (generated|loaded)|visitors?:',
+    re.IGNORECASE,
+)
+
+
+def content_fingerprint(content: Dict) -> Optional[str]:
+    """
+    Hash the Phase 2 output that Phase 3 extracts from.
+
+    Text is compared line by line after lower-casing and collapsing
+    whitespace. "Last updated" and copyright lines are dropped. The fine
+    hint, discovery data and EXTRACTION_VERSION are part of the hash.
+
+    Returns None when there are no relevant chunks. Phase 3 then works
+    from raw page text or fallbacks, and is always run.
+    """
+    chunks = content.get('relevant_chunks') or []
+    if not chunks:
+        return None
+    lines = []
+    for chunk in chunks:
+        for line in chunk.splitlines():
+            line = ' '.join(line.split()).lower()
+            if line and not _VOLATILE_LINE.search(line):
+                lines.append(line)
+    payload = json.dumps({
+        'version': EXTRACTION_VERSION,
+        'lines': lines,
+        'dumping_fine_raw': content.get('dumping_fine_raw'),
+        'dumping_fine_snippet': content.get('dumping_fine_snippet'),
+        'discovery_data': content.get('discovery_data') or {},
+        'content_validation_failed': bool(content.get('content_validation_failed')),
+    }, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ExtractionSnapshots:
+    """
+    Last Phase 3 result for each city, stored with the fingerprint of the
+    content it was extracted from.
+
+    `reused` counts cities whose extraction was skipped this run, for the
+    CLI summary.
+    """
+
+    def __init__(self, cache: DiskCache):
+        self.cache = cache
+        self.reused = 0
+
+    @staticmethod
+    def _key(city_name: str, state_abbr: str) -> str:
+        return make_key('extraction', city_name.strip().lower(), state_abbr.upper())
+
+    def lookup(self, city_name: str, state_abbr: str,
+               fingerprint: Optional[str]) -> Optional[Dict]:
+        """Return the stored extraction if it came from identical content."""
+        if fingerprint is None:
+            return None
+        entry = self.cache.get(self._key(city_name, state_abbr))
+        if entry and entry.get('fingerprint') == fingerprint:
+            return entry['extracted']
+        return None
+
+    def save(self, city_name: str, state_abbr: str,
+             fingerprint: Optional[str], extracted: Dict):
+        if fingerprint is None:
+            return
+        self.cache.set(self._key(city_name, state_abbr), {
+            'fingerprint': fingerprint,
+            'extracted': extracted,
+        })
+
+
+# Process-wide snapshots shared by every scraper in a run.
+extraction_snapshots = ExtractionSnapshots(
+    get_cache('extraction', EXTRACTION_CACHE_TTL_HOURS * 3600, EXTRACTION_CACHE_MAX_ENTRIES),
+)
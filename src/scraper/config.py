@@ -26,6 +26,118 @@ if not SEARCH_API_KEY:
     print("WARNING: No search API key found (SERPER_API_KEY or SERPAPI_KEY)")
     print("Scraper will work but may miss some official sources")
 
+# Maximum number of Gemini requests in flight at once, shared by every agent
+# and every city processed in this process.
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '4'))
+
+# Connection pool limits for the shared HTTP client (see http_client.py).
+HTTP_MAX_CONNECTIONS = int(os.getenv('HTTP_MAX_CONNECTIONS', '50'))
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv('HTTP_MAX_CONNECTIONS_PER_HOST', '6'))
+
+
+def _rate_limit(name: str, default: str) -> tuple:
+    """Read a 'calls_per_second:burst' budget from RATE_LIMIT_<NAME>."""
+    rate, _, burst = os.getenv(f'RATE_LIMIT_{name}', default).partition(':')
+    return float(rate), int(burst or 1)
+
+
+# Per-provider request budgets as (calls_per_second, burst), shared by every
+# concurrent city in the process. Override with e.g. RATE_LIMIT_SERPER=10:20.
+PROVIDER_RATE_LIMITS = {
+    'serper': _rate_limit('SERPER', '5:10'),
+    'serpapi': _rate_limit('SERPAPI', '1:3'),
+    'geocoding': _rate_limit('GEOCODING', '40:50'),
+    'places': _rate_limit('PLACES', '10:20'),
+    'census': _rate_limit('CENSUS', '2:5'),
+    'gemini': _rate_limit('GEMINI', '2:5'),
+}
+
+# Politeness budget applied to each fetched (non-API) domain.
+DOMAIN_RATE_LIMIT = _rate_limit('DOMAIN', '1:2')
+
+# How many times a request that gets HTTP 429 is retried after waiting.
+HTTP_MAX_429_RETRIES = int(os.getenv('HTTP_MAX_429_RETRIES', '3'))
+
+# Persistent caches (see cache.py). Set SCRAPER_CACHE=0 to bypass them.
+SCRAPER_CACHE_DIR = os.getenv('SCRAPER_CACHE_DIR', '.scraper_cache')
+SCRAPER_CACHE_ENABLED = os.getenv('SCRAPER_CACHE', '1') != '0'
+
+# Search results are reused for a week; beyond that listings drift.
+SEARCH_CACHE_TTL_HOURS = float(os.getenv('SEARCH_CACHE_TTL_HOURS', '168'))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', '20000'))
+
+# Serper.dev accepts a JSON array of queries in one POST. Searches issued
+# within SERPER_BATCH_WINDOW_MS of each other (by one city or several) are
+# sent together, up to SERPER_BATCH_SIZE per request. SERPER_BATCH_SIZE=1
+# sends every query on its own.
+SERPER_BATCH_SIZE = max(1, int(os.getenv('SERPER_BATCH_SIZE', '20')))
+SERPER_BATCH_WINDOW_MS = float(os.getenv('SERPER_BATCH_WINDOW_MS', '25'))
+
+# Parsed Gemini responses; prompts embed the scraped text, so a changed
+# source is a new key and a long TTL is safe.
+LLM_CACHE_TTL_HOURS = float(os.getenv('LLM_CACHE_TTL_HOURS', '720'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '20000'))
+
+# City geocodes rarely change; keep them for 90 days.
+GEOCODE_CACHE_TTL_HOURS = float(os.getenv('GEOCODE_CACHE_TTL_HOURS', '2160'))
+GEOCODE_CACHE_MAX_ENTRIES = int(os.getenv('GEOCODE_CACHE_MAX_ENTRIES', '50000'))
+
+# Google Place Details (hours, phone) for fallback facilities; neighbouring
+# cities share transfer stations, so details are keyed by place_id.
+PLACES_CACHE_TTL_HOURS = float(os.getenv('PLACES_CACHE_TTL_HOURS', '720'))
+PLACES_CACHE_MAX_ENTRIES = int(os.getenv('PLACES_CACHE_MAX_ENTRIES', '20000'))
+
+# ACS5 state place tables only change with a new vintage.
+CENSUS_CACHE_TTL_HOURS = float(os.getenv('CENSUS_CACHE_TTL_HOURS', '720'))
+
+# Phase 2 page/PDF responses. Entries within the fresh window are served
+# without a request; older ones are revalidated with ETag/Last-Modified,
+# so a long TTL only costs disk.
+HTTP_CACHE_TTL_HOURS = float(os.getenv('HTTP_CACHE_TTL_HOURS', '2160'))
+HTTP_CACHE_FRESH_HOURS = float(os.getenv('HTTP_CACHE_FRESH_HOURS', '24'))
+HTTP_CACHE_MAX_ENTRIES = int(os.getenv('HTTP_CACHE_MAX_ENTRIES', '50000'))
+
+# Phase 3 results are reused while a city's Phase 2 text is unchanged (see
+# change_detection.py). Bump EXTRACTION_VERSION after changing prompts or
+# Phase 3 logic so every city is extracted again.
+EXTRACTION_VERSION = os.getenv('EXTRACTION_VERSION', '1')
+EXTRACTION_CACHE_TTL_HOURS = float(os.getenv('EXTRACTION_CACHE_TTL_HOURS', '2160'))
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.getenv('EXTRACTION_CACHE_MAX_ENTRIES', '20000'))
+
+# Per-city phase outputs, kept so later stages can be replayed offline
+# (--from-stage). Set SCRAPER_ARTIFACTS=0 to stop writing them.
+ARTIFACTS_DIR = os.getenv('SCRAPER_ARTIFACTS_DIR', '.scraper_artifacts')
+ARTIFACTS_ENABLED = os.getenv('SCRAPER_ARTIFACTS', '1') != '0'
+
+# CLI job ledger (see ledger.py): attempts per location before giving up,
+# and the base delay before a retry (doubled after each failure).
+JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', '3'))
+JOB_RETRY_BACKOFF_SECONDS = float(os.getenv('JOB_RETRY_BACKOFF_SECONDS', '30'))
+
+# Optional Census ZCTA Gazetteer file (e.g. 2020_Gaz_zcta_national.txt) for
+# offline zip code lookups; without it Phase 1 reverse-geocodes a grid.
+ZCTA_GAZETTEER_PATH = os.getenv('ZCTA_GAZETTEER_PATH', '')
+
+# Phase 2 fetches search results this many at a time, and stops fetching
+# once this much page/PDF text has been collected for a city.
+PHASE2_FETCH_CONCURRENCY = int(os.getenv('PHASE2_FETCH_CONCURRENCY', '6'))
+PHASE2_CONTENT_CHAR_BUDGET = int(os.getenv('PHASE2_CONTENT_CHAR_BUDGET', '150000'))
+
+# HTML/PDF parsing runs in a process pool (see parse_worker.py). Set
+# PARSE_WORKERS=0 to parse in threads instead.
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', str(min(4, os.cpu_count() or 1))))
+PARSE_QUEUE_SIZE = int(os.getenv('PARSE_QUEUE_SIZE', '32'))
+PARSE_TIMEOUT_SECONDS = float(os.getenv('PARSE_TIMEOUT_SECONDS', '30'))
+
+# PDF extraction stops after this many characters (all Phase 2 keeps) or
+# after this many mattress/bulk keyword hits; 0 disables the keyword stop.
+PDF_CHAR_BUDGET = int(os.getenv('PDF_CHAR_BUDGET', '20000'))
+PDF_KEYWORD_STOP = int(os.getenv('PDF_KEYWORD_STOP', '12'))
+
+# Byte caps for streamed page / PDF downloads (see HttpPool.fetch).
+FETCH_MAX_BYTES_HTML = int(os.getenv('FETCH_MAX_BYTES_HTML', str(2 * 1024 * 1024)))
+FETCH_MAX_BYTES_PDF = int(os.getenv('FETCH_MAX_BYTES_PDF', str(15 * 1024 * 1024)))
+
 # User agents for web scraping
 USER_AGENTS = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
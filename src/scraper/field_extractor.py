@@ -0,0 +1,295 @@
+"""Precompiled field extraction for search result snippets."""
+import re
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+
+class Candidate(NamedTuple):
+    """One value a snippet offers for a field, with where it was found."""
+    field: str
+    value: Any
+    start: int
+    end: int
+    confidence: float
+
+
+# Every field, in the order scan() and extract() report them.
+FIELDS = (
+    'phone', 'fine', 'hours', 'address', 'fee',
+    'wrapping', 'placement_time', 'size_limits', 'schedule_days',
+)
+
+_DAY = r'(?:Mon|Monday|Tue|Tuesday|Wed|Wednesday|Thu|Thursday|Fri|Friday|Sat|Saturday|Sun|Sunday)'
+
+# (pattern, confidence) in priority order: the first pattern that matches
+# gives a field's value, as the original extract_* functions did.
+_PHONE = [
+    (re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'), 0.9),  # (123) 456-7890
+    (re.compile(r'\d{3}[-.\s]\d{4}'), 0.6),  # 311 or 3-1-1
+    (re.compile(r'3-1-1'), 0.5),  # 311 format
+]
+
+_FINE = [
+    (re.compile(r'\$[\d,]+(?:\s*(?:to|-|–)\s*\$[\d,]+)?', re.IGNORECASE), 0.9),  # $500 to $1,000
+    (re.compile(r'up to \$[\d,]+', re.IGNORECASE), 0.8),  # up to $1,000
+    (re.compile(r'\$[\d,]+ fine', re.IGNORECASE), 0.8),  # $500 fine
+    (re.compile(r'\$[\d,]+ citation', re.IGNORECASE), 0.8),  # $500 citation
+    (re.compile(r'fine[s]?\s+(?:of|up to|range from)?\s*\$[\d,]+', re.IGNORECASE), 0.7),  # fines of $500
+]
+
+# Hours patterns, each with the literal it cannot match without.
+_HOURS = [
+    # Full schedule with days: Mon-Fri 8:00AM-5:00PM
+    (re.compile(_DAY + r'(?:\s*[-–]\s*' + _DAY + r')?\s*:?\s*\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)'
+                r'\s*(?:to|-|–)\s*\d{1,2}:\d{2}\s*(?:AM|PM|am|pm)', re.IGNORECASE), ':', 0.95),
+    # Simple time range: 8:00AM-5:00PM or 8AM-5PM
+    (re.compile(r'\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm)\s*(?:to|-|–)\s*\d{1,2}(?::\d{2})?'
+                r'\s*(?:AM|PM|am|pm)', re.IGNORECASE), '', 0.85),
+    # 24-hour format: 08:00-17:00
+    (re.compile(r'\d{2}:\d{2}\s*(?:to|-|–)\s*\d{2}:\d{2}', re.IGNORECASE), ':', 0.8),
+    # Days only: Monday-Friday, Sat-Sun
+    (re.compile(_DAY + r'\s*[-–]\s*' + _DAY, re.IGNORECASE), '', 0.5),
+]
+
+_ADDRESS = [
+    # Standard: 123 Main Street
+    (re.compile(r'\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:St|Street|Ave|Avenue|Rd|Road|Dr|Drive|'
+                r'Blvd|Boulevard|Way|Lane|Ln|Ct|Court|Pl|Place|Pkwy|Parkway)\.?(?:\s*,?\s*[A-Z][a-z]+)?'), 0.8),
+    # With suite/unit: 123 Main St, Suite 100
+    (re.compile(r'\d+\s+[A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+(?:St|Street|Ave|Avenue|Rd|Road)\.?'
+                r'(?:\s*,?\s*(?:Suite|Ste|Unit|#)\s*\d+)?'), 0.8),
+]
+
+_FEE = [
+    (re.compile(r'\$\d+(?:\.\d{2})?\s*(?:per|/)\s*(?:mattress|item|ton)', re.IGNORECASE), 0.9),  # $25 per mattress
+    (re.compile(r'(?:fee|cost|charge|tip)(?:\s+is)?\s*\$\d+(?:\.\d{2})?', re.IGNORECASE), 0.8),  # fee is $25
+    (re.compile(r'\$\d+(?:\.\d{2})?\s+(?:fee|charge|cost)', re.IGNORECASE), 0.8),  # $25 fee
+    (re.compile(r'(?:tipping|disposal)\s+fee[s]?:\s*\$\d+(?:\.\d{2})?', re.IGNORECASE), 0.9),  # tipping fee: $25
+]
+_FEE_AMOUNT = re.compile(r'\$\d+(?:\.\d{2})?')
+
+_PLACEMENT_TIME = re.compile(r'(?:after|no earlier than)\s+(\d{1,2}(?::\d{2})?\s*(?:AM|PM|am|pm))')
+
+# Size limit patterns run on lower-cased text.
+_SIZE_LIMITS = [
+    (re.compile(r'(?:max|maximum|limit|up to)\s+(\d+)\s+(?:mattress|item)'),
+     'Max {} mattresses per household per collection', 0.9),
+    (re.compile(r'(\d+)\s+(?:mattress|item)\s+(?:max|maximum|limit|per)'),
+     'Max {} mattresses per household per collection', 0.85),
+    (re.compile(r'no more than\s+(\d+)'), 'No more than {} mattresses per collection', 0.8),
+    (re.compile(r'limit(?:ed)? to\s+(\d+)'), 'Limited to {} mattresses per household', 0.8),
+    (re.compile(r'(\d+)\s+per\s+(?:household|residence|pickup)'), '{} mattresses per household per pickup', 0.7),
+]
+
+# Schedule patterns run on lower-cased text.
+_SCHEDULE_DAYS = [
+    (re.compile(r'(?:next|available|schedule).*?(\d+)\s*(?:day|business day)'), 0.7),
+    (re.compile(r'(?:within|in)\s+(\d+)\s*(?:day|business day)'), 0.8),
+    (re.compile(r'(\d+)[-\s](?:day|business day)\s+(?:notice|advance|wait)'), 0.9),
+    (re.compile(r'(?:wait|waiting)\s+(?:time|period).*?(\d+)\s*(?:day|week)'), 0.7),
+]
+
+_WHITESPACE = re.compile(r'\s+')
+_DIGIT = re.compile(r'\d')
+
+
+class _Snippet:
+    """A snippet plus the derived forms the rules share, computed once."""
+    __slots__ = ('text', '_lower', '_has_digit')
+
+    def __init__(self, text: str):
+        self.text = text
+        self._lower = None
+        self._has_digit = None
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def has_digit(self) -> bool:
+        if self._has_digit is None:
+            self._has_digit = _DIGIT.search(self.text) is not None
+        return self._has_digit
+
+
+def _keyword(lower: str, *words: str) -> Optional[int]:
+    """Position of the first of `words` found in `lower`, or None."""
+    for word in words:
+        pos = lower.find(word)
+        if pos >= 0:
+            return pos
+    return None
+
+
+class FieldExtractor:
+    """
+    Pulls contact, schedule and pricing fields out of search snippets.
+
+    All patterns are compiled once at import. Each snippet is lower-cased
+    at most once and checked for digits at most once, and a pattern is
+    only run when the literal it needs ('$', ':', a digit) is present, so
+    a snippet with nothing to offer costs a few substring checks.
+
+    scan() yields every candidate, one per matching pattern or keyword
+    rule, with its span in the snippet and a confidence. extract() keeps
+    the first candidate per field, which is exactly what the original
+    extract_* functions in scrape_cities_enhanced.py returned.
+    """
+
+    def __init__(self):
+        self._rules = {field: getattr(self, f'_{field}') for field in FIELDS}
+
+    def scan(self, text: str, fields: Iterable[str] = FIELDS) -> List[Candidate]:
+        """Every candidate for `fields`, grouped by field in priority order."""
+        snippet = _Snippet(text)
+        candidates = []
+        for field in fields:
+            candidates.extend(self._rules[field](snippet))
+        return candidates
+
+    def extract(self, text: str, fields: Iterable[str] = FIELDS) -> Dict[str, Any]:
+        """The best value per field (None when the snippet has none)."""
+        snippet = _Snippet(text)
+        values = {}
+        for field in fields:
+            best = next(self._rules[field](snippet), None)
+            values[field] = best.value if best else None
+        return values
+
+    def extract_field(self, field: str, text: str) -> Any:
+        best = next(self._rules[field](_Snippet(text)), None)
+        return best.value if best else None
+
+    # ── RULES (generators, highest-priority candidate first) ─────────────────
+
+    def _phone(self, s: _Snippet) -> Iterator[Candidate]:
+        if not s.has_digit:
+            return
+        for pattern, confidence in _PHONE:
+            match = pattern.search(s.text)
+            if match:
+                yield Candidate('phone', match.group(0), match.start(), match.end(), confidence)
+
+    def _fine(self, s: _Snippet) -> Iterator[Candidate]:
+        if '$' not in s.text:
+            return
+        for pattern, confidence in _FINE:
+            match = pattern.search(s.text)
+            if match:
+                yield Candidate('fine', match.group(0), match.start(), match.end(), confidence)
+
+    def _hours(self, s: _Snippet) -> Iterator[Candidate]:
+        text = s.text
+        for i, (pattern, needs, confidence) in enumerate(_HOURS):
+            if i < 3 and not s.has_digit:
+                continue
+            if needs and needs not in text:
+                continue
+            if i == 3 and '-' not in text and '–' not in text:
+                continue
+            match = pattern.search(text)
+            if match:
+                yield Candidate('hours', _WHITESPACE.sub(' ', match.group(0)),
+                                match.start(), match.end(), confidence)
+        lower = s.lower
+        pos = lower.find('by appointment')
+        if pos >= 0:
+            yield Candidate('hours', 'By appointment only', pos, pos + 14, 0.4)
+        call = lower.find('call')
+        if call >= 0 and 'hour' in lower:
+            yield Candidate('hours', 'Call for hours', call, call + 4, 0.2)
+
+    def _address(self, s: _Snippet) -> Iterator[Candidate]:
+        if not s.has_digit:
+            return
+        for pattern, confidence in _ADDRESS:
+            match = pattern.search(s.text)
+            if match:
+                yield Candidate('address', match.group(0), match.start(), match.end(), confidence)
+
+    def _fee(self, s: _Snippet) -> Iterator[Candidate]:
+        if '$' not in s.text:
+            return
+        for pattern, confidence in _FEE:
+            match = pattern.search(s.text)
+            if match:
+                amount = _FEE_AMOUNT.search(match.group(0))
+                if amount:
+                    start = match.start() + amount.start()
+                    yield Candidate('fee', amount.group(0), start,
+                                    start + len(amount.group(0)), confidence)
+
+    def _wrapping(self, s: _Snippet) -> Iterator[Candidate]:
+        lower = s.lower
+        plastic = lower.find('plastic')
+        if plastic >= 0 and ('wrap' in lower or 'bag' in lower or 'cover' in lower):
+            if 'must' in lower or 'required' in lower or 'need' in lower:
+                yield Candidate('wrapping', "Must be wrapped in plastic before curbside placement",
+                                plastic, plastic + 7, 0.8)
+        pos = _keyword(lower, 'no wrap', 'not required')
+        if pos is not None:
+            yield Candidate('wrapping', "No wrapping required", pos, pos + 7, 0.6)
+        sealed = lower.find('sealed')
+        if sealed >= 0 and 'bag' in lower:
+            yield Candidate('wrapping', "Must be in sealed plastic bag", sealed, sealed + 6, 0.7)
+
+    def _placement_time(self, s: _Snippet) -> Iterator[Candidate]:
+        text, lower = s.text, s.lower
+        night = _keyword(lower, 'night before', 'evening before')
+        if night is not None:
+            if '6' in text or 'six' in lower:
+                value = "No earlier than 6PM the night before pickup"
+            elif '7' in text or 'seven' in lower:
+                value = "No earlier than 7PM the night before pickup"
+            else:
+                value = "Evening before scheduled pickup"
+            yield Candidate('placement_time', value, night, night + 12, 0.8)
+        morning = _keyword(lower, 'morning of', 'day of')
+        if morning is not None:
+            if '6' in text or 'six' in lower:
+                value = "After 6AM on day of pickup"
+            elif '7' in text or 'seven' in lower:
+                value = "After 7AM on day of pickup"
+            else:
+                value = "Morning of scheduled pickup"
+            yield Candidate('placement_time', value, morning, morning + 10, 0.8)
+        if s.has_digit and ('after' in lower or 'no earlier than' in lower):
+            match = _PLACEMENT_TIME.search(lower)
+            if match:
+                yield Candidate('placement_time', f"No earlier than {match.group(1)}",
+                                match.start(), match.end(), 0.9)
+
+    def _size_limits(self, s: _Snippet) -> Iterator[Candidate]:
+        lower = s.lower
+        if s.has_digit:
+            for pattern, template, confidence in _SIZE_LIMITS:
+                match = pattern.search(lower)
+                if match:
+                    yield Candidate('size_limits', template.format(match.group(1)),
+                                    match.start(), match.end(), confidence)
+        pos = _keyword(lower, 'no limit', 'unlimited')
+        if pos is not None:
+            yield Candidate('size_limits', 'No specific limit - check with local department',
+                            pos, pos + 8, 0.5)
+
+    def _schedule_days(self, s: _Snippet) -> Iterator[Candidate]:
+        if not s.has_digit:
+            return
+        lower = s.lower
+        if 'day' not in lower and 'week' not in lower:
+            return
+        for pattern, confidence in _SCHEDULE_DAYS:
+            match = pattern.search(lower)
+            if match:
+                num = int(match.group(1))
+                # Convert weeks to days
+                if 'week' in match.group(0):
+                    num = num * 7
+                # Only accept reasonable ranges (1-30 days)
+                if 1 <= num <= 30:
+                    yield Candidate('schedule_days', num, match.start(), match.end(), confidence)
+
+
+extractor = FieldExtractor()
@@ -1,7 +1,9 @@
 """Geographical validation to prevent city namesake collisions."""
 import re
 from typing import Dict, List, Optional, Tuple
-import httpx
+
+from .geocoding import GeocodingService
+from .http_client import HttpPool
 
 
 # ---------------------------------------------------------------------------
@@ -69,9 +71,13 @@ class GeoValidator:
     across different states.
     """
 
-    def __init__(self, logger, google_maps_api_key: str):
+    def __init__(self, logger, google_maps_api_key: str,
+                 http: Optional[HttpPool] = None,
+                 geocoder: Optional[GeocodingService] = None):
         self.logger = logger
         self.api_key = google_maps_api_key
+        self.http = http or HttpPool()
+        self.geocoder = geocoder or GeocodingService(google_maps_api_key, self.http)
         self._cache: Dict[str, Dict] = {}
 
     # ------------------------------------------------------------------
@@ -100,80 +106,70 @@ class GeoValidator:
         state_name = US_STATES.get(state_abbr, state_abbr)
 
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                # Include full state name in address string to reduce
-                # namesake collisions at the API level.
-                params = {
-                    'address': f"{city_name}, {state_name}, USA",
-                    'components': f"administrative_area:{state_abbr}|country:US",
-                    'key': self.api_key,
-                }
-                response = await client.get(
-                    "https://maps.googleapis.com/maps/api/geocode/json",
-                    params=params,
+            # Include full state name in address string to reduce
+            # namesake collisions at the API level.
+            data = await self.geocoder.geocode_city(city_name, state_abbr, state_name)
+
+            if data['status'] != 'OK':
+                error = (
+                    f"City '{city_name}, {state_abbr}' not found by geocoding API "
+                    f"(status: {data['status']})"
+                )
+                self._cache[cache_key] = {'valid': False, 'error': error}
+                self.logger.log('geo_validation', 'FAILED', error)
+                return False, error
+
+            result = data['results'][0]
+            components = {
+                c['types'][0]: c
+                for c in result.get('address_components', [])
+            }
+
+            # Verify the returned state actually matches what we asked for.
+            # short_name for administrative_area_level_1 is the 2-letter abbr.
+            state_comp = components.get('administrative_area_level_1', {})
+            actual_abbr = state_comp.get('short_name', '').upper()
+            actual_name = state_comp.get('long_name', '')
+
+            if actual_abbr != state_abbr:
+                error = (
+                    f"State mismatch: '{city_name}' resolved to {actual_name} "
+                    f"({actual_abbr}), not {state_abbr} ({state_name}). "
+                    f"This is a namesake city in a different state."
                 )
-                data = response.json()
-
-                if data['status'] != 'OK':
-                    error = (
-                        f"City '{city_name}, {state_abbr}' not found by geocoding API "
-                        f"(status: {data['status']})"
-                    )
-                    self._cache[cache_key] = {'valid': False, 'error': error}
-                    self.logger.log('geo_validation', 'FAILED', error)
-                    return False, error
-
-                result = data['results'][0]
-                components = {
-                    c['types'][0]: c
-                    for c in result.get('address_components', [])
-                }
-
-                # Verify the returned state actually matches what we asked for.
-                # short_name for administrative_area_level_1 is the 2-letter abbr.
-                state_comp = components.get('administrative_area_level_1', {})
-                actual_abbr = state_comp.get('short_name', '').upper()
-                actual_name = state_comp.get('long_name', '')
-
-                if actual_abbr != state_abbr:
-                    error = (
-                        f"State mismatch: '{city_name}' resolved to {actual_name} "
-                        f"({actual_abbr}), not {state_abbr} ({state_name}). "
-                        f"This is a namesake city in a different state."
-                    )
-                    self._cache[cache_key] = {'valid': False, 'error': error}
-                    self.logger.log('geo_validation', 'FAILED', error)
-                    return False, error
-
-                # Require a locality (incorporated city/town).
-                # Unincorporated areas return only sublocality or no locality.
-                locality = components.get('locality', {}).get('long_name', '')
-                sublocality = components.get('sublocality', {}).get('long_name', '')
-
-                if not locality and not sublocality:
-                    error = (
-                        f"'{city_name}, {state_abbr}' appears to be an unincorporated "
-                        f"area or very small community — skipping to avoid data confusion."
-                    )
-                    self._cache[cache_key] = {'valid': False, 'error': error}
-                    self.logger.log('geo_validation', 'WARNING', error)
-                    return False, error
-
-                formatted = result.get('formatted_address', '')
-                location = result['geometry']['location']
-
-                self._cache[cache_key] = {
-                    'valid': True,
-                    'error': None,
-                    'formatted_address': formatted,
-                    'location': location,
-                    'actual_state_abbr': actual_abbr,
-                }
-                self.logger.log(
-                    'geo_validation', 'PASSED',
-                    f"{city_name}, {state_abbr} → {formatted}",
+                self._cache[cache_key] = {'valid': False, 'error': error}
+                self.logger.log('geo_validation', 'FAILED', error)
+                return False, error
+
+            # Require a locality (incorporated city/town).
+            # Unincorporated areas return only sublocality or no locality.
+            locality = components.get('locality', {}).get('long_name', '')
+            sublocality = components.get('sublocality', {}).get('long_name', '')
+
+            if not locality and not sublocality:
+                error = (
+                    f"'{city_name}, {state_abbr}' appears to be an unincorporated "
+                    f"area or very small community — skipping to avoid data confusion."
                 )
-                return True, None
+                self._cache[cache_key] = {'valid': False, 'error': error}
+                self.logger.log('geo_validation', 'WARNING', error)
+                return False, error
+
+            formatted = result.get('formatted_address', '')
+            location = result['geometry']['location']
+
+            self._cache[cache_key] = {
+                'valid': True,
+                'error': None,
+                'formatted_address': formatted,
+                'location': location,
+                'actual_state_abbr': actual_abbr,
+            }
+            self.logger.log(
+                'geo_validation', 'PASSED',
+                f"{city_name}, {state_abbr} → {formatted}",
+            )
+            return True, None
 
         except Exception as e:
             error = f"Geocoding API error: {str(e)}"
@@ -0,0 +1,79 @@
+"""Shared Google Geocoding lookups for one scraper run."""
+import asyncio
+from typing import Dict, Optional
+
+from .cache import get_cache, make_key
+from .config import GEOCODE_CACHE_TTL_HOURS, GEOCODE_CACHE_MAX_ENTRIES
+from .http_client import HttpPool
+from .inflight import InflightCalls
+
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+
+# Statuses that describe the place rather than the request; anything else
+# (OVER_QUERY_LIMIT, REQUEST_DENIED, UNKNOWN_ERROR) is retried next time.
+_CACHEABLE_STATUSES = {'OK', 'ZERO_RESULTS'}
+
+
+class GeocodingService:
+    """
+    Memoized city geocoding shared by GeoValidator and Phase1Foundation.
+
+    Both used to send the same state-filtered request for every city, one
+    right after the other. This service sends it once per (city, state),
+    coalesces concurrent callers onto the same in-flight request, and
+    persists definitive answers in the 'geocoding' DiskCache so validation
+    survives process restarts.
+
+    One instance is created per run and handed to every spawned scraper.
+    """
+
+    def __init__(self, api_key: str, http: Optional[HttpPool] = None):
+        self.api_key = api_key
+        self.http = http or HttpPool()
+        self.cache = get_cache(
+            'geocoding', GEOCODE_CACHE_TTL_HOURS * 3600, GEOCODE_CACHE_MAX_ENTRIES,
+        )
+        self._memo: Dict[str, Dict] = {}
+        self._inflight = InflightCalls()
+        self.api_calls = 0
+
+    async def geocode_city(self, city_name: str, state_abbr: str,
+                           state_name: str) -> Dict:
+        """
+        Geocode "{city}, {state}, USA" restricted to the state and country.
+
+        Returns the API payload trimmed to its first result:
+        {'status': ..., 'results': [{geometry, address_components, ...}]}.
+        Network errors propagate so callers keep their own fallbacks.
+        """
+        state_abbr = state_abbr.strip().upper()
+        params = {
+            'address': f"{city_name.strip()}, {state_name}, USA",
+            'components': f"administrative_area:{state_abbr}|country:US",
+        }
+        key = make_key(' '.join(params['address'].lower().split()), params['components'])
+
+        if key in self._memo:
+            return self._memo[key]
+        return await self._inflight.run(key, lambda: self._lookup(key, params))
+
+    async def _lookup(self, key: str, params: Dict) -> Dict:
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            self._memo[key] = cached
+            return cached
+        data = await self._request(params)
+        if data['status'] in _CACHEABLE_STATUSES:
+            self._memo[key] = data
+            await asyncio.to_thread(self.cache.set, key, data)
+        return data
+
+    async def _request(self, params: Dict) -> Dict:
+        client = self.http.for_phase('geo_validation')
+        self.api_calls += 1
+        response = await client.get(GEOCODE_URL, params={**params, 'key': self.api_key})
+        data = response.json()
+        return {
+            'status': data.get('status', 'UNKNOWN_ERROR'),
+            'results': data.get('results', [])[:1],
+        }
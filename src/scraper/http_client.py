@@ -0,0 +1,416 @@
+"""Shared, pooled HTTP client for all scraper phases."""
+import asyncio
+import json
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .config import (
+    HTTP_MAX_CONNECTIONS, HTTP_MAX_CONNECTIONS_PER_HOST, HTTP_MAX_429_RETRIES,
+    FETCH_MAX_BYTES_HTML, FETCH_MAX_BYTES_PDF,
+    HTTP_CACHE_TTL_HOURS, HTTP_CACHE_FRESH_HOURS, HTTP_CACHE_MAX_ENTRIES,
+)
+from .cache import DiskCache, get_cache, make_key
+from .rate_limiter import RateLimiterRegistry, limiters, parse_retry_after
+
+# HTTP/2 support in httpx needs the optional `h2` package.
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Per-phase timeout profiles in seconds. These are the timeouts each phase
+# used back when it opened its own short-lived client.
+TIMEOUT_PROFILES: Dict[str, float] = {
+    'geo_validation': 10.0,
+    'foundation': 15.0,
+    'recon': 30.0,
+    'secondary': 20.0,
+    'places': 10.0,
+    'competitor': 15.0,
+}
+
+DEFAULT_TIMEOUT = 15.0
+
+# Largest body kept per content kind. HTML past the cap is truncated (the
+# phases keep only the first 15,000 characters of text anyway); a PDF past
+# the cap is abandoned because a partial PDF cannot be parsed.
+FETCH_MAX_BYTES: Dict[str, int] = {
+    'html': FETCH_MAX_BYTES_HTML,
+    'pdf': FETCH_MAX_BYTES_PDF,
+}
+
+# Content types that don't say what the body is, so the first bytes decide.
+_GENERIC_CONTENT_TYPES = {
+    '', 'application/octet-stream', 'binary/octet-stream',
+    'application/x-download', 'application/download', 'text/plain',
+}
+
+
+def sniff_kind(content_type: str, head: bytes) -> Optional[str]:
+    """Classify a body as 'html', 'pdf' or None (unsupported)."""
+    content_type = content_type.split(';')[0].strip().lower()
+    if content_type in ('text/html', 'application/xhtml+xml'):
+        return 'html'
+    if content_type in ('application/pdf', 'application/x-pdf'):
+        return 'pdf'
+    if content_type in _GENERIC_CONTENT_TYPES:
+        if b'%PDF-' in head[:1024]:
+            return 'pdf'
+        lowered = head[:1024].lower()
+        if b'<html' in lowered or b'<!doctype html' in lowered:
+            return 'html'
+    return None
+
+
+class FetchResult:
+    """
+    Outcome of a byte-capped download.
+
+    `kind` is 'html', 'pdf' or None when the body was skipped as an
+    unsupported type. `truncated` means `content` stops at the cap;
+    `aborted` means the body was too large to keep at all (content is
+    empty). `note` describes either event for the logger.
+    """
+
+    def __init__(self, url: str, status_code: int, kind: Optional[str],
+                 content: bytes = b'', truncated: bool = False,
+                 aborted: bool = False, note: str = ''):
+        self.url = url
+        self.status_code = status_code
+        self.kind = kind
+        self.content = content
+        self.truncated = truncated
+        self.aborted = aborted
+        self.note = note
+
+
+class ResponseCache:
+    """
+    On-disk cache of fetch() and probe() responses.
+
+    Each entry is a JSON header (status, kind, final URL, ETag,
+    Last-Modified, store time) followed by the zlib-compressed body.
+    Entries younger than `fresh_seconds` are answered without a request.
+    Older ones are revalidated with If-None-Match / If-Modified-Since: a
+    304 reuses the stored body and restarts the fresh window, anything
+    else replaces the entry. Only 200 html/pdf bodies that were not
+    abandoned at the byte cap are kept.
+    """
+
+    def __init__(self, cache: DiskCache,
+                 fresh_seconds: float = HTTP_CACHE_FRESH_HOURS * 3600):
+        self.cache = cache
+        self.fresh_seconds = fresh_seconds
+
+    def load(self, method: str, url: str) -> Optional[Tuple[Dict, bytes]]:
+        """Return (header, compressed body) for a stored response, or None."""
+        raw = self.cache.get_raw(make_key(method, url))
+        if raw is None:
+            return None
+        header, _, body = raw.partition(b'\0')
+        try:
+            return json.loads(header), body
+        except ValueError:
+            return None
+
+    def store(self, method: str, url: str, meta: Dict, body: bytes = b''):
+        meta = dict(meta, stored_at=time.time())
+        self.cache.set_raw(
+            make_key(method, url), json.dumps(meta).encode('utf-8') + b'\0' + body,
+        )
+
+    def is_fresh(self, meta: Dict) -> bool:
+        return time.time() - meta.get('stored_at', 0) < self.fresh_seconds
+
+    @staticmethod
+    def conditional_headers(meta: Dict) -> Dict[str, str]:
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def count(self, event: str):
+        self.cache.events[event] = self.cache.events.get(event, 0) + 1
+
+    def revalidated(self, method: str, url: str, meta: Dict, body: bytes):
+        """Record a 304: the stored entry is good for another fresh window."""
+        self.count('304 revalidated')
+        self.store(method, url, meta, body)
+
+    def store_fetch(self, url: str, result: FetchResult, headers: httpx.Headers,
+                    replaced: bool = False):
+        if (result.status_code != 200 or result.kind is None
+                or result.aborted or not result.content):
+            return
+        if replaced:
+            self.count('refetched')
+        meta = {
+            'url': result.url,
+            'status': result.status_code,
+            'kind': result.kind,
+            'truncated': result.truncated,
+            'note': result.note,
+            'etag': headers.get('etag'),
+            'last_modified': headers.get('last-modified'),
+        }
+        self.store('GET', url, meta, zlib.compress(result.content, 6))
+
+    @staticmethod
+    def to_result(meta: Dict, body: bytes) -> FetchResult:
+        return FetchResult(
+            meta['url'], meta['status'], meta['kind'],
+            zlib.decompress(body) if body else b'',
+            truncated=meta.get('truncated', False), note=meta.get('note', ''),
+        )
+
+
+# Process-wide response cache used by every HttpPool unless one is passed in.
+http_cache = ResponseCache(
+    get_cache('http', HTTP_CACHE_TTL_HOURS * 3600, HTTP_CACHE_MAX_ENTRIES),
+)
+
+
+class HttpPool:
+    """
+    One long-lived AsyncClient shared by every phase of a run.
+
+    Reusing the client keeps TCP/TLS connections to Google, Serper and
+    Census alive between phases and cities instead of paying the handshake
+    again for every phase. Connections are capped globally by httpx and
+    per host by a semaphore, so a burst of fetches against one municipal
+    server cannot starve the API hosts.
+
+    Every request first takes a token from the provider's rate limiter
+    (see rate_limiter.provider_for_url). A 429 pauses that provider for its
+    Retry-After before the request is retried.
+
+    fetch() and probe() go through a ResponseCache, so pages that have not
+    changed since the last run cost a 304 at most.
+
+    The pool must be closed with aclose() at the end of a run.
+    """
+
+    def __init__(self, max_connections: int = HTTP_MAX_CONNECTIONS,
+                 max_connections_per_host: int = HTTP_MAX_CONNECTIONS_PER_HOST,
+                 rate_limiters: Optional[RateLimiterRegistry] = None,
+                 response_cache: Optional[ResponseCache] = None):
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.rate_limiters = rate_limiters or limiters
+        self.response_cache = response_cache or http_cache
+        self._client: Optional[httpx.AsyncClient] = None
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The underlying client, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=DEFAULT_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    def for_phase(self, profile: str, follow_redirects: bool = False) -> 'PhaseClient':
+        """Return a view of the pool using one phase's timeout profile."""
+        return PhaseClient(
+            self,
+            timeout=TIMEOUT_PROFILES.get(profile, DEFAULT_TIMEOUT),
+            follow_redirects=follow_redirects,
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        Send a request under the provider's rate limit, holding one of the
+        target host's connection slots. 429 responses are retried after the
+        provider's Retry-After, up to HTTP_MAX_429_RETRIES times.
+        """
+        host = (urlsplit(url).hostname or '').lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_slots[host] = slot
+        limiter = self.rate_limiters.for_url(url)
+
+        for attempt in range(HTTP_MAX_429_RETRIES + 1):
+            await limiter.acquire()
+            async with slot:
+                response = await self.client.request(method, url, **kwargs)
+            if response.status_code != 429 or attempt == HTTP_MAX_429_RETRIES:
+                return response
+            limiter.penalize(parse_retry_after(
+                response.headers.get('Retry-After'), default=2.0 ** (attempt + 1),
+            ))
+        return response
+
+    async def fetch(self, url: str, max_bytes: Optional[Dict[str, int]] = None,
+                    **kwargs) -> FetchResult:
+        """
+        GET `url` as a stream, keeping at most `max_bytes[kind]` of the body.
+
+        The content type is checked (and the first chunk sniffed) before
+        the rest of the body is read, so images, archives and other
+        unsupported responses cost one chunk. Oversized PDFs are abandoned
+        as soon as Content-Length or the running total passes the cap.
+        Rate limits, host slots and 429 retries work as in request().
+
+        A fresh cached copy is returned without a request; a stale one is
+        revalidated and reused on 304 (see ResponseCache).
+        """
+        max_bytes = max_bytes or FETCH_MAX_BYTES
+        cache = self.response_cache
+        cached = await asyncio.to_thread(cache.load, 'GET', url)
+        if cached is not None:
+            if cache.is_fresh(cached[0]):
+                return await asyncio.to_thread(cache.to_result, *cached)
+            kwargs['headers'] = {**(kwargs.get('headers') or {}),
+                                 **cache.conditional_headers(cached[0])}
+
+        host = (urlsplit(url).hostname or '').lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_slots[host] = slot
+        limiter = self.rate_limiters.for_url(url)
+
+        for attempt in range(HTTP_MAX_429_RETRIES + 1):
+            await limiter.acquire()
+            async with slot:
+                async with self.client.stream('GET', url, **kwargs) as response:
+                    if response.status_code == 304 and cached is not None:
+                        await asyncio.to_thread(cache.revalidated, 'GET', url, *cached)
+                        return await asyncio.to_thread(cache.to_result, *cached)
+                    if response.status_code != 429 or attempt == HTTP_MAX_429_RETRIES:
+                        result = await self._read_capped(response, max_bytes)
+                        await asyncio.to_thread(cache.store_fetch, url, result,
+                                                response.headers, cached is not None)
+                        return result
+                    retry_after = response.headers.get('Retry-After')
+            limiter.penalize(parse_retry_after(retry_after, default=2.0 ** (attempt + 1)))
+
+    async def probe(self, url: str, **kwargs) -> int:
+        """
+        HEAD `url` and return its status code.
+
+        Statuses below 500 (other than 429) are cached and revalidated the
+        same way as fetch(), so re-checking a known URL is usually free.
+        """
+        cache = self.response_cache
+        cached = await asyncio.to_thread(cache.load, 'HEAD', url)
+        if cached is not None:
+            if cache.is_fresh(cached[0]):
+                return cached[0]['status']
+            kwargs['headers'] = {**(kwargs.get('headers') or {}),
+                                 **cache.conditional_headers(cached[0])}
+
+        response = await self.request('HEAD', url, **kwargs)
+        status = response.status_code
+        if status == 304 and cached is not None:
+            await asyncio.to_thread(cache.revalidated, 'HEAD', url, *cached)
+            return cached[0]['status']
+        if status < 500 and status != 429:
+            await asyncio.to_thread(cache.store, 'HEAD', url, {
+                'status': status,
+                'etag': response.headers.get('etag'),
+                'last_modified': response.headers.get('last-modified'),
+            })
+        return status
+
+    @staticmethod
+    async def _read_capped(response: httpx.Response,
+                           max_bytes: Dict[str, int]) -> FetchResult:
+        url = str(response.url)
+        chunks = response.aiter_bytes()
+        head = b''
+        async for chunk in chunks:
+            head = chunk
+            break
+
+        content_type = response.headers.get('content-type', '')
+        kind = sniff_kind(content_type, head)
+        if kind is None:
+            return FetchResult(url, response.status_code, None,
+                               note=f"skipped unsupported content type '{content_type or 'unknown'}'")
+
+        cap = max_bytes.get(kind, FETCH_MAX_BYTES[kind])
+        try:
+            declared = int(response.headers.get('content-length') or 0)
+        except ValueError:
+            declared = 0
+        if kind == 'pdf' and declared > cap:
+            return FetchResult(url, response.status_code, kind, aborted=True,
+                               note=f"PDF is {declared:,} bytes, over the {cap:,} byte cap")
+
+        body = [head]
+        size = len(head)
+        if size <= cap:
+            async for chunk in chunks:
+                body.append(chunk)
+                size += len(chunk)
+                if size > cap:
+                    break
+        if size <= cap:
+            return FetchResult(url, response.status_code, kind, b''.join(body))
+        if kind == 'pdf':
+            return FetchResult(url, response.status_code, kind, aborted=True,
+                               note=f"PDF passed the {cap:,} byte cap; download abandoned")
+        return FetchResult(url, response.status_code, kind, b''.join(body)[:cap],
+                           truncated=True, note=f"truncated at {cap:,} bytes")
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class PhaseClient:
+    """
+    Phase-specific view of an HttpPool.
+
+    Exposes the small get/post/head surface the phases already use on
+    httpx.AsyncClient, plus the pool's fetch/probe, applying the phase's
+    timeout and redirect policy unless a call overrides them.
+    """
+
+    def __init__(self, pool: HttpPool, timeout: float, follow_redirects: bool):
+        self.pool = pool
+        self.timeout = timeout
+        self.follow_redirects = follow_redirects
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('follow_redirects', self.follow_redirects)
+        return await self.pool.request(method, url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('GET', url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('POST', url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request('HEAD', url, **kwargs)
+
+    async def fetch(self, url: str, max_bytes: Optional[Dict[str, int]] = None,
+                    **kwargs) -> FetchResult:
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('follow_redirects', self.follow_redirects)
+        return await self.pool.fetch(url, max_bytes, **kwargs)
+
+    async def probe(self, url: str, **kwargs) -> int:
+        kwargs.setdefault('timeout', self.timeout)
+        kwargs.setdefault('follow_redirects', self.follow_redirects)
+        return await self.pool.probe(url, **kwargs)
@@ -0,0 +1,50 @@
+"""Coalescing of concurrent lookups for the same key."""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class InflightCalls:
+    """
+    At most one running call per key; concurrent callers share its outcome.
+
+    The first caller for a key (the leader) runs `fn`; callers that arrive
+    while it runs wait on a shared future and get the same result or
+    exception. If the leader is cancelled, the future is cancelled too,
+    and the waiters start over, one of them becoming the new leader,
+    instead of waiting forever on a future nobody will resolve.
+    """
+
+    def __init__(self):
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._futures
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        while key in self._futures:
+            future = self._futures[key]
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise  # this caller was cancelled, not the leader
+                # The leader was cancelled; the entry is gone, so retry.
+
+        future = asyncio.get_running_loop().create_future()
+        self._futures[key] = future
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited future doesn't warn.
+            future.exception()
+            raise
+        except BaseException:
+            # Cancelled (or interrupted): release the waiters.
+            future.cancel()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._futures[key]
@@ -0,0 +1,177 @@
+"""Durable per-location job status, so long CLI runs can be resumed."""
+import asyncio
+import os
+import sqlite3
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import JOB_MAX_ATTEMPTS, JOB_RETRY_BACKOFF_SECONDS
+
+# Statuses that end a job; anything else (pending, running, failed) is
+# picked up again by --resume.
+FINAL_STATUSES = ('done', 'skipped')
+
+# (status, artifact path) per job key, as returned by a job function.
+Outcomes = Dict[str, Tuple[str, Optional[str]]]
+
+# Longest wait between attempts, however many times a job has failed.
+_MAX_BACKOFF_SECONDS = 900.0
+
+
+class JobLedger:
+    """
+    SQLite table of jobs keyed by location, with status, attempt count,
+    last error and the path of the output written for it.
+
+    Every status change is committed at once, so after a crash or Ctrl-C
+    the ledger says exactly which locations finished. A job left
+    'running' by a crash counts as unfinished.
+
+    `max_attempts` applies per run; `attempts` in the table is the total
+    across runs and sets the backoff, so a job that keeps failing is
+    retried ever more slowly by successive --resume runs.
+    """
+
+    def __init__(self, path: str, max_attempts: int = JOB_MAX_ATTEMPTS,
+                 backoff_seconds: float = JOB_RETRY_BACKOFF_SECONDS):
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.backoff_seconds = backoff_seconds
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS jobs ('
+            ' key TEXT PRIMARY KEY,'
+            " status TEXT NOT NULL DEFAULT 'pending',"
+            ' attempts INTEGER NOT NULL DEFAULT 0,'
+            ' last_error TEXT,'
+            ' artifact_path TEXT,'
+            ' next_attempt_at REAL NOT NULL DEFAULT 0,'
+            ' updated_at REAL NOT NULL)'
+        )
+        self._conn.commit()
+
+    def register(self, keys: Iterable[str], reset: bool = False):
+        """
+        Add jobs as pending. With `reset`, jobs already in the ledger are
+        set back to pending with no attempts (a fresh, non-resumed run).
+        """
+        now = time.time()
+        verb = 'INSERT OR REPLACE' if reset else 'INSERT OR IGNORE'
+        self._conn.executemany(
+            f"{verb} INTO jobs (key, status, attempts, updated_at) VALUES (?, 'pending', 0, ?)",
+            [(key, now) for key in keys],
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute(
+            'SELECT key, status, attempts, last_error, artifact_path, next_attempt_at '
+            'FROM jobs WHERE key = ?', (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        return dict(zip(
+            ('key', 'status', 'attempts', 'last_error', 'artifact_path', 'next_attempt_at'), row,
+        ))
+
+    def should_run(self, key: str) -> bool:
+        """True if the job is unfinished."""
+        job = self.get(key)
+        return job is None or job['status'] not in FINAL_STATUSES
+
+    def completed(self, keys: Iterable[str]) -> List[Dict[str, Any]]:
+        """Finished jobs among `keys`, in the order given."""
+        jobs = [self.get(key) for key in keys]
+        return [job for job in jobs if job and job['status'] in FINAL_STATUSES]
+
+    def _update(self, key: str, **fields):
+        fields['updated_at'] = time.time()
+        columns = ', '.join(f"{name} = ?" for name in fields)
+        self._conn.execute(
+            f"UPDATE jobs SET {columns} WHERE key = ?", (*fields.values(), key),
+        )
+        self._conn.commit()
+
+    def start(self, key: str):
+        self._conn.execute(
+            "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? "
+            'WHERE key = ?', (time.time(), key),
+        )
+        self._conn.commit()
+
+    def finish(self, key: str, status: str, artifact_path: Optional[str] = None):
+        self._update(key, status=status, artifact_path=artifact_path, last_error=None)
+
+    def fail(self, key: str, error: str):
+        """Record a failed attempt and when the next one may start."""
+        attempts = (self.get(key) or {}).get('attempts', 1)
+        delay = min(self.backoff_seconds * 2 ** max(0, attempts - 1), _MAX_BACKOFF_SECONDS)
+        self._update(key, status='failed', last_error=error[:500],
+                     next_attempt_at=time.time() + delay)
+
+    def backoff_delay(self, keys: Iterable[str]) -> float:
+        """Seconds until every job in `keys` may be attempted again."""
+        now = time.time()
+        waits = [
+            job['next_attempt_at'] - now
+            for job in (self.get(key) for key in keys) if job
+        ]
+        return max([0.0] + waits)
+
+    async def run(self, keys: List[str],
+                  job_fn: Callable[[], Awaitable[Tuple[Any, Outcomes]]]) -> Any:
+        """
+        Run `job_fn()` for a group of job keys until it succeeds, making at
+        most `max_attempts` attempts and waiting out each failure's backoff
+        (including one recorded by an earlier run).
+
+        `job_fn` returns (result, outcomes). Keys it leaves out of
+        `outcomes` are marked failed and left for the next --resume.
+
+        Raises:
+            Exception: The last error once no attempts remain.
+        """
+        for attempt in range(1, self.max_attempts + 1):
+            delay = self.backoff_delay(keys)
+            if delay > 0:
+                print(f"⏳ Retrying {len(keys)} job(s) in {delay:.0f}s")
+                await asyncio.sleep(delay)
+            for key in keys:
+                self.start(key)
+            try:
+                result, outcomes = await job_fn()
+            except Exception as e:
+                for key in keys:
+                    self.fail(key, f"{type(e).__name__}: {e}")
+                if attempt == self.max_attempts:
+                    raise
+                print(f"⚠️  Attempt failed ({e}); will retry")
+                continue
+            for key in keys:
+                if key in outcomes:
+                    self.finish(key, *outcomes[key])
+                else:
+                    self.fail(key, 'no output produced')
+            return result
+
+    def counts(self, keys: Iterable[str]) -> Dict[str, int]:
+        """Number of jobs per status among `keys`."""
+        counts: Dict[str, int] = {}
+        for job in (self.get(key) for key in keys):
+            if job:
+                counts[job['status']] = counts.get(job['status'], 0) + 1
+        return counts
+
+    def summary(self, keys: Iterable[str]) -> str:
+        """One-line status breakdown for the CLI summary."""
+        counts = self.counts(keys)
+        line = ', '.join(f"{n} {status}" for status, n in sorted(counts.items()))
+        unfinished = sum(n for status, n in counts.items() if status not in FINAL_STATUSES)
+        if unfinished:
+            line += ' (rerun with --resume to retry)'
+        return line
+
+    def close(self):
+        self._conn.close()
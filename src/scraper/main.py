@@ -1,7 +1,7 @@
 """Main orchestration for the autonomous scraper."""
 import asyncio
 import random
-from typing import Dict
+from typing import Any, Dict, Optional
 from datetime import datetime
 
 try:
@@ -11,6 +11,15 @@ try:
         Phase5Competitor
     )
     from .agents import CharismaSynthesizer
+    from .http_client import HttpPool
+    from .geocoding import GeocodingService
+    from .census import CensusService
+    from .places import PlacesService
+    from .geo_validator import GeoValidator
+    from .config import GOOGLE_MAPS_API_KEY
+    from .pipeline import PhaseGraph, PipelineAborted
+    from .change_detection import content_fingerprint, extraction_snapshots
+    from .artifacts import ArtifactStore, REPLAY_STAGES
 except ImportError:
     from utils import Logger, calculate_confidence
     from phases import (
@@ -18,26 +27,91 @@ except ImportError:
         Phase5Competitor
     )
     from agents import CharismaSynthesizer
+    from http_client import HttpPool
+    from geocoding import GeocodingService
+    from census import CensusService
+    from places import PlacesService
+    from geo_validator import GeoValidator
+    from config import GOOGLE_MAPS_API_KEY
+    from pipeline import PhaseGraph, PipelineAborted
+    from change_detection import content_fingerprint, extraction_snapshots
+    from artifacts import ArtifactStore, REPLAY_STAGES
 
 
 class AutonomousScraper:
     """
     Multi-agent orchestration system for autonomous city data generation.
     Refactored with proper async HTTP, modular structure, and security.
+
+    All phases share one pooled HTTP client. Pass `http` to share a pool
+    across several scrapers; otherwise the scraper owns its pool and
+    closes it in aclose(). Likewise `geocoder`, `census` and `places` share
+    geocoding results, Census state tables and Place Details between
+    scrapers in the same run.
+
+    Every phase's output is saved to `artifacts` per city. With
+    `from_stage` set to a REPLAY_STAGES key, the earlier phases are loaded
+    from those artifacts instead of being run.
     """
     
-    def __init__(self):
+    def __init__(self, http: Optional[HttpPool] = None,
+                 geocoder: Optional[GeocodingService] = None,
+                 census: Optional[CensusService] = None,
+                 places: Optional[PlacesService] = None,
+                 artifacts: Optional[ArtifactStore] = None,
+                 from_stage: Optional[str] = None):
+        if from_stage is not None and from_stage not in REPLAY_STAGES:
+            raise ValueError(f"Unknown stage '{from_stage}'; expected one of {list(REPLAY_STAGES)}")
         self.logger = Logger()
+        self.http = http or HttpPool()
+        self._owns_http = http is None
+        self.geocoder = geocoder or GeocodingService(GOOGLE_MAPS_API_KEY, self.http)
+        self.census = census or CensusService(self.http)
+        self.places = places or PlacesService(GOOGLE_MAPS_API_KEY, self.http)
+        self.artifacts = artifacts or ArtifactStore()
+        self.from_stage = from_stage
+        
+        # Phase 1 and Phase 2 share one validator (and its verdict cache)
+        self.geo_validator = GeoValidator(
+            self.logger, GOOGLE_MAPS_API_KEY, self.http, self.geocoder,
+        )
         
         # Initialize phases
-        self.phase1 = Phase1Foundation(self.logger)
-        self.phase2 = Phase2Reconnaissance(self.logger)
-        self.phase3 = Phase3Intelligence(self.logger)
-        self.phase5 = Phase5Competitor(self.logger)
+        self.phase1 = Phase1Foundation(
+            self.logger, self.http, self.geo_validator, self.census,
+        )
+        self.phase2 = Phase2Reconnaissance(self.logger, self.http, self.geo_validator)
+        self.phase3 = Phase3Intelligence(self.logger, self.http, self.places)
+        self.phase5 = Phase5Competitor(self.logger, self.http)
         
         # Initialize charisma synthesizer
         self.charisma = CharismaSynthesizer(self.logger)
     
+    def spawn(self) -> 'AutonomousScraper':
+        """
+        Create a sibling scraper for processing another city concurrently.
+
+        The sibling has its own Logger and phases but shares this scraper's
+        HTTP pool, geocoding service, Census snapshots, Places service,
+        artifact store and replay mode. The pool stays owned (and closed)
+        by this scraper.
+        """
+        return AutonomousScraper(
+            http=self.http, geocoder=self.geocoder, census=self.census,
+            places=self.places, artifacts=self.artifacts, from_stage=self.from_stage,
+        )
+    
+    async def aclose(self):
+        """Shut down the shared HTTP client if this scraper owns it."""
+        if self._owns_http:
+            await self.http.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
     async def scrape_city_autonomous(self, city_name: str, state_abbr: str, state_name: str) -> Dict:
         """
         Main orchestration method - generates 100% of v5.0 schema.
@@ -57,52 +131,156 @@ class AutonomousScraper:
         print(f"🤖 AUTONOMOUS PIPELINE: {city_name}, {state_abbr}")
         print(f"{'='*80}\n")
         
-        # Phase 1: Foundation Layer (Deterministic APIs)
-        print("📍 PHASE 1: Foundation Layer (Geo + Census + Weather)")
-        geo_data = await self.phase1.execute(city_name, state_abbr, state_name)
+        replay: Dict[str, Any] = {}
+        if self.from_stage:
+            try:
+                replay = await asyncio.to_thread(
+                    self.artifacts.load_all, city_name, state_abbr,
+                    REPLAY_STAGES[self.from_stage],
+                )
+            except FileNotFoundError as e:
+                print(f"\n❌ Cannot replay from '{self.from_stage}': {e}")
+                return {
+                    'error': 'missing_artifacts',
+                    'message': str(e),
+                    'city_name': city_name,
+                    'state_abbr': state_abbr,
+                    'skipped': True
+                }
+            print(f"♻️  Replaying from stage '{self.from_stage}' using stored artifacts\n")
+            self.logger.log_entries = replay.pop('log')
+            replay['geo_validation'] = True
         
-        # Check if geographical validation failed
-        if geo_data.get('geo_validation_failed'):
-            print(f"\n❌ VALIDATION FAILED: {geo_data.get('geo_validation_error')}")
+        # Phases run as a dependency graph: Phase 2 needs only the geo
+        # verdict, Phase 5 needs nothing and starts speculatively, Phase 3
+        # is skipped when Phase 2's content is unchanged since the last
+        # run, and Phase 4 waits for both Phase 1 and Phase 3.
+        graph = self._build_graph(city_name, state_abbr, state_name, replay)
+        try:
+            results = await graph.run()
+        except PipelineAborted as e:
+            print(f"\n❌ VALIDATION FAILED: {e.reason}")
             print(f"⚠️  Skipping {city_name}, {state_abbr} to prevent data hallucination\n")
             return {
                 'error': 'geo_validation_failed',
-                'message': geo_data.get('geo_validation_error'),
+                'message': e.reason,
                 'city_name': city_name,
                 'state_abbr': state_abbr,
                 'skipped': True
             }
         
-        # Phase 2: Reconnaissance Layer (Search & Fetch)
-        print("\n🔍 PHASE 2: Reconnaissance Layer (Official Sources)")
-        official_content = await self.phase2.execute(city_name, state_abbr, state_name)
-        
-        # Check if content validation failed
-        if official_content.get('content_validation_failed'):
-            print(f"\n⚠️  CONTENT VALIDATION WARNING: {official_content.get('content_validation_warning')}")
-            print(f"🔄 Scraped content rejected - will use fallback data only\n")
-        
-        # Phase 3: Intelligence Layer (LLM Extraction)
-        print("\n🧠 PHASE 3: Intelligence Layer (Structured Extraction)")
-        extracted_data = await self.phase3.execute(official_content, city_name, state_abbr)
-        
-        # Phase 4: Charisma Synthesis Layer (Copywriting)
-        print("\n✨ PHASE 4: Charisma Synthesis (SEO + Hero + Neighborhoods)")
-        charisma_data = await self.charisma.generate(extracted_data, geo_data, city_name, state_abbr)
-        
-        # Phase 5: Competitor Triangulation
-        print("\n💰 PHASE 5: Competitor Triangulation (Pricing)")
-        competitor_data = await self.phase5.execute(city_name, state_abbr)
+        # Persist what this run computed so later stages can be replayed
+        computed = {
+            name: results[name] for name in graph.timings
+            if name not in replay and name != 'geo_validation'
+        }
+        if computed:
+            computed['log'] = self.logger.log_entries
+            await asyncio.to_thread(self.artifacts.save_all, city_name, state_abbr, computed)
         
         # Phase 6: Assembly & Validation
         print("\n🔧 PHASE 6: Assembly & Validation")
         final_data = self._phase6_assembly(
             city_name, state_name, state_abbr,
-            geo_data, official_content, extracted_data, charisma_data, competitor_data
+            results['phase1'], results['phase2'], results['phase3'],
+            results['charisma'], results['phase5'],
         )
         
+        print("\n⏱️  Phase timings (* = critical path)")
+        for line in graph.report():
+            print(f"  {line}")
+        
         return final_data
     
+    def _build_graph(self, city_name: str, state_abbr: str, state_name: str,
+                     replay: Optional[Dict[str, Any]] = None) -> PhaseGraph:
+        """
+        Wire the per-city phases into a PhaseGraph. Nodes named in `replay`
+        return the stored value instead of running.
+        """
+        replay = replay or {}
+        
+        async def geo_validation(_):
+            is_valid, error = await self.geo_validator.validate_city_state(city_name, state_abbr)
+            if not is_valid:
+                self.logger.log('geo_validation', 'BLOCKED',
+                                f"Skipping {city_name}, {state_abbr}: {error}")
+                raise PipelineAborted(error)
+            return True
+        
+        async def phase1(results):
+            # Phase 1: Foundation Layer (Deterministic APIs); the
+            # geo_validation node has already vetted the city
+            print("📍 PHASE 1: Foundation Layer (Geo + Census + Weather)")
+            return await self.phase1.execute(
+                city_name, state_abbr, state_name,
+                geo_validated=results['geo_validation'],
+            )
+        
+        async def phase2(_):
+            # Phase 2: Reconnaissance Layer (Search & Fetch)
+            print("\n🔍 PHASE 2: Reconnaissance Layer (Official Sources)")
+            official_content = await self.phase2.execute(city_name, state_abbr, state_name)
+            if official_content.get('content_validation_failed'):
+                print(f"\n⚠️  CONTENT VALIDATION WARNING: {official_content.get('content_validation_warning')}")
+                print(f"🔄 Scraped content rejected - will use fallback data only\n")
+            return official_content
+        
+        async def change_detection(results):
+            # Reuse the last extraction if the scraped text is unchanged
+            fingerprint = content_fingerprint(results['phase2'])
+            previous = None
+            if self.from_stage != 'extract':
+                previous = await asyncio.to_thread(
+                    extraction_snapshots.lookup, city_name, state_abbr, fingerprint,
+                )
+            return {'fingerprint': fingerprint, 'previous': previous}
+        
+        async def phase3(results):
+            # Phase 3: Intelligence Layer (LLM Extraction)
+            print("\n🧠 PHASE 3: Intelligence Layer (Structured Extraction)")
+            change = results['change_detection']
+            if change['previous'] is not None:
+                extraction_snapshots.reused += 1
+                self.logger.log('change_detection', 'UNCHANGED',
+                                f"Content fingerprint {change['fingerprint'][:12]} matches "
+                                f"last run; reusing extracted data")
+                return change['previous']
+            extracted = await self.phase3.execute(results['phase2'], city_name, state_abbr)
+            await asyncio.to_thread(
+                extraction_snapshots.save, city_name, state_abbr, change['fingerprint'], extracted,
+            )
+            return extracted
+        
+        async def charisma(results):
+            # Phase 4: Charisma Synthesis Layer (Copywriting)
+            print("\n✨ PHASE 4: Charisma Synthesis (SEO + Hero + Neighborhoods)")
+            return await self.charisma.generate(
+                results['phase3'], results['phase1'], city_name, state_abbr,
+            )
+        
+        async def phase5(_):
+            # Phase 5: Competitor Triangulation (speculative, cancelled on abort)
+            print("\n💰 PHASE 5: Competitor Triangulation (Pricing)")
+            return await self.phase5.execute(city_name, state_abbr)
+        
+        graph = PhaseGraph()
+        
+        def add(name, fn, deps=()):
+            if name in replay:
+                async def fn(_, stored=replay[name]):
+                    return stored
+            graph.add(name, fn, deps)
+        
+        add('geo_validation', geo_validation)
+        add('phase5', phase5)
+        add('phase1', phase1, deps=('geo_validation',))
+        add('phase2', phase2, deps=('geo_validation',))
+        add('change_detection', change_detection, deps=('phase2',))
+        add('phase3', phase3, deps=('change_detection',))
+        add('charisma', charisma, deps=('phase1', 'phase3'))
+        return graph
+    
     def _phase6_assembly(self, city_name: str, state_name: str, state_abbr: str,
                          geo_data: Dict, official_content: Dict, extracted_data: Dict, charisma_data: Dict,
                          competitor_data: Dict) -> Dict:
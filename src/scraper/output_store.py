@@ -0,0 +1,212 @@
+"""Append-only JSONL record store with keyed upserts and atomic commits."""
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# orjson is optional; when installed it encodes and decodes several times
+# faster than the standard library.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Compact UTF-8 JSON (no whitespace between tokens)."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+class RecordStore:
+    """
+    Records keyed by one field (e.g. city_slug), one per line in a JSONL file.
+
+    upsert() appends the record and flushes it, so each finished city is on
+    disk at once and nothing already written is rewritten. The index maps
+    each key to the offset of its latest line; older lines for the same
+    key are dead until commit() compacts the log into a temporary file
+    and renames it into place. materialize() writes the combined JSON
+    array, also via rename, only when asked.
+
+    A partial last line left by a crash is dropped on load.
+    """
+
+    def __init__(self, path, key_field: str = 'city_slug', reset: bool = False):
+        self.path = str(path)
+        self.key_field = key_field
+        self._index: Dict[str, Tuple[int, int]] = {}
+        self._lines = 0
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        if reset and os.path.exists(self.path):
+            os.remove(self.path)
+        self._load()
+        self._file = open(self.path, 'ab')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        offset = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    key = loads(line)[self.key_field]
+                except (ValueError, KeyError, TypeError):
+                    key = None
+                if key is not None:
+                    self._index.pop(key, None)
+                    self._index[key] = (offset, len(line))
+                    self._lines += 1
+                offset += len(line)
+        if offset < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(offset)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def upsert(self, record: Dict):
+        """
+        Append `record`, replacing any earlier record with the same key.
+        A replaced record moves to the end of the iteration order.
+        """
+        key = record[self.key_field]
+        line = dumps(record) + b'\n'
+        offset = self._file.seek(0, os.SEEK_END)
+        self._file.write(line)
+        self._file.flush()
+        self._index.pop(key, None)
+        self._index[key] = (offset, len(line))
+        self._lines += 1
+
+    def _raw_lines(self) -> Iterator[bytes]:
+        """Latest line per key (without newline), in iteration order."""
+        with open(self.path, 'rb') as f:
+            for offset, length in self._index.values():
+                f.seek(offset)
+                yield f.read(length).rstrip(b'\n')
+
+    def get(self, key: str) -> Optional[Dict]:
+        if key not in self._index:
+            return None
+        offset, length = self._index[key]
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return loads(f.read(length))
+
+    def records(self) -> Iterator[Dict]:
+        """Latest version of every record, one at a time."""
+        for line in self._raw_lines():
+            yield loads(line)
+
+    def commit(self):
+        """Make all upserts durable, compacting the log if it has dead lines."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if self._lines == len(self._index):
+            return
+        tmp = f"{self.path}.tmp"
+        index: Dict[str, Tuple[int, int]] = {}
+        with open(tmp, 'wb') as out:
+            for key, line in zip(list(self._index), self._raw_lines()):
+                index[key] = (out.tell(), len(line) + 1)
+                out.write(line + b'\n')
+            out.flush()
+            os.fsync(out.fileno())
+        self._file.close()
+        os.replace(tmp, self.path)
+        self._index = index
+        self._lines = len(index)
+        self._file = open(self.path, 'ab')
+
+    def materialize(self, path, indent: Optional[int] = None):
+        """
+        Write every record as one JSON array to `path`, atomically.
+
+        Without `indent` the stored compact lines are copied as-is. With
+        `indent` the output is byte-for-byte what json.dump(records, f,
+        indent=indent) would write, built one record at a time.
+        """
+        path = str(path)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as out:
+            if indent is None:
+                out.write(b'[')
+                for i, line in enumerate(self._raw_lines()):
+                    out.write(b',' + line if i else line)
+                out.write(b']')
+            else:
+                pad = ' ' * indent
+                first = True
+                for record in self.records():
+                    text = json.dumps(record, indent=indent)
+                    text = '\n'.join(pad + part for part in text.split('\n'))
+                    out.write((('[\n' if first else ',\n') + text).encode('utf-8'))
+                    first = False
+                out.write(b'[]' if first else b'\n]')
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp, path)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class BlobStore:
+    """
+    Content-addressed store for bulky JSON payloads (raw search responses)
+    that records reference by id instead of embedding.
+
+    A value's id is the SHA-256 of its canonical JSON (sorted keys, no
+    whitespace), so the same payload is stored once however many records
+    or runs refer to it. Each value is one gzipped file,
+    <directory>/<id[:2]>/<id>.json.gz, written via a temporary file and
+    rename; put() skips the write when the file already exists.
+    """
+
+    def __init__(self, directory):
+        self.directory = str(directory)
+        self.written = 0
+        self.reused = 0
+
+    def _path(self, blob_id: str) -> str:
+        return os.path.join(self.directory, blob_id[:2], f"{blob_id}.json.gz")
+
+    def put(self, value: Any) -> str:
+        """Store `value` and return its id."""
+        data = json.dumps(value, sort_keys=True, ensure_ascii=False,
+                          separators=(',', ':')).encode('utf-8')
+        blob_id = hashlib.sha256(data).hexdigest()
+        path = self._path(blob_id)
+        if os.path.exists(path):
+            self.reused += 1
+            return blob_id
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with gzip.open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+        self.written += 1
+        return blob_id
+
+    def get(self, blob_id: str) -> Any:
+        """The value stored under `blob_id`; FileNotFoundError if absent."""
+        with gzip.open(self._path(blob_id), 'rb') as f:
+            return json.loads(f.read())
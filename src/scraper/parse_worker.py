@@ -0,0 +1,212 @@
+"""Process-pool workers for CPU-heavy HTML parsing and PDF extraction."""
+import asyncio
+import atexit
+import io
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .config import (
+    PARSE_WORKERS, PARSE_QUEUE_SIZE, PARSE_TIMEOUT_SECONDS,
+    PDF_CHAR_BUDGET, PDF_KEYWORD_STOP,
+)
+
+
+# ── WORKER FUNCTIONS (run in child processes; must stay picklable) ───────────
+
+def parse_html(content: bytes) -> Dict:
+    """
+    Parse an HTML page into cleaned text plus its links.
+
+    Links are collected before boilerplate (nav, header, footer) is
+    stripped, since sanitation links usually live in the nav.
+
+    Returns:
+        {'text': str, 'links': [[link_text, href], ...]}
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(content, 'html.parser')
+    links: List[List[str]] = [
+        [link.get_text(strip=True), link['href']]
+        for link in soup.find_all('a', href=True)
+    ]
+    for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
+        tag.decompose()
+    return {
+        'text': soup.get_text(separator='\n', strip=True),
+        'links': links,
+    }
+
+
+# Words that mark a PDF page as useful for mattress / bulk-item rules.
+# Matched as substrings, so 'bulk' also counts "bulky" (once) and
+# 'mattress' counts "mattresses"; don't list a keyword that contains another.
+PDF_STOP_KEYWORDS = ('mattress', 'box spring', 'bulk', 'large item', 'furniture')
+
+
+def iter_pdf_pages(content: bytes, max_pages: int = 20) -> Iterator[str]:
+    """
+    Yield the text of each page of an in-memory PDF, one page at a time.
+
+    Uses pdfplumber when installed, else PyPDF2. Pages are only parsed as
+    they are requested, so a caller that stops early skips the rest.
+    """
+    buffer = io.BytesIO(content)
+    try:
+        import pdfplumber
+    except ImportError:
+        from PyPDF2 import PdfReader
+        for page in PdfReader(buffer).pages[:max_pages]:
+            yield page.extract_text() or ''
+        return
+    with pdfplumber.open(buffer) as pdf:
+        for page in pdf.pages[:max_pages]:
+            yield page.extract_text() or ''
+            page.flush_cache()
+
+
+def extract_pdf(content: bytes, max_pages: int = 20,
+                char_budget: int = PDF_CHAR_BUDGET,
+                keyword_stop: int = PDF_KEYWORD_STOP) -> Optional[str]:
+    """
+    Extract text from the first `max_pages` pages of a PDF.
+
+    Stops reading pages once `char_budget` characters are collected (the
+    caller keeps no more than that) or once PDF_STOP_KEYWORDS have been
+    seen `keyword_stop` times (0 disables the keyword stop).
+    """
+    parts: List[str] = []
+    chars = 0
+    keyword_hits = 0
+    try:
+        for page_text in iter_pdf_pages(content, max_pages):
+            if not page_text:
+                continue
+            parts.append(page_text)
+            chars += len(page_text) + 1
+            if keyword_stop:
+                lowered = page_text.lower()
+                keyword_hits += sum(lowered.count(kw) for kw in PDF_STOP_KEYWORDS)
+            if chars >= char_budget or (keyword_stop and keyword_hits >= keyword_stop):
+                break
+    except Exception:
+        if not parts:
+            return None
+    text = "\n".join(parts) + "\n"
+    return text[:char_budget] if len(text) > 100 else None
+
+
+# ── POOL ──────────────────────────────────────────────────────────────────────
+
+class ParseTimeout(Exception):
+    """A document took longer than PARSE_TIMEOUT_SECONDS to parse."""
+    pass
+
+
+class ParsePool:
+    """
+    Runs parse functions in a ProcessPoolExecutor so BeautifulSoup and
+    pdfplumber never block the event loop or other concurrent cities.
+
+    At most `queue_size` documents are queued or parsing at once; further
+    callers wait, so a fast crawler cannot pile raw pages up in memory. A
+    document that exceeds `timeout` gets its worker processes killed (the
+    only way to stop a pathological PDF). The pool is then rebuilt.
+    Documents caught in the teardown are retried once on the new pool.
+
+    With `workers=0` parsing runs in the default thread pool instead, for
+    environments where subprocesses are unavailable.
+    """
+
+    def __init__(self, workers: int = PARSE_WORKERS, queue_size: int = PARSE_QUEUE_SIZE,
+                 timeout: float = PARSE_TIMEOUT_SECONDS):
+        self.workers = workers
+        self.queue_size = max(1, queue_size)
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running: Optional[asyncio.Semaphore] = None
+        # Executors torn down by _kill(), so run() can tell work cancelled
+        # by a teardown from a cancellation of the calling task.
+        self._killed: 'weakref.WeakSet[ProcessPoolExecutor]' = weakref.WeakSet()
+        self.timeouts = 0
+
+    def _get_executor(self) -> Optional[ProcessPoolExecutor]:
+        if self.workers <= 0:
+            return None
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        return self._executor
+
+    def _kill(self, executor: ProcessPoolExecutor):
+        """Terminate a pool's workers and drop it so the next call rebuilds."""
+        processes = list((getattr(executor, '_processes', None) or {}).values())
+        self._killed.add(executor)
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+        if self._executor is executor:
+            self._executor = None
+
+    async def run(self, fn: Callable, *args):
+        """
+        Run `fn(*args)` in a worker and return its result.
+
+        Raises:
+            ParseTimeout: If the document exceeds the per-document timeout.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.queue_size)
+            # Never hand the executor more than it can run, so the timeout
+            # measures parse time rather than time spent queued.
+            self._running = asyncio.Semaphore(self.workers if self.workers > 0 else self.queue_size)
+        loop = asyncio.get_running_loop()
+
+        async with self._slots:
+            for attempt in range(2):
+                executor = None
+                try:
+                    async with self._running:
+                        executor = self._get_executor()
+                        return await asyncio.wait_for(
+                            loop.run_in_executor(executor, fn, *args), self.timeout,
+                        )
+                except asyncio.TimeoutError:
+                    self.timeouts += 1
+                    if executor is not None:
+                        self._kill(executor)
+                    raise ParseTimeout(f"{fn.__name__} exceeded {self.timeout}s")
+                except BrokenProcessPool:
+                    # Another document's timeout tore the pool down under us.
+                    if self._executor is executor:
+                        self._executor = None
+                    if attempt:
+                        raise
+                except asyncio.CancelledError:
+                    # Queued work is cancelled when another document's
+                    # timeout kills the pool; retry that, but let a real
+                    # cancellation of this task through.
+                    # Task.cancelling() only exists on Python 3.11+.
+                    cancelling = getattr(asyncio.current_task(), 'cancelling', None)
+                    if (attempt or executor is None or executor not in self._killed or
+                            (cancelling is not None and cancelling())):
+                        raise
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """The process-wide parse pool, created on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ParsePool()
+        atexit.register(_pool.shutdown)
+    return _pool
@@ -2,21 +2,19 @@
 import asyncio
 import random
 import re
-import tempfile
-import os
 from typing import Dict, List, Optional
 from datetime import datetime
 
-import httpx
-from bs4 import BeautifulSoup
-
 from .config import (
     GOOGLE_MAPS_API_KEY, SEARCH_API_KEY, USE_SERPER, USER_AGENTS,
     SERPER_API_KEY, SERPAPI_KEY,
     CITY_KNOWN_DATA, RAINY_CITIES,
     GOV_URL_PATTERNS, WASTE_SEARCH_QUERIES, ORDINANCE_SEARCH_QUERIES,
     LOW_CONFIDENCE_THRESHOLD,
+    SEARCH_CACHE_TTL_HOURS, SEARCH_CACHE_MAX_ENTRIES,
+    PHASE2_FETCH_CONCURRENCY, PHASE2_CONTENT_CHAR_BUDGET, PDF_CHAR_BUDGET,
 )
+from .cache import get_cache, make_key
 from .utils import Logger, calculate_confidence
 from .agents import (
     AgentCityDiscovery,
@@ -24,45 +22,50 @@ from .agents import (
     AgentAuditor, CharismaSynthesizer,
 )
 from .geo_validator import GeoValidator, US_STATES
+from .http_client import FetchResult, HttpPool, PhaseClient
+from .census import CensusService
+from .places import PlacesService
+from .serper import serper_batcher
+from .zip_index import get_zip_index
+from .parse_worker import ParseTimeout, extract_pdf, get_parse_pool, parse_html
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SEARCH API HELPER (supports both SerpAPI and Serper.dev)
 # ═══════════════════════════════════════════════════════════════════════════════
 
-async def search_google(client: httpx.AsyncClient, query: str, num_results: int = 5) -> dict:
+search_cache = get_cache('search', SEARCH_CACHE_TTL_HOURS * 3600, SEARCH_CACHE_MAX_ENTRIES)
+
+
+def _normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query, for cache keys."""
+    return ' '.join(query.lower().split())
+
+
+async def search_google(client: PhaseClient, query: str, num_results: int = 5) -> dict:
     """
     Universal Google search function that works with both SerpAPI and Serper.dev.
     
+    Successful responses are cached on disk by provider, normalized query
+    and num_results (see search_cache). Serper queries that miss the cache
+    go through serper_batcher, which sends concurrent searches together.
+    
     Returns standardized format: {'organic_results': [...]}
     """
     if not SEARCH_API_KEY:
         return {'organic_results': []}
     
+    provider = 'serper' if USE_SERPER else 'serpapi'
+    cache_key = make_key(provider, _normalize_query(query), num_results)
+    cached = await asyncio.to_thread(search_cache.get, cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         if USE_SERPER:
-            # Serper.dev API
-            url = "https://google.serper.dev/search"
-            headers = {
-                'X-API-KEY': SEARCH_API_KEY,
-                'Content-Type': 'application/json'
-            }
-            payload = {
-                'q': query,
-                'num': num_results
-            }
-            response = await client.post(url, json=payload, headers=headers, timeout=10.0)
-            data = response.json()
-            
-            # Convert serper.dev format to serpapi format
-            organic_results = []
-            for result in data.get('organic', []):
-                organic_results.append({
-                    'title': result.get('title', ''),
-                    'link': result.get('link', ''),
-                    'snippet': result.get('snippet', ''),
-                })
-            return {'organic_results': organic_results}
+            # Serper.dev API, batched with any other searches in flight
+            data = await serper_batcher.search(client, query, num_results)
+            ok = 'error' not in data
         else:
             # SerpAPI
             url = "https://serpapi.com/search"
@@ -72,7 +75,13 @@ async def search_google(client: httpx.AsyncClient, query: str, num_results: int
                 'num': num_results
             }
             response = await client.get(url, params=params, timeout=10.0)
-            return response.json()
+            data = response.json()
+            ok = response.status_code == 200 and 'error' not in data
+        
+        # Never cache quota errors or other failures
+        if ok:
+            await asyncio.to_thread(search_cache.set, cache_key, data)
+        return data
     except Exception as e:
         print(f"Search API error: {e}")
         return {'organic_results': []}
@@ -85,100 +94,105 @@ async def search_google(client: httpx.AsyncClient, query: str, num_results: int
 class Phase1Foundation:
     """Phase 1: Get deterministic data from APIs."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, http: Optional[HttpPool] = None,
+                 geo_validator: Optional[GeoValidator] = None,
+                 census: Optional[CensusService] = None):
         self.logger = logger
-        self.geo_validator = GeoValidator(logger, GOOGLE_MAPS_API_KEY)
+        self.http = http or HttpPool()
+        self.geo_validator = geo_validator or GeoValidator(logger, GOOGLE_MAPS_API_KEY, self.http)
+        self.geocoder = self.geo_validator.geocoder
+        self.census = census or CensusService(self.http)
+
+    async def execute(self, city_name: str, state_abbr: str, state_name: str = '',
+                      geo_validated: bool = False) -> Dict:
+        """
+        Execute Phase 1: Foundation Layer.
 
-    async def execute(self, city_name: str, state_abbr: str, state_name: str = '') -> Dict:
-        """Execute Phase 1: Foundation Layer."""
+        Pass `geo_validated=True` when the caller has already run
+        validate_city_state for this city (the pipeline's geo_validation
+        node), so it is not repeated here.
+        """
         foundation: Dict = {}
         state_abbr = state_abbr.upper()
         state_name = state_name or US_STATES.get(state_abbr, state_abbr)
 
         # ── CRITICAL: Validate city-state BEFORE any scraping ────────────────
-        is_valid, error = await self.geo_validator.validate_city_state(city_name, state_abbr)
-        if not is_valid:
-            self.logger.log('geo_validation', 'BLOCKED',
-                            f"Skipping {city_name}, {state_abbr}: {error}")
-            return {
-                'geo_validation_failed': True,
-                'geo_validation_error': error,
-                'latitude': None,
-                'longitude': None,
-                'zip_codes': [],
-                'population': {'count': None, 'year': 2020, 'source': None},
-                'weather_profile': {'is_rain_heavy': False, 'rejection_risk_copy': None},
-            }
+        if not geo_validated:
+            is_valid, error = await self.geo_validator.validate_city_state(city_name, state_abbr)
+            if not is_valid:
+                self.logger.log('geo_validation', 'BLOCKED',
+                                f"Skipping {city_name}, {state_abbr}: {error}")
+                return {
+                    'geo_validation_failed': True,
+                    'geo_validation_error': error,
+                    'latitude': None,
+                    'longitude': None,
+                    'zip_codes': [],
+                    'population': {'count': None, 'year': 2020, 'source': None},
+                    'weather_profile': {'is_rain_heavy': False, 'rejection_risk_copy': None},
+                }
 
         foundation['geo_validation_failed'] = False
 
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            # ── 1A: Google Geocoding (state-verified) ─────────────────────────
-            # BUG 5 FIX: Use components filter and verify returned state matches.
-            try:
-                geocode_url = "https://maps.googleapis.com/maps/api/geocode/json"
-                params = {
-                    'address': f"{city_name}, {state_name}, USA",
-                    'components': f"administrative_area:{state_abbr}|country:US",
-                    'key': GOOGLE_MAPS_API_KEY,
-                }
-                response = await client.get(geocode_url, params=params)
-                data = response.json()
-
-                if data['status'] == 'OK':
-                    result = data['results'][0]
-
-                    # Verify returned state matches before trusting coordinates.
-                    components = {
-                        c['types'][0]: c
-                        for c in result.get('address_components', [])
-                    }
-                    actual_state = (
-                        components.get('administrative_area_level_1', {})
-                        .get('short_name', '').upper()
-                    )
+        client = self.http.for_phase('foundation')
+        # ── 1A: Google Geocoding (state-verified) ─────────────────────────────
+        # BUG 5 FIX: Use components filter and verify returned state matches.
+        # Same request geo validation just made, so this is a memo hit.
+        try:
+            data = await self.geocoder.geocode_city(city_name, state_abbr, state_name)
 
-                    if actual_state != state_abbr:
-                        self.logger.log(
-                            'geo_api', 'STATE_MISMATCH',
-                            f"Geocode returned {actual_state} for {city_name}, {state_abbr}",
-                        )
-                        foundation['latitude'] = None
-                        foundation['longitude'] = None
-                        foundation['zip_codes'] = []
-                    else:
-                        location = result['geometry']['location']
-                        foundation['latitude'] = location['lat']
-                        foundation['longitude'] = location['lng']
-                        self.logger.log(
-                            'geo_api', 'SUCCESS',
-                            f"Lat: {location['lat']}, Lng: {location['lng']}",
-                        )
+            if data['status'] == 'OK':
+                result = data['results'][0]
 
-                        # ── 1A-ii: Zip codes via Geocoding bounding box ───────
-                        # BUG 8 FIX: Use viewport bounding box to query zip codes
-                        # within the city's actual boundary rather than just the
-                        # centroid result, which gives only 0–3 zip codes.
-                        foundation['zip_codes'] = await self._fetch_zip_codes(
-                            client, city_name, state_abbr,
-                            result['geometry'].get('viewport', {}),
-                        )
-                else:
-                    self.logger.log('geo_api', 'FAILED', data['status'])
+                # Verify returned state matches before trusting coordinates.
+                components = {
+                    c['types'][0]: c
+                    for c in result.get('address_components', [])
+                }
+                actual_state = (
+                    components.get('administrative_area_level_1', {})
+                    .get('short_name', '').upper()
+                )
+
+                if actual_state != state_abbr:
+                    self.logger.log(
+                        'geo_api', 'STATE_MISMATCH',
+                        f"Geocode returned {actual_state} for {city_name}, {state_abbr}",
+                    )
                     foundation['latitude'] = None
                     foundation['longitude'] = None
                     foundation['zip_codes'] = []
+                else:
+                    location = result['geometry']['location']
+                    foundation['latitude'] = location['lat']
+                    foundation['longitude'] = location['lng']
+                    self.logger.log(
+                        'geo_api', 'SUCCESS',
+                        f"Lat: {location['lat']}, Lng: {location['lng']}",
+                    )
 
-            except Exception as e:
-                self.logger.log('geo_api', 'ERROR', str(e))
+                    # ── 1A-ii: Zip codes via Geocoding bounding box ───────────
+                    # BUG 8 FIX: Use viewport bounding box to query zip codes
+                    # within the city's actual boundary rather than just the
+                    # centroid result, which gives only 0–3 zip codes.
+                    foundation['zip_codes'] = await self._fetch_zip_codes(
+                        client, city_name, state_abbr,
+                        result['geometry'].get('viewport', {}),
+                    )
+            else:
+                self.logger.log('geo_api', 'FAILED', data['status'])
                 foundation['latitude'] = None
                 foundation['longitude'] = None
                 foundation['zip_codes'] = []
 
-            # ── 1B: Census population ─────────────────────────────────────────
-            foundation['population'] = await self._fetch_population(
-                client, city_name, state_abbr
-            )
+        except Exception as e:
+            self.logger.log('geo_api', 'ERROR', str(e))
+            foundation['latitude'] = None
+            foundation['longitude'] = None
+            foundation['zip_codes'] = []
+
+        # ── 1B: Census population ─────────────────────────────────────────────
+        foundation['population'] = await self._fetch_population(city_name, state_abbr)
 
         # ── 1C: Weather profile ───────────────────────────────────────────────
         is_rainy = city_name in RAINY_CITIES
@@ -198,7 +212,7 @@ class Phase1Foundation:
 
     async def _fetch_zip_codes(
         self,
-        client: httpx.AsyncClient,
+        client: PhaseClient,
         city_name: str,
         state_abbr: str,
         viewport: Dict,
@@ -219,7 +233,23 @@ class Phase1Foundation:
         Solution: after sampling, filter to:
           - Exactly 5 ASCII digits (US zip format, not Canadian alphanumeric)
           - State abbreviation in the reverse-geocode response matches target state
+
+        When a ZCTA Gazetteer is configured (see zip_index.py) the ZIPs come
+        from the offline grid instead, filtered by _zip_in_state, and the
+        reverse-geocode grid only runs if that finds nothing.
         """
+        # Offline ZCTA index first; reverse geocoding is only the fallback.
+        zip_index = get_zip_index()
+        if zip_index is not None and viewport:
+            indexed = [
+                zc for zc in zip_index.zips_in_viewport(viewport)
+                if _zip_in_state(zc, state_abbr)
+            ]
+            if indexed:
+                self.logger.log('zip_codes', 'SUCCESS',
+                                f"Found {len(indexed)} zip codes (ZCTA index)")
+                return indexed
+
         zip_codes: List[str] = []
         try:
             ne = viewport.get('northeast', {})
@@ -282,7 +312,7 @@ class Phase1Foundation:
         return await self._fetch_zip_codes_radius(client, city_name, state_abbr)
 
     async def _fetch_zip_codes_radius(
-        self, client: httpx.AsyncClient, city_name: str, state_abbr: str
+        self, client: PhaseClient, city_name: str, state_abbr: str
     ) -> List[str]:
         """
         Fallback zip code fetch using a single centroid geocode result.
@@ -319,9 +349,7 @@ class Phase1Foundation:
         except Exception:
             return []
 
-    async def _fetch_population(
-        self, client: httpx.AsyncClient, city_name: str, state_abbr: str
-    ) -> Dict:
+    async def _fetch_population(self, city_name: str, state_abbr: str) -> Dict:
         """
         Fetch population from Census Bureau ACS5 API.
 
@@ -347,52 +375,16 @@ class Phase1Foundation:
             return {'count': None, 'year': 2022, 'source': census_url}
 
         try:
-            resp = await client.get(
-                "https://api.census.gov/data/2022/acs/acs5",
-                params={
-                    'get': 'NAME,B01003_001E',
-                    'for': 'place:*',
-                    'in': f'state:{state_fips}',
-                },
-                timeout=8.0,
-            )
-            if resp.status_code == 200:
-                rows = resp.json()
-                city_lower = city_name.lower()
-                state_full_lower = state_full.lower()
-                # Census canonical name: "Austin city, Texas" or "New York city, New York"
-                canonical = f"{city_lower} city, {state_full_lower}"
-
-                exact_row = None
-                best_pop = -1
-                best_row = None
-
-                for row in rows[1:]:
-                    name_field = row[0].lower()   # e.g. "philadelphia city, pennsylvania"
-                    try:
-                        pop_val = int(row[1]) if row[1] else 0
-                    except (ValueError, TypeError):
-                        pop_val = 0
-
-                    # Exact canonical match → use immediately
-                    if name_field == canonical:
-                        exact_row = row
-                        break
-
-                    # Among substring matches, keep the one with LARGEST population.
-                    # This ensures "Philadelphia city" (1.6M) beats "Philadelphia Mills CDP" (1,052).
-                    if city_lower in name_field and pop_val > best_pop:
-                        best_pop = pop_val
-                        best_row = row
-
-                chosen = exact_row if exact_row else best_row
-                if chosen:
-                    pop = int(chosen[1]) if chosen[1] else None
-                    self.logger.log(
-                        'census_api', 'SUCCESS',
-                        f"Population: {pop:,} ({chosen[0]})" if pop else "No population",
-                    )
-                    return {'count': pop, 'year': 2022, 'source': census_url}
+            # One download per state per snapshot; see CensusService.
+            index = await self.census.state_index(state_fips)
+            chosen = index.lookup(city_name, state_full)
+            if chosen:
+                name, pop = chosen
+                self.logger.log(
+                    'census_api', 'SUCCESS',
+                    f"Population: {pop:,} ({name})" if pop else "No population",
+                )
+                return {'count': pop, 'year': 2022, 'source': census_url}
 
         except Exception as e:
             self.logger.log('census_api', 'ERROR', str(e))
@@ -418,10 +410,13 @@ class Phase2Reconnaissance:
     FIX 7 — LLM-generated URL verification before use
     """
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, http: Optional[HttpPool] = None,
+                 geo_validator: Optional[GeoValidator] = None):
         self.logger = logger
+        self.http = http or HttpPool()
         self._city_discovery: Optional[AgentCityDiscovery] = None
-        self.geo_validator = GeoValidator(logger, GOOGLE_MAPS_API_KEY)
+        self.geo_validator = geo_validator or GeoValidator(logger, GOOGLE_MAPS_API_KEY, self.http)
+        self.parser = get_parse_pool()
 
     async def execute(self, city_name: str, state_abbr: str,
                       state_name: str = '') -> Dict:
@@ -436,33 +431,32 @@ class Phase2Reconnaissance:
             'discovery_data': {},
         }
 
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            # 2A: SERPAPI-driven searches
-            if SERPAPI_KEY:
-                await self._search_waste_pages(client, city_name, state_abbr,
-                                               state_name, content)
-                await self._search_ordinances(client, city_name, state_abbr, content)
-                await self._search_fines(client, city_name, state_abbr, content)
-
-            # 2B: Generic URL pattern fallback
-            if not content['gov_pages']:
-                await self._try_gov_url_patterns(client, city_name, state_abbr, content)
-
-            # 2C: AgentCityDiscovery — LLM generates + verifies candidate URLs
-            if not content['gov_pages']:
-                self.logger.log('recon', 'INFO',
-                                'Gov pages empty — triggering AgentCityDiscovery')
-                discovery = await self._run_city_discovery(
-                    city_name, state_abbr, state_name, content
-                )
-                # BUG 7 FIX: Verify each LLM-generated URL before fetching.
-                for url in discovery.get('candidate_urls', []):
-                    if await self._verify_url_is_live(client, url):
-                        await self._fetch_page_or_pdf(client, url, content)
-                        await asyncio.sleep(random.uniform(1, 2))
-                    else:
-                        self.logger.log('llm_url_verify', 'REJECTED',
-                                        f"URL not live or wrong content: {url}")
+        client = self.http.for_phase('recon', follow_redirects=True)
+        # 2A: SERPAPI-driven searches
+        if SERPAPI_KEY:
+            await self._search_waste_pages(client, city_name, state_abbr,
+                                           state_name, content)
+            # Run together so their searches share one Serper request.
+            await asyncio.gather(
+                self._search_ordinances(client, city_name, state_abbr, content),
+                self._search_fines(client, city_name, state_abbr, content),
+            )
+
+        # 2B: Generic URL pattern fallback
+        if not content['gov_pages']:
+            await self._try_gov_url_patterns(client, city_name, state_abbr, content)
+
+        # 2C: AgentCityDiscovery — LLM generates + verifies candidate URLs
+        if not content['gov_pages']:
+            self.logger.log('recon', 'INFO',
+                            'Gov pages empty — triggering AgentCityDiscovery')
+            discovery = await self._run_city_discovery(
+                city_name, state_abbr, state_name, content
+            )
+            # BUG 7 FIX: Verify each LLM-generated URL before fetching.
+            await self._fetch_candidates(
+                client, discovery.get('candidate_urls', []), content, verify=True,
+            )
 
         # 2D: Geographical content validation
         all_text = "\n\n".join(
@@ -505,10 +499,10 @@ class Phase2Reconnaissance:
         if len(content['relevant_chunks']) < 2 and SERPAPI_KEY:
             self.logger.log('recon', 'INFO',
                             'Sparse content — searching secondary sources')
-            async with httpx.AsyncClient(timeout=20.0, follow_redirects=True) as client:
-                await self._search_secondary_sources(
-                    client, city_name, state_abbr, state_name, content
-                )
+            client = self.http.for_phase('secondary', follow_redirects=True)
+            await self._search_secondary_sources(
+                client, city_name, state_abbr, state_name, content
+            )
 
         return content
 
@@ -526,33 +520,38 @@ class Phase2Reconnaissance:
                      .replace('{state_abbr}', state_abbr))
             try:
                 results = await search_google(client, query, num_results=5)
+                urls = []
                 for result in results.get('organic_results', [])[:3]:
                     url = result['link']
                     if not self._is_relevant_domain(url, city_name, state_abbr):
                         self.logger.log('gov_page_scraped', 'SKIPPED',
                                         f"{url} — not relevant to {city_name}, {state_abbr}")
                         continue
-                    await self._fetch_page_or_pdf(client, url, content)
-                    await asyncio.sleep(random.uniform(1, 2))
+                    urls.append(url)
+                await self._fetch_candidates(client, urls, content, max_pages=3)
             except Exception as e:
                 self.logger.log('waste_search', 'ERROR', str(e))
 
     async def _search_ordinances(self, client, city_name, state_abbr, content):
         """Search for illegal dumping ordinances."""
-        for template in ORDINANCE_SEARCH_QUERIES:
-            query = (template
-                     .replace('{city}', city_name)
-                     .replace('{state_abbr}', state_abbr))
-            try:
-                results = await search_google(client, query, num_results=3)
-                for result in results.get('organic_results', [])[:2]:
-                    url = result['link']
-                    if not self._is_relevant_domain(url, city_name, state_abbr):
-                        continue
-                    await self._fetch_page_or_pdf(client, url, content)
-                    await asyncio.sleep(random.uniform(1, 2))
-            except Exception as e:
-                self.logger.log('ordinance_search', 'ERROR', str(e))
+        queries = [
+            template.replace('{city}', city_name).replace('{state_abbr}', state_abbr)
+            for template in ORDINANCE_SEARCH_QUERIES
+        ]
+        searches = await asyncio.gather(
+            *(search_google(client, query, num_results=3) for query in queries),
+            return_exceptions=True,
+        )
+        urls = []
+        for results in searches:
+            if isinstance(results, Exception):
+                self.logger.log('ordinance_search', 'ERROR', str(results))
+                continue
+            for result in results.get('organic_results', [])[:2]:
+                url = result['link']
+                if self._is_relevant_domain(url, city_name, state_abbr):
+                    urls.append(url)
+        await self._fetch_candidates(client, urls, content)
 
     async def _search_fines(self, client, city_name, state_abbr, content):
         """Extract fine amounts from search snippets."""
@@ -636,30 +635,26 @@ class Phase2Reconnaissance:
                    .replace('{city_hyphen}', city_hyphen)
                    .replace('{state}', state_lower))
             try:
-                response = await client.get(
+                result = await client.fetch(
                     url, headers={'User-Agent': random.choice(USER_AGENTS)}
                 )
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.content, 'html.parser')
-                    for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
-                        tag.decompose()
-                    text = soup.get_text(separator='\n', strip=True)
-                    content['gov_pages'].append({'url': url, 'text': text[:15000]})
+                self._log_download(result)
+                if result.status_code == 200 and result.kind == 'html':
+                    parsed = await self.parser.run(parse_html, result.content)
+                    content['gov_pages'].append({'url': url, 'text': parsed['text'][:15000]})
                     self.logger.log('gov_url_pattern', 'SUCCESS', url)
-                    await self._follow_sanitation_link(client, response, url, content)
+                    await self._follow_sanitation_link(client, parsed['links'], url, content)
                     break
             except Exception:
                 continue
 
-    async def _follow_sanitation_link(self, client, response, base_url, content):
-        """From a city homepage, follow the first sanitation/waste link."""
+    async def _follow_sanitation_link(self, client, links, base_url, content):
+        """From a city homepage's links, follow the first sanitation/waste link."""
         try:
-            soup = BeautifulSoup(response.content, 'html.parser')
             keywords = ['sanitation', 'solid waste', 'waste management',
                         'trash', 'recycling', 'garbage', 'bulk']
-            for link in soup.find_all('a', href=True):
-                text = link.get_text(strip=True).lower()
-                href = link['href']
+            for link_text, href in links:
+                text = link_text.lower()
                 if any(kw in text or kw in href.lower() for kw in keywords):
                     full_url = (href if href.startswith('http')
                                 else base_url.rstrip('/') + '/' + href.lstrip('/'))
@@ -679,7 +674,7 @@ class Phase2Reconnaissance:
 
     # ── BUG 7 FIX: URL verification ──────────────────────────────────────────
 
-    async def _verify_url_is_live(self, client: httpx.AsyncClient, url: str) -> bool:
+    async def _verify_url_is_live(self, client: PhaseClient, url: str) -> bool:
         """
         BUG 7 FIX: Verify an LLM-generated URL actually responds with 200 before
         trusting its content. LLMs hallucinate URLs confidently.
@@ -687,10 +682,10 @@ class Phase2Reconnaissance:
         if not url or not url.startswith('http'):
             return False
         try:
-            response = await client.head(url, timeout=8.0,
-                                         headers={'User-Agent': USER_AGENTS[0]})
+            status = await client.probe(url, timeout=8.0,
+                                        headers={'User-Agent': USER_AGENTS[0]})
             # 200, 301, 302 are all acceptable (follow_redirects=True handles them).
-            return response.status_code < 400
+            return status < 400
         except Exception:
             return False
 
@@ -749,6 +744,76 @@ class Phase2Reconnaissance:
 
     # ── PAGE FETCHERS ─────────────────────────────────────────────────────────
 
+    async def _fetch_candidates(self, client, urls, content,
+                                max_pages: Optional[int] = None, verify: bool = False):
+        """
+        Fetch candidate URLs concurrently, at most PHASE2_FETCH_CONCURRENCY
+        at a time. Per-domain politeness comes from the shared HTTP pool's
+        rate limiters.
+
+        Stops once content['gov_pages'] reaches `max_pages` or the fetched
+        text exceeds PHASE2_CONTENT_CHAR_BUDGET, cancelling fetches still in
+        flight. Results are merged in URL order (the order `urls` was
+        given), not the order fetches finished; which fetches were still
+        pending when the target was reached can vary between runs.
+
+        With `verify`, each URL must pass _verify_url_is_live first (for
+        LLM-suggested URLs).
+        """
+        seen = {p['url'] for p in content['gov_pages'] + content['pdf_text']}
+        urls = [url for url in dict.fromkeys(urls) if url and url not in seen]
+        if not urls:
+            return
+
+        slots = asyncio.Semaphore(PHASE2_FETCH_CONCURRENCY)
+        fetched: Dict[str, Dict] = {}
+
+        async def fetch_one(url):
+            async with slots:
+                if verify and not await self._verify_url_is_live(client, url):
+                    self.logger.log('llm_url_verify', 'REJECTED',
+                                    f"URL not live or wrong content: {url}")
+                    return
+                found = {'gov_pages': [], 'pdf_text': []}
+                await self._fetch_page_or_pdf(client, url, found)
+                fetched[url] = found
+
+        def enough() -> bool:
+            pages = len(content['gov_pages']) + sum(
+                len(f['gov_pages']) for f in fetched.values()
+            )
+            chars = sum(
+                len(p['text'])
+                for f in [content] + list(fetched.values())
+                for p in f['gov_pages'] + f['pdf_text']
+            )
+            return ((max_pages is not None and pages >= max_pages) or
+                    chars >= PHASE2_CONTENT_CHAR_BUDGET)
+
+        if enough():
+            return
+        tasks = [asyncio.ensure_future(fetch_one(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                await next_done
+                if enough():
+                    break
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if pending:
+                self.logger.log('recon_fetch', 'INFO',
+                                f"Target reached — cancelled {len(pending)} pending fetch(es)")
+
+        for url in urls:
+            for key in ('gov_pages', 'pdf_text'):
+                for page in fetched.get(url, {}).get(key, []):
+                    if page['url'] not in seen:
+                        seen.add(page['url'])
+                        content[key].append(page)
+
     async def _fetch_page_or_pdf(self, client, url, content):
         """Fetch and parse a page or PDF."""
         if any(url == p.get('url')
@@ -758,17 +823,27 @@ class Phase2Reconnaissance:
             if url.lower().endswith('.pdf'):
                 pdf_text = await self._extract_pdf(client, url)
                 if pdf_text:
-                    content['pdf_text'].append({'url': url, 'text': pdf_text[:20000]})
+                    content['pdf_text'].append({'url': url, 'text': pdf_text[:PDF_CHAR_BUDGET]})
                     self.logger.log('pdf_extracted', 'SUCCESS', url)
             else:
-                response = await client.get(
+                result = await client.fetch(
                     url, headers={'User-Agent': random.choice(USER_AGENTS)}
                 )
-                soup = BeautifulSoup(response.content, 'html.parser')
+                self._log_download(result)
+                if result.kind == 'pdf' and not result.aborted:
+                    # Served as a PDF despite the URL
+                    pdf_text = await self._parse_pdf(url, result.content)
+                    if pdf_text:
+                        content['pdf_text'].append({'url': url, 'text': pdf_text[:PDF_CHAR_BUDGET]})
+                        self.logger.log('pdf_extracted', 'SUCCESS', url)
+                    return
+                if result.kind != 'html':
+                    return
+                # Parsing runs in a worker process, off the event loop
+                parsed = await self.parser.run(parse_html, result.content)
 
                 # Follow PDF links on the page
-                for link in soup.find_all('a', href=True):
-                    href = link['href']
+                for _, href in parsed['links']:
                     if '.pdf' in href.lower() and any(
                         kw in href.lower()
                         for kw in ['waste', 'bulk', 'guide', 'trash', 'mattress', 'sanitation']
@@ -778,14 +853,11 @@ class Phase2Reconnaissance:
                         pdf_text = await self._extract_pdf(client, pdf_url)
                         if pdf_text:
                             content['pdf_text'].append(
-                                {'url': pdf_url, 'text': pdf_text[:20000]}
+                                {'url': pdf_url, 'text': pdf_text[:PDF_CHAR_BUDGET]}
                             )
                             self.logger.log('pdf_extracted', 'SUCCESS', pdf_url)
 
-                for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
-                    tag.decompose()
-                text = soup.get_text(separator='\n', strip=True)
-                content['gov_pages'].append({'url': url, 'text': text[:15000]})
+                content['gov_pages'].append({'url': url, 'text': parsed['text'][:15000]})
                 self.logger.log('gov_page_scraped', 'SUCCESS', url)
 
         except Exception as e:
@@ -794,36 +866,33 @@ class Phase2Reconnaissance:
     async def _extract_pdf(self, client, url) -> Optional[str]:
         """Extract text from PDF."""
         try:
-            response = await client.get(url)
-            if response.status_code != 200:
+            result = await client.fetch(url)
+            self._log_download(result)
+            if result.status_code != 200 or result.kind != 'pdf' or result.aborted:
                 return None
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-                tmp.write(response.content)
-                tmp_path = tmp.name
-            try:
-                import pdfplumber
-                text = ""
-                with pdfplumber.open(tmp_path) as pdf:
-                    for page in pdf.pages[:20]:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                return text if len(text) > 100 else None
-            except ImportError:
-                try:
-                    from PyPDF2 import PdfReader
-                    reader = PdfReader(tmp_path)
-                    text = ""
-                    for page in reader.pages[:20]:
-                        text += page.extract_text() + "\n"
-                    return text if len(text) > 100 else None
-                except Exception:
-                    return None
-            finally:
-                os.unlink(tmp_path)
+            return await self._parse_pdf(url, result.content)
         except Exception:
             return None
 
+    async def _parse_pdf(self, url, data: bytes) -> Optional[str]:
+        """Run PDF text extraction in the parse pool."""
+        try:
+            return await self.parser.run(extract_pdf, data)
+        except ParseTimeout as e:
+            self.logger.log('pdf_extracted', 'TIMEOUT', f"{url}: {e}")
+            return None
+        except Exception:
+            return None
+
+    def _log_download(self, result: FetchResult):
+        """Report skipped, truncated or abandoned downloads."""
+        if result.kind is None:
+            self.logger.log('download', 'SKIPPED', f"{result.url}: {result.note}")
+        elif result.aborted:
+            self.logger.log('download', 'ABORTED', f"{result.url}: {result.note}")
+        elif result.truncated:
+            self.logger.log('download', 'TRUNCATED', f"{result.url}: {result.note}")
+
     def _filter_relevant_chunks(self, text: str, city_name: str) -> List[str]:
         """Filter text for relevant chunks."""
         words = text.split()
@@ -851,8 +920,11 @@ class Phase2Reconnaissance:
 class Phase3Intelligence:
     """Phase 3: Multi-agent extraction."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, http: Optional[HttpPool] = None,
+                 places: Optional[PlacesService] = None):
         self.logger = logger
+        self.http = http or HttpPool()
+        self.places = places or PlacesService(GOOGLE_MAPS_API_KEY, self.http)
         self.dispatcher = AgentDispatcher(logger)
         self.rule_enforcer = AgentRuleEnforcer(logger)
         self.navigator = AgentNavigator(logger)
@@ -933,82 +1005,81 @@ class Phase3Intelligence:
     # ── GOOGLE PLACES FALLBACK ────────────────────────────────────────────────
 
     async def _google_places_facilities(self, city_name: str, state_abbr: str) -> List[Dict]:
-        """Fallback to Google Places API."""
+        """
+        Fallback to Google Places API.
+
+        The text searches run concurrently, then Place Details for every
+        kept hit; the pool's 'places' rate limit paces both, and details
+        are shared across cities (see PlacesService).
+        """
         queries = [
             f"landfill {city_name} {state_abbr}",
             f"transfer station {city_name} {state_abbr}",
             f"bulk waste drop off {city_name} {state_abbr}",
         ]
-        facilities: List[Dict] = []
-        seen_names: set = set()
         state_name = US_STATES.get(state_abbr, state_abbr)
 
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            for query in queries:
-                try:
-                    params = {
-                        'query': query,
-                        'key': GOOGLE_MAPS_API_KEY,
-                        'type': 'establishment',
-                    }
-                    response = await client.get(
-                        "https://maps.googleapis.com/maps/api/place/textsearch/json",
-                        params=params,
-                    )
-                    data = response.json()
-
-                    for place in data.get('results', [])[:2]:
-                        name = place.get('name', '')
-                        if name in seen_names:
-                            continue
-                        seen_names.add(name)
-
-                        address = place.get('formatted_address', '')
-                        # BUG 9 FIX: Also accept addresses in the same state even if the
-                        # city name differs — nearby county/metro facilities are valid.
-                        addr_lower = address.lower()
-                        if (city_name.lower() not in addr_lower and
-                                state_abbr.lower() not in addr_lower and
-                                state_name.lower() not in addr_lower):
-                            continue
-
-                        place_id = place.get('place_id')
-                        hours = None
-                        if place_id:
-                            detail_params = {
-                                'place_id': place_id,
-                                'fields': 'opening_hours,formatted_phone_number',
-                                'key': GOOGLE_MAPS_API_KEY,
-                            }
-                            detail_resp = await client.get(
-                                "https://maps.googleapis.com/maps/api/place/details/json",
-                                params=detail_params,
-                            )
-                            oh = detail_resp.json().get('result', {}).get('opening_hours', {})
-                            if oh.get('weekday_text'):
-                                hours = ' | '.join(oh['weekday_text'])
-
-                        facilities.append({
-                            'name': name,
-                            'address': address,
-                            'type': (
-                                'Landfill' if 'landfill' in name.lower()
-                                else 'Transfer Station' if 'transfer' in name.lower()
-                                else 'Drop-Off Center'
-                            ),
-                            'hours': hours,
-                            'tipping_fee': None,
-                            'residency_required': None,
-                            'notes': 'Verify accepts mattresses before visiting',
-                            'google_maps_url': (
-                                f"https://www.google.com/maps/place/?q=place_id:{place_id}"
-                                if place_id else None
-                            ),
-                            'source': 'google_places',
-                        })
-                    await asyncio.sleep(0.5)
-                except Exception as e:
-                    self.logger.log('google_places', 'ERROR', str(e))
+        async def search(query: str) -> List[Dict]:
+            try:
+                return await self.places.text_search(query)
+            except Exception as e:
+                self.logger.log('google_places', 'ERROR', str(e))
+                return []
+
+        # Merge hits in query order so de-duplication matches a serial run
+        candidates: List[Dict] = []
+        seen_names: set = set()
+        for results in await asyncio.gather(*(search(q) for q in queries)):
+            for place in results:
+                name = place.get('name', '')
+                if name in seen_names:
+                    continue
+                seen_names.add(name)
+
+                # BUG 9 FIX: Also accept addresses in the same state even if the
+                # city name differs — nearby county/metro facilities are valid.
+                addr_lower = place.get('formatted_address', '').lower()
+                if (city_name.lower() not in addr_lower and
+                        state_abbr.lower() not in addr_lower and
+                        state_name.lower() not in addr_lower):
+                    continue
+                candidates.append(place)
+
+        async def hours_for(place_id: Optional[str]) -> Optional[str]:
+            if not place_id:
+                return None
+            try:
+                details = await self.places.place_details(place_id)
+            except Exception as e:
+                self.logger.log('google_places', 'ERROR', str(e))
+                return None
+            oh = details.get('opening_hours', {})
+            return ' | '.join(oh['weekday_text']) if oh.get('weekday_text') else None
+
+        hours = await asyncio.gather(*(hours_for(p.get('place_id')) for p in candidates))
+
+        facilities: List[Dict] = []
+        for place, place_hours in zip(candidates, hours):
+            name = place.get('name', '')
+            place_id = place.get('place_id')
+            facilities.append({
+                'name': name,
+                'address': place.get('formatted_address', ''),
+                'type': (
+                    'Landfill' if 'landfill' in name.lower()
+                    else 'Transfer Station' if 'transfer' in name.lower()
+                    else 'Drop-Off Center'
+                ),
+                'hours': place_hours,
+                'tipping_fee': None,
+                'residency_required': None,
+                'notes': 'Verify accepts mattresses before visiting',
+                'google_maps_url': (
+                    f"https://www.google.com/maps/place/?q=place_id:{place_id}"
+                    if place_id else None
+                ),
+                'source': 'google_places',
+            })
 
         self.logger.log('google_places_facilities',
                         'FOUND' if facilities else 'EMPTY',
@@ -1157,8 +1228,9 @@ class Phase3Intelligence:
 class Phase5Competitor:
     """Phase 5: Competitor price scraping."""
 
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, http: Optional[HttpPool] = None):
         self.logger = logger
+        self.http = http or HttpPool()
 
     async def execute(self, city_name: str, state_abbr: str) -> Dict:
         """Execute Phase 5: Competitor Triangulation."""
@@ -1172,18 +1244,18 @@ class Phase5Competitor:
             return competitor_data
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                query = f'1-800-got-junk mattress removal {city_name} {state_abbr} price'
-                search_results = await search_google(client, query, num_results=3)
-                
-                for result in search_results.get('organic_results', [])[:3]:
-                    snippet = result.get('snippet', '')
-                    price_match = re.search(r'\$\d{2,3}', snippet)
-                    if price_match:
-                        competitor_data['competitor_price'] = f"{price_match.group(0)}+"
-                        self.logger.log('competitor_price', 'EXTRACTED',
-                                        competitor_data['competitor_price'])
-                        break
+            client = self.http.for_phase('competitor')
+            query = f'1-800-got-junk mattress removal {city_name} {state_abbr} price'
+            search_results = await search_google(client, query, num_results=3)
+            
+            for result in search_results.get('organic_results', [])[:3]:
+                snippet = result.get('snippet', '')
+                price_match = re.search(r'\$\d{2,3}', snippet)
+                if price_match:
+                    competitor_data['competitor_price'] = f"{price_match.group(0)}+"
+                    self.logger.log('competitor_price', 'EXTRACTED',
+                                    competitor_data['competitor_price'])
+                    break
         except Exception as e:
             self.logger.log('competitor_scraping', 'ERROR', str(e))
 
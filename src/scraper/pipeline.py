@@ -0,0 +1,100 @@
+"""Dependency-graph execution of the per-city scraper phases."""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+
+class PipelineAborted(Exception):
+    """Raised by a node to stop the whole graph (e.g. failed geo validation)."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class PhaseNode:
+    """One phase in the graph: a coroutine function plus the nodes it needs."""
+
+    def __init__(self, name: str, fn: Callable[[Dict[str, Any]], Awaitable[Any]],
+                 deps: Tuple[str, ...] = ()):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+
+
+class PhaseGraph:
+    """
+    Run phases as soon as their dependencies finish.
+
+    Every node starts as a task at once and waits only on its own deps, so
+    independent phases overlap and a city takes about as long as its
+    longest chain. Node functions receive the results of all finished
+    nodes keyed by name. If any node raises (PipelineAborted included),
+    every other node still running is cancelled and the error propagates.
+
+    After run(), `timings` holds (start, end) offsets in seconds for each
+    completed node, and report() renders them with the critical path.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[str, PhaseNode] = {}
+        self.timings: Dict[str, Tuple[float, float]] = {}
+
+    def add(self, name: str, fn: Callable[[Dict[str, Any]], Awaitable[Any]],
+            deps: Tuple[str, ...] = ()) -> 'PhaseGraph':
+        """Add a node. Dependencies must already be in the graph."""
+        missing = [d for d in deps if d not in self.nodes]
+        if missing:
+            raise ValueError(f"Node '{name}' depends on unknown node(s): {missing}")
+        self.nodes[name] = PhaseNode(name, fn, deps)
+        return self
+
+    async def run(self) -> Dict[str, Any]:
+        """Execute the graph and return every node's result by name."""
+        results: Dict[str, Any] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+        self.timings = {}
+        started = time.monotonic()
+
+        async def run_node(node: PhaseNode):
+            if node.deps:
+                await asyncio.gather(*(tasks[d] for d in node.deps))
+            begin = time.monotonic() - started
+            result = await node.fn(results)
+            self.timings[node.name] = (begin, time.monotonic() - started)
+            results[node.name] = result
+            return result
+
+        # Insertion order is a valid topological order (see add()).
+        for name, node in self.nodes.items():
+            tasks[name] = asyncio.ensure_future(run_node(node))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return results
+
+    def critical_path(self) -> List[str]:
+        """Chain of nodes that determined total latency, first to last."""
+        if not self.timings:
+            return []
+        name: Optional[str] = max(self.timings, key=lambda n: self.timings[n][1])
+        path = []
+        while name is not None:
+            path.append(name)
+            deps = [d for d in self.nodes[name].deps if d in self.timings]
+            name = max(deps, key=lambda d: self.timings[d][1]) if deps else None
+        return list(reversed(path))
+
+    def report(self) -> List[str]:
+        """Per-node timing lines; critical-path nodes are starred."""
+        critical = set(self.critical_path())
+        lines = []
+        for name, (begin, end) in sorted(self.timings.items(), key=lambda kv: kv[1][0]):
+            marker = '*' if name in critical else ' '
+            lines.append(f"{marker} {name:<16} {begin:6.1f}s → {end:6.1f}s  ({end - begin:5.1f}s)")
+        return lines
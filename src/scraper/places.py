@@ -0,0 +1,80 @@
+"""Shared Google Places lookups for the Phase 3 facility fallback."""
+import asyncio
+from typing import Dict, List, Optional
+
+from .cache import get_cache
+from .config import PLACES_CACHE_TTL_HOURS, PLACES_CACHE_MAX_ENTRIES
+from .http_client import HttpPool
+from .inflight import InflightCalls
+
+TEXT_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+DETAILS_URL = "https://maps.googleapis.com/maps/api/place/details/json"
+
+# Fields Phase 3 reads from Place Details.
+DETAIL_FIELDS = 'opening_hours,formatted_phone_number'
+
+# Details answers worth keeping; errors and quota statuses are retried.
+_CACHEABLE_STATUSES = {'OK', 'NOT_FOUND'}
+
+
+class PlacesService:
+    """
+    Places Text Search plus memoized Place Details.
+
+    Neighbouring cities' searches keep turning up the same regional
+    transfer stations. Details are therefore fetched once per place_id,
+    shared by concurrent callers while in flight, and persisted in the
+    'place_details' DiskCache across runs. All requests go through the
+    pool, so they share the 'places' rate limit.
+
+    One instance is created per run and handed to every spawned scraper.
+    """
+
+    def __init__(self, api_key: str, http: Optional[HttpPool] = None):
+        self.api_key = api_key
+        self.http = http or HttpPool()
+        self.cache = get_cache(
+            'place_details', PLACES_CACHE_TTL_HOURS * 3600, PLACES_CACHE_MAX_ENTRIES,
+        )
+        self._memo: Dict[str, Dict] = {}
+        self._inflight = InflightCalls()
+        self.api_calls = 0
+
+    async def text_search(self, query: str, limit: int = 2) -> List[Dict]:
+        """First `limit` Text Search results for an establishment query."""
+        client = self.http.for_phase('places')
+        self.api_calls += 1
+        response = await client.get(TEXT_SEARCH_URL, params={
+            'query': query,
+            'key': self.api_key,
+            'type': 'establishment',
+        })
+        return response.json().get('results', [])[:limit]
+
+    async def place_details(self, place_id: str) -> Dict:
+        """
+        DETAIL_FIELDS for one place, as the API's 'result' object ({} if
+        the place has none). Network errors propagate.
+        """
+        if place_id in self._memo:
+            return self._memo[place_id]
+        return await self._inflight.run(place_id, lambda: self._load_details(place_id))
+
+    async def _load_details(self, place_id: str) -> Dict:
+        cached = await asyncio.to_thread(self.cache.get, place_id)
+        if cached is not None:
+            self._memo[place_id] = cached
+            return cached
+        client = self.http.for_phase('places')
+        self.api_calls += 1
+        response = await client.get(DETAILS_URL, params={
+            'place_id': place_id,
+            'fields': DETAIL_FIELDS,
+            'key': self.api_key,
+        })
+        data = response.json()
+        result = data.get('result', {})
+        if data.get('status') in _CACHEABLE_STATUSES:
+            self._memo[place_id] = result
+            await asyncio.to_thread(self.cache.set, place_id, result)
+        return result
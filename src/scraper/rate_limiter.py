@@ -1,27 +1,130 @@
 """Rate limiting for API calls."""
 import asyncio
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from .config import PROVIDER_RATE_LIMITS, DOMAIN_RATE_LIMIT
 
 
 class RateLimiter:
-    """Centralized rate limiter for API calls."""
-    
-    def __init__(self, calls_per_second: float = 0.5):
+    """
+    Token-bucket rate limiter for one provider.
+
+    Tokens refill at `calls_per_second` up to `burst`. Each caller reserves
+    the next free slot and sleeps on its own, so callers don't wait behind
+    a shared lock. A 429 from the provider pauses the whole bucket until its
+    Retry-After deadline. The bucket then resumes at the steady rate, with
+    no burst.
+    """
+
+    def __init__(self, calls_per_second: float = 0.5, burst: int = 1, name: str = ''):
         """
         Initialize rate limiter.
-        
+
         Args:
-            calls_per_second: Maximum calls per second (default 0.5 = 1 call per 2 seconds)
+            calls_per_second: Sustained rate (default 0.5 = 1 call per 2 seconds)
+            burst: Calls allowed back-to-back after an idle period (default 1)
+            name: Provider name, for logging
         """
+        self.name = name
         self.min_interval = 1.0 / calls_per_second
-        self.last_call = datetime.min
-        self._lock = asyncio.Lock()
-    
+        self.burst = max(1, int(burst))
+        self._tolerance = (self.burst - 1) * self.min_interval
+        self._next_slot = 0.0          # theoretical arrival time of the next call
+        self._blocked_until = 0.0
+        self.waited_seconds = 0.0
+        self.throttled = 0
+
+    def _reserve(self) -> float:
+        """Reserve the next slot and return how long the caller must wait."""
+        now = time.monotonic()
+        slot = max(self._next_slot, now)
+        allowed_at = max(slot - self._tolerance, self._blocked_until)
+        self._next_slot = max(slot, allowed_at) + self.min_interval
+        return allowed_at - now
+
     async def acquire(self):
         """Wait if necessary to respect rate limit."""
-        async with self._lock:
-            now = datetime.now()
-            wait = self.min_interval - (now - self.last_call).total_seconds()
-            if wait > 0:
-                await asyncio.sleep(wait)
-            self.last_call = datetime.now()
\ No newline at end of file
+        wait = self._reserve()
+        if wait > 0:
+            self.waited_seconds += wait
+            await asyncio.sleep(wait)
+
+    def penalize(self, retry_after: float):
+        """Pause the bucket after a 429, honoring the provider's Retry-After."""
+        until = time.monotonic() + max(0.0, retry_after)
+        self.throttled += 1
+        if until > self._blocked_until:
+            self._blocked_until = until
+            # Drain the burst allowance so calls resume at the steady rate.
+            self._next_slot = max(self._next_slot, until + self._tolerance)
+
+
+def parse_retry_after(value: Optional[str], default: float) -> float:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds."""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+def provider_for_url(url: str) -> str:
+    """Map an outbound URL to the provider whose budget it consumes."""
+    parts = urlsplit(url)
+    host = (parts.hostname or '').lower()
+    if host == 'google.serper.dev':
+        return 'serper'
+    if host == 'serpapi.com':
+        return 'serpapi'
+    if host == 'maps.googleapis.com':
+        return 'places' if '/place/' in parts.path else 'geocoding'
+    if host == 'api.census.gov':
+        return 'census'
+    if host.startswith('www.'):
+        host = host[4:]
+    return f"domain:{host}"
+
+
+class RateLimiterRegistry:
+    """
+    Process-wide limiters keyed by provider.
+
+    Named providers (Serper, SerpAPI, Geocoding, Places, Census, Gemini)
+    use the budgets in PROVIDER_RATE_LIMITS. Any other key is a fetched
+    domain and gets DOMAIN_RATE_LIMIT. Concurrent cities share one registry,
+    so together they stay within each provider's quota.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]] = PROVIDER_RATE_LIMITS,
+                 domain_limit: Tuple[float, int] = DOMAIN_RATE_LIMIT):
+        self.limits = limits
+        self.domain_limit = domain_limit
+        self._limiters: Dict[str, RateLimiter] = {}
+
+    def get(self, provider: str) -> RateLimiter:
+        """Return the limiter for a provider key, creating it on first use."""
+        limiter = self._limiters.get(provider)
+        if limiter is None:
+            rate, burst = self.limits.get(provider, self.domain_limit)
+            limiter = RateLimiter(rate, burst, name=provider)
+            self._limiters[provider] = limiter
+        return limiter
+
+    def for_url(self, url: str) -> RateLimiter:
+        """Return the limiter for the provider or domain serving `url`."""
+        return self.get(provider_for_url(url))
+
+
+# Shared by every scraper in the process.
+limiters = RateLimiterRegistry()
@@ -2,9 +2,13 @@
 """
 CLI entry point for scraping Greater Boston Area.
 Scrapes all cities, municipalities, and zip codes in the Boston metro area.
+
+The full pipeline runs once per distinct parent city; municipality and
+zip code records are derived from that shared result.
 """
 import asyncio
 import argparse
+import copy
 import json
 import os
 import sys
@@ -18,168 +22,192 @@ sys.path.insert(0, str(Path(__file__).parent))
 try:
     from scraper.main import AutonomousScraper
     from scraper.boston_config import get_all_boston_locations, get_location_count
+    from scraper.scheduler import CityScheduler
+    from scraper.cache import cache_summary
+    from scraper.change_detection import extraction_snapshots
+    from scraper.ledger import JobLedger
+    from scraper.serper import serper_batcher
 except ImportError:
     from main import AutonomousScraper
     from boston_config import get_all_boston_locations, get_location_count
+    from scheduler import CityScheduler
+    from cache import cache_summary
+    from change_detection import extraction_snapshots
+    from ledger import JobLedger
+    from serper import serper_batcher
 
 
-async def scrape_city(scraper, city_data, output_dir, dry_run=False):
-    """Scrape a single city."""
-    city_name = city_data['name']
-    state_abbr = city_data['state_abbr']
-    state_name = city_data['state_name']
-    
-    print(f"\n{'─'*80}")
-    print(f"Processing CITY: {city_name}, {state_abbr}")
-    print(f"{'─'*80}")
-    
-    try:
-        result = await scraper.scrape_city_autonomous(
-            city_name,
-            state_abbr,
-            state_name
-        )
-        
-        # Check if city was skipped due to validation failure
-        if result.get('skipped'):
-            print(f"\n⚠️  SKIPPED: {city_name}, {state_abbr}")
-            print(f"Reason: {result.get('message')}")
-            return None
-        
-        if not dry_run:
-            # Save individual city file
-            city_slug = city_name.lower().replace(' ', '-')
-            output_file = output_dir / f"city_{city_slug}-{state_abbr.lower()}.json"
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            print(f"\n✅ Saved: {output_file}")
-            confidence = result.get('audit_metadata', {}).get('confidence_score', 'UNKNOWN')
-            print(f"Confidence: {confidence}")
+def build_scrape_plan(to_scrape):
+    """
+    Group manifest rows under the distinct parent city they derive from.
+
+    Zip codes and municipalities are published from their parent city's
+    data, so the full autonomous pipeline only needs to run once per
+    (parent city, state). Every row in a group is then derived from that
+    single shared result.
+
+    Returns:
+        List of groups in first-seen order, each a dict with the parent's
+        'city_name', 'state_abbr', 'state_name' and its 'rows' as
+        (location_type, location_data) tuples.
+    """
+    groups = {}
+    for location_type, location_data in to_scrape:
+        state_abbr = location_data['state_abbr']
+        if location_type == 'city':
+            parent = location_data['name']
+        elif location_type == 'municipality':
+            parent = location_data['parent_city']
         else:
-            print(f"\n✅ Processed: {city_name} (dry run - not saved)")
-        
-        return result
-        
-    except Exception as e:
-        print(f"\n❌ ERROR processing {city_name}, {state_abbr}: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+            parent = location_data['city']
+        state_name = location_data.get('state_name', 'Massachusetts')
+
+        key = (parent.lower(), state_abbr.upper())
+        if key not in groups:
+            groups[key] = {
+                'city_name': parent,
+                'state_abbr': state_abbr,
+                'state_name': state_name,
+                'rows': [],
+            }
+        groups[key]['rows'].append((location_type, location_data))
 
+    return list(groups.values())
 
-async def scrape_municipality(scraper, muni_data, output_dir, dry_run=False):
+
+def derive_city_record(parent_result, city_data):
+    """A city row is the parent pipeline result itself."""
+    return copy.deepcopy(parent_result)
+
+
+def derive_municipality_record(parent_result, muni_data):
     """
-    Scrape a municipality (neighborhood/suburb).
-    Uses the parent city's data as base and customizes for the municipality.
+    Derive a municipality (neighborhood/suburb) record from its parent city.
+    Tags the record as a municipality with a parent city reference.
     """
     muni_name = muni_data['name']
-    parent_city = muni_data['parent_city']
     state_abbr = muni_data['state_abbr']
-    state_name = muni_data['state_name']
-    
-    print(f"\n{'─'*80}")
-    print(f"Processing MUNICIPALITY: {muni_name} (part of {parent_city}), {state_abbr}")
-    print(f"{'─'*80}")
-    
-    try:
-        # For municipalities, we scrape the parent city but tag it as municipality
-        result = await scraper.scrape_city_autonomous(
-            parent_city,  # Use parent city for scraping
-            state_abbr,
-            state_name
-        )
-        
-        if result.get('skipped'):
-            print(f"\n⚠️  SKIPPED: {muni_name}, {state_abbr}")
-            print(f"Reason: {result.get('message')}")
-            return None
-        
-        # Customize result for municipality
-        result['municipality_name'] = muni_name
-        result['parent_city'] = parent_city
-        result['city_slug'] = f"{muni_name.lower().replace(' ', '-')}-{state_abbr.lower()}"
-        result['is_municipality'] = True
-        
-        if not dry_run:
-            # Save individual municipality file
-            muni_slug = muni_name.lower().replace(' ', '-')
-            output_file = output_dir / f"municipality_{muni_slug}-{state_abbr.lower()}.json"
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            print(f"\n✅ Saved: {output_file}")
-        else:
-            print(f"\n✅ Processed: {muni_name} (dry run - not saved)")
-        
-        return result
-        
-    except Exception as e:
-        print(f"\n❌ ERROR processing {muni_name}, {state_abbr}: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+
+    result = copy.deepcopy(parent_result)
+    result['municipality_name'] = muni_name
+    result['parent_city'] = muni_data['parent_city']
+    result['city_slug'] = f"{muni_name.lower().replace(' ', '-')}-{state_abbr.lower()}"
+    result['is_municipality'] = True
+    return result
 
 
-async def scrape_zipcode(scraper, zip_data, output_dir, dry_run=False):
+def derive_zipcode_record(parent_result, zip_data):
     """
-    Scrape a zip code area.
-    Uses the city's data as base and customizes for the zip code.
+    Derive a zip code record from its parent city.
+    Tags the record with neighborhood and city, and narrows the zip list
+    to the target zip code.
     """
     zip_code = zip_data['zip']
     neighborhood = zip_data['neighborhood']
-    city = zip_data['city']
-    state_abbr = zip_data['state_abbr']
-    
+
+    result = copy.deepcopy(parent_result)
+    result['zip_code'] = zip_code
+    result['neighborhood'] = neighborhood
+    result['parent_city'] = zip_data['city']
+    result['city_slug'] = f"{zip_code}-{neighborhood.lower().replace(' ', '-')}"
+    result['is_zipcode'] = True
+
+    # Filter zip codes to only include this specific one
+    if 'geo' in result and 'zip_codes' in result['geo']:
+        result['geo']['zip_codes'] = [zip_code]
+    return result
+
+
+def _row_label(location_type, location_data):
+    """Human-readable label for a manifest row."""
+    if location_type == 'zipcode':
+        return f"ZIP CODE {location_data['zip']} ({location_data['neighborhood']})"
+    return f"{location_type.upper()} {location_data['name']}"
+
+
+def _row_output_file(output_dir, location_type, location_data):
+    """Per-row output file, matching the historical naming scheme."""
+    state_abbr = location_data['state_abbr'].lower()
+    if location_type == 'zipcode':
+        return output_dir / f"zipcode_{location_data['zip']}.json"
+    slug = location_data['name'].lower().replace(' ', '-')
+    prefix = 'city' if location_type == 'city' else 'municipality'
+    return output_dir / f"{prefix}_{slug}-{state_abbr}.json"
+
+
+def _row_key(location_type, location_data):
+    """Stable job ledger key for a manifest row."""
+    if location_type == 'zipcode':
+        return f"zipcode:{location_data['zip']}"
+    slug = location_data['name'].lower().replace(' ', '-')
+    return f"{location_type}:{slug}-{location_data['state_abbr'].lower()}"
+
+
+_DERIVERS = {
+    'city': derive_city_record,
+    'municipality': derive_municipality_record,
+    'zipcode': derive_zipcode_record,
+}
+
+
+async def scrape_parent_group(scraper, group, output_dir, dry_run=False):
+    """
+    Run the full pipeline once for a parent city, then derive and save every
+    city, municipality and zip code row that hangs off it.
+
+    Returns:
+        List of (location_type, location_data, record) tuples for the rows
+        that succeeded, or None if the parent city was skipped. Pipeline
+        errors propagate so the job ledger can record and retry them.
+    """
+    city_name = group['city_name']
+    state_abbr = group['state_abbr']
+    rows = group['rows']
+
     print(f"\n{'─'*80}")
-    print(f"Processing ZIP CODE: {zip_code} ({neighborhood}, {city}), {state_abbr}")
+    print(f"Processing PARENT CITY: {city_name}, {state_abbr} "
+          f"({len(rows)} location(s) derive from it)")
     print(f"{'─'*80}")
-    
-    try:
-        # For zip codes, we scrape the city but tag it as zip code
-        result = await scraper.scrape_city_autonomous(
-            city,
-            state_abbr,
-            'Massachusetts'
-        )
-        
-        if result.get('skipped'):
-            print(f"\n⚠️  SKIPPED: {zip_code}, {state_abbr}")
-            print(f"Reason: {result.get('message')}")
-            return None
-        
-        # Customize result for zip code
-        result['zip_code'] = zip_code
-        result['neighborhood'] = neighborhood
-        result['parent_city'] = city
-        result['city_slug'] = f"{zip_code}-{neighborhood.lower().replace(' ', '-')}"
-        result['is_zipcode'] = True
-        
-        # Filter zip codes to only include this specific one
-        if 'geo' in result and 'zip_codes' in result['geo']:
-            if zip_code in result['geo']['zip_codes']:
-                result['geo']['zip_codes'] = [zip_code]
-            else:
-                result['geo']['zip_codes'] = [zip_code]
-        
-        if not dry_run:
-            # Save individual zip code file
-            output_file = output_dir / f"zipcode_{zip_code}.json"
-            with open(output_file, 'w') as f:
-                json.dump(result, f, indent=2)
-            
-            print(f"\n✅ Saved: {output_file}")
-        else:
-            print(f"\n✅ Processed: {zip_code} (dry run - not saved)")
-        
-        return result
-        
-    except Exception as e:
-        print(f"\n❌ ERROR processing {zip_code}: {e}")
-        import traceback
-        traceback.print_exc()
+
+    parent_result = await scraper.scrape_city_autonomous(
+        city_name,
+        state_abbr,
+        group['state_name']
+    )
+
+    # Check if city was skipped due to validation failure
+    if parent_result.get('skipped'):
+        for location_type, location_data in rows:
+            print(f"\n⚠️  SKIPPED: {_row_label(location_type, location_data)}, {state_abbr}")
+        print(f"Reason: {parent_result.get('message')}")
         return None
 
+    derived = []
+    for location_type, location_data in rows:
+        label = _row_label(location_type, location_data)
+        try:
+            result = _DERIVERS[location_type](parent_result, location_data)
+
+            if not dry_run:
+                output_file = _row_output_file(output_dir, location_type, location_data)
+                with open(output_file, 'w') as f:
+                    json.dump(result, f, indent=2)
+                print(f"✅ Saved {label}: {output_file}")
+            else:
+                print(f"✅ Processed {label} (dry run - not saved)")
+
+            derived.append((location_type, location_data, result))
+        except Exception as e:
+            print(f"\n❌ ERROR deriving {label}, {state_abbr}: {e}")
+            import traceback
+            traceback.print_exc()
+
+    if not dry_run:
+        confidence = parent_result.get('audit_metadata', {}).get('confidence_score', 'UNKNOWN')
+        print(f"Confidence: {confidence}")
+
+    return derived
+
 
 async def main():
     """Main CLI entry point."""
@@ -204,6 +232,15 @@ Examples:
   
   # Custom output directory
   python3 run_boston_scraper.py --all --output ../boston_data
+  
+  # Run four parent city pipelines at once
+  python3 run_boston_scraper.py --all --concurrency 4
+  
+  # Continue an interrupted run, retrying failed locations
+  python3 run_boston_scraper.py --all --resume
+  
+  # Re-run extraction, charisma and assembly from stored artifacts
+  python3 run_boston_scraper.py --all --from-stage extract
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -237,11 +274,28 @@ Examples:
         action='store_true',
         help='Run without saving output'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of parent city pipelines to run at once (default: 1)'
+    )
     parser.add_argument(
         '--delay',
         type=int,
-        default=5,
-        help='Delay in seconds between requests (default: 5)'
+        default=0,
+        help='Seconds each worker pauses after a pipeline run (default: 0)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip locations the job ledger marks finished and retry failed ones'
+    )
+    parser.add_argument(
+        '--from-stage',
+        choices=['extract', 'charisma', 'assemble'],
+        help='Replay from this stage using stored per-city artifacts instead of '
+             're-running earlier phases (no geocoding, searches or fetches)'
     )
     
     args = parser.parse_args()
@@ -275,6 +329,8 @@ Examples:
         print(f"  - Zip Codes: {counts['zip_codes']}")
     print(f"Output: {args.output}")
     print(f"Dry run: {args.dry_run}")
+    if args.from_stage:
+        print(f"Replaying from stage: {args.from_stage}")
     print(f"{'='*80}\n")
     
     # Create output directory
@@ -283,7 +339,7 @@ Examples:
         output_dir.mkdir(parents=True, exist_ok=True)
     
     # Initialize scraper
-    scraper = AutonomousScraper()
+    scraper = AutonomousScraper(from_stage=args.from_stage)
     
     # Track results
     results = {
@@ -292,28 +348,76 @@ Examples:
         'zip_codes': [],
     }
     
-    # Process all locations
-    for idx, (location_type, location_data) in enumerate(to_scrape, 1):
-        print(f"\n[{idx}/{len(to_scrape)}] Processing {location_type}...")
-        
-        result = None
-        if location_type == 'city':
-            result = await scrape_city(scraper, location_data, output_dir, args.dry_run)
-            if result:
-                results['cities'].append(result)
-        elif location_type == 'municipality':
-            result = await scrape_municipality(scraper, location_data, output_dir, args.dry_run)
-            if result:
-                results['municipalities'].append(result)
-        elif location_type == 'zipcode':
-            result = await scrape_zipcode(scraper, location_data, output_dir, args.dry_run)
-            if result:
-                results['zip_codes'].append(result)
-        
-        # Rate limiting between requests
-        if idx < len(to_scrape):
-            print(f"\n⏳ Waiting {args.delay}s before next location...")
+    result_keys = {
+        'city': 'cities',
+        'municipality': 'municipalities',
+        'zipcode': 'zip_codes',
+    }
+    
+    # The ledger records each location's status as its group finishes, so
+    # an interrupted run can be continued with --resume.
+    ledger = None
+    all_keys = [_row_key(t, d) for t, d in to_scrape]
+    if not args.dry_run:
+        ledger = JobLedger(str(output_dir / 'boston_jobs.sqlite3'))
+        ledger.register(all_keys, reset=not args.resume)
+        if args.resume:
+            finished = {job['key']: job for job in ledger.completed(all_keys)}
+            for (location_type, _), key in zip(to_scrape, all_keys):
+                path = (finished.get(key) or {}).get('artifact_path')
+                if path and os.path.exists(path):
+                    with open(path) as f:
+                        results[result_keys[location_type]].append(json.load(f))
+            remaining = [row for row, key in zip(to_scrape, all_keys) if ledger.should_run(key)]
+            print(f"↩️  Resuming: {len(to_scrape) - len(remaining)} location(s) already finished, "
+                  f"{len(remaining)} to run\n")
+            to_scrape = remaining
+    
+    # Build the hierarchical plan: one pipeline run per distinct parent city
+    plan = build_scrape_plan(to_scrape)
+    print(f"Scrape plan: {len(plan)} pipeline run(s) for {len(to_scrape)} location(s)\n")
+    
+    scheduler = CityScheduler(scraper, concurrency=args.concurrency)
+    print(f"Concurrency: {scheduler.concurrency}\n")
+    
+    # Groups and locations that produced results this run, for throughput.
+    succeeded = {'groups': 0, 'locations': 0}
+    
+    def on_result(group, derived):
+        for location_type, _, result in derived or []:
+            results[result_keys[location_type]].append(result)
+        if derived:
+            succeeded['groups'] += 1
+            succeeded['locations'] += len(derived)
+        done = scheduler.completed + scheduler.failed
+        print(f"\n[{done}/{len(plan)}] Finished {group['city_name']} group "
+              f"({len(derived or [])}/{len(group['rows'])} location(s))")
+    
+    async def attempt(worker_scraper, group):
+        derived = await scrape_parent_group(worker_scraper, group, output_dir, args.dry_run)
+        if derived is None:
+            return None, {_row_key(t, d): ('skipped', None) for t, d in group['rows']}
+        return derived, {
+            _row_key(t, d): ('done', str(_row_output_file(output_dir, t, d)))
+            for t, d, _ in derived
+        }
+    
+    async def worker(worker_scraper, group):
+        if ledger is None:
+            derived = (await attempt(worker_scraper, group))[0]
+        else:
+            derived = await ledger.run(
+                [_row_key(t, d) for t, d in group['rows']],
+                lambda: attempt(worker_scraper, group),
+            )
+        if args.delay:
             await asyncio.sleep(args.delay)
+        return derived
+    
+    try:
+        await scheduler.run(plan, worker, on_result)
+    finally:
+        await scraper.aclose()
     
     # Save combined results
     if not args.dry_run and (results['cities'] or results['municipalities'] or results['zip_codes']):
@@ -347,6 +451,20 @@ Examples:
     print(f"  - Cities: {len(results['cities'])}/{counts['cities'] if (args.all or args.cities) else 0}")
     print(f"  - Municipalities: {len(results['municipalities'])}/{counts['municipalities'] if (args.all or args.municipalities) else 0}")
     print(f"  - Zip Codes: {len(results['zip_codes'])}/{counts['zip_codes'] if (args.all or args.zip_codes) else 0}")
+    print(f"Pipeline runs: {succeeded['groups']}/{len(plan)} succeeded in "
+          f"{scheduler.elapsed / 60:.1f} min "
+          f"({scheduler.throughput(succeeded['groups']):.2f} cities/minute, "
+          f"{scheduler.throughput(succeeded['locations']):.2f} locations/minute)")
+    if extraction_snapshots.reused:
+        print(f"🔁 Phase 3 skipped for {extraction_snapshots.reused} "
+              f"city(ies) with unchanged content")
+    if serper_batcher.requests:
+        print(f"🔎 Serper: {serper_batcher.summary()}")
+    for line in cache_summary():
+        print(f"💾 Cache {line}")
+    if ledger is not None:
+        print(f"📒 Job ledger: {ledger.summary(all_keys)}")
+        ledger.close()
     print(f"{'='*80}\n")
 
 
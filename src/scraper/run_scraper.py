@@ -14,6 +14,12 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from scraper import AutonomousScraper
+from scraper.scheduler import CityScheduler
+from scraper.cache import cache_summary
+from scraper.change_detection import extraction_snapshots
+from scraper.ledger import JobLedger
+from scraper.serper import serper_batcher
+from scraper.output_store import RecordStore
 
 
 # US State mapping for major cities
@@ -191,6 +197,53 @@ def resolve_city_state(city_name: str, state_override: str = None,
     )
 
 
+def city_output_file(output_dir, city_name):
+    """Per-city output file."""
+    city_slug = city_name.lower().replace(' ', '-')
+    return output_dir / f"autonomous_{city_slug}.json"
+
+
+async def scrape_city(scraper, city_name, state_abbr, state_name, output_dir, dry_run=False):
+    """
+    Scrape a single city and save its individual output file.
+
+    Returns the city data, or None if the city was skipped. Pipeline errors
+    propagate so the job ledger can record and retry them.
+    """
+    print(f"\n{'─'*80}")
+    print(f"Processing: {city_name}, {state_abbr}")
+    print(f"{'─'*80}")
+    
+    result = await scraper.scrape_city_autonomous(
+        city_name,
+        state_abbr,
+        state_name
+    )
+    
+    # Check if city was skipped due to validation failure
+    if result.get('skipped'):
+        print(f"\n⚠️  SKIPPED: {city_name}, {state_abbr}")
+        print(f"Reason: {result.get('message')}")
+        return None
+    
+    if not dry_run:
+        # Ensure output directory exists
+        output_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Save individual city file
+        output_file = city_output_file(output_dir, city_name)
+        with open(output_file, 'w') as f:
+            json.dump(result, f, indent=2)
+        
+        print(f"\n✅ Saved: {output_file}")
+        confidence = result.get('audit_metadata', {}).get('confidence_score', 'UNKNOWN')
+        print(f"Confidence: {confidence}")
+    else:
+        print(f"\n✅ Processed: {city_name} (dry run - not saved)")
+    
+    return result
+
+
 async def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
@@ -208,6 +261,15 @@ Examples:
   
   # Mix formats
   python3 run_scraper.py --cities "Phoenix, AZ" Houston "Seattle, WA"
+  
+  # Run three city pipelines at once
+  python3 run_scraper.py --cities Austin Dallas Houston Phoenix --concurrency 3
+  
+  # Continue an interrupted run, retrying failed cities
+  python3 run_scraper.py --cities Austin Dallas Houston Phoenix --resume
+  
+  # Re-run extraction, charisma and assembly from stored artifacts
+  python3 run_scraper.py --cities Austin Dallas --from-stage extract
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -234,6 +296,23 @@ Examples:
         action='store_true',
         help='Run without saving output'
     )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='Number of city pipelines to run at once (default: 1)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Skip cities the job ledger marks finished and retry failed ones'
+    )
+    parser.add_argument(
+        '--from-stage',
+        choices=['extract', 'charisma', 'assemble'],
+        help='Replay from this stage using stored per-city artifacts instead of '
+             're-running earlier phases (no geocoding, searches or fetches)'
+    )
     
     args = parser.parse_args()
     
@@ -256,93 +335,111 @@ Examples:
             print(f"❌ Error: {e}")
             sys.exit(1)
     
-    scraper = AutonomousScraper()
     results = []
     
+    # The ledger records each city's status as it finishes, so an
+    # interrupted run can be continued with --resume.
+    output_dir = Path(args.output)
+    combined_file = output_dir / 'autonomous_cities.json'
+    ledger = None
+    store = None
+    jobs = resolved_cities
+    if not args.dry_run:
+        # Cities are appended to a JSONL store as they finish; the combined
+        # JSON is written from it once at the end.
+        store = RecordStore(output_dir / 'autonomous_cities.jsonl')
+        if not len(store) and combined_file.exists():
+            try:
+                with open(combined_file, 'r') as f:
+                    for record in json.load(f):
+                        store.upsert(record)
+                print(f"\n📂 Loaded {len(store)} existing cities")
+            except Exception as e:
+                print(f"\n⚠️  Could not load existing data: {e}")
+        ledger = JobLedger(str(output_dir / 'autonomous_jobs.sqlite3'))
+        keys = [f"{city}|{state_abbr}" for city, state_abbr, _ in resolved_cities]
+        ledger.register(keys, reset=not args.resume)
+        if args.resume:
+            jobs = [job for job, key in zip(resolved_cities, keys) if ledger.should_run(key)]
+            for job in ledger.completed(keys):
+                if job['artifact_path'] and os.path.exists(job['artifact_path']):
+                    with open(job['artifact_path']) as f:
+                        results.append(json.load(f))
+            print(f"↩️  Resuming: {len(resolved_cities) - len(jobs)} city(ies) already finished, "
+                  f"{len(jobs)} to run")
+    
+    scraper = AutonomousScraper(from_stage=args.from_stage)
+    scheduler = CityScheduler(scraper, concurrency=args.concurrency)
+    
     print(f"\n{'='*80}")
     print(f"🚀 STARTING AUTONOMOUS SCRAPER")
     print(f"Cities: {len(resolved_cities)} to process")
+    print(f"Concurrency: {scheduler.concurrency}")
+    if args.from_stage:
+        print(f"Replaying from stage: {args.from_stage}")
     print(f"Output: {args.output}")
     print(f"{'='*80}\n")
     
-    for city_name, state_abbr, state_name in resolved_cities:
-        try:
-            print(f"\n{'─'*80}")
-            print(f"Processing: {city_name}, {state_abbr}")
-            print(f"{'─'*80}")
-            
-            result = await scraper.scrape_city_autonomous(
-                city_name,
-                state_abbr,
-                state_name
-            )
-            
-            # Check if city was skipped due to validation failure
-            if result.get('skipped'):
-                print(f"\n⚠️  SKIPPED: {city_name}, {state_abbr}")
-                print(f"Reason: {result.get('message')}")
-                continue
-            
+    # Cities that produced a result this run (not resumed), for throughput.
+    succeeded = 0
+    
+    def on_result(job, result):
+        nonlocal succeeded
+        if result:
+            succeeded += 1
             results.append(result)
-            
-            if not args.dry_run:
-                # Ensure output directory exists
-                output_dir = Path(args.output)
-                output_dir.mkdir(parents=True, exist_ok=True)
-                
-                # Save individual city file
-                city_slug = city_name.lower().replace(' ', '-')
-                output_file = output_dir / f"autonomous_{city_slug}.json"
-                with open(output_file, 'w') as f:
-                    json.dump(result, f, indent=2)
-                
-                print(f"\n✅ Saved: {output_file}")
-                confidence = result.get('audit_metadata', {}).get('confidence_score', 'UNKNOWN')
-                print(f"Confidence: {confidence}")
-            else:
-                print(f"\n✅ Processed: {city_name} (dry run - not saved)")
-            
-            # Rate limiting between cities
-            if (city_name, state_abbr, state_name) != resolved_cities[-1]:
-                wait_time = 5
-                print(f"\n⏳ Waiting {wait_time}s before next city...")
-                await asyncio.sleep(wait_time)
-            
-        except Exception as e:
-            print(f"\n❌ ERROR processing {city_name}, {state_abbr}: {e}")
-            import traceback
-            traceback.print_exc()
-            continue
+            if store is not None:
+                store.upsert(result)
+        done = scheduler.completed + scheduler.failed
+        print(f"\n[{done}/{len(jobs)}] Finished {job[0]}, {job[1]}")
     
-    # Save combined results
-    if not args.dry_run and results:
-        output_dir = Path(args.output)
-        combined_file = output_dir / 'autonomous_cities.json'
-        
-        # Load existing data if it exists
-        existing_data = []
-        if combined_file.exists():
-            try:
-                with open(combined_file, 'r') as f:
-                    existing_data = json.load(f)
-                print(f"\n📂 Loaded {len(existing_data)} existing cities")
-            except Exception as e:
-                print(f"\n⚠️  Could not load existing data: {e}")
+    async def worker(worker_scraper, job):
+        city_name, state_abbr, state_name = job
+        key = f"{city_name}|{state_abbr}"
         
-        # Merge new results with existing (replace duplicates)
-        city_slugs_new = {r['city_slug'] for r in results}
-        merged_data = [r for r in existing_data if r['city_slug'] not in city_slugs_new]
-        merged_data.extend(results)
+        async def attempt():
+            result = await scrape_city(
+                worker_scraper, city_name, state_abbr, state_name,
+                output_dir, args.dry_run
+            )
+            if result is None:
+                return None, {key: ('skipped', None)}
+            return result, {key: ('done', str(city_output_file(output_dir, city_name)))}
         
-        with open(combined_file, 'w') as f:
-            json.dump(merged_data, f, indent=2)
-        print(f"✅ Saved combined: {combined_file} ({len(merged_data)} total cities)")
+        if ledger is None:
+            return (await attempt())[0]
+        return await ledger.run([key], attempt)
+    
+    try:
+        await scheduler.run(jobs, worker, on_result)
+    finally:
+        await scraper.aclose()
+    
+    # Save combined results
+    if store is not None:
+        store.commit()
+        if results:
+            store.materialize(combined_file, indent=2)
+            print(f"✅ Saved combined: {combined_file} ({len(store)} total cities)")
+        store.close()
     
     print(f"\n{'='*80}")
     print(f"✅ PIPELINE COMPLETE: {len(results)}/{len(resolved_cities)} cities processed")
     if len(results) < len(resolved_cities):
         skipped = len(resolved_cities) - len(results)
         print(f"⚠️  {skipped} cities skipped due to validation failures")
+    print(f"⏱️  {scheduler.elapsed / 60:.1f} min, "
+          f"{scheduler.throughput(succeeded):.2f} cities/minute")
+    if extraction_snapshots.reused:
+        print(f"🔁 Phase 3 skipped for {extraction_snapshots.reused} "
+              f"city(ies) with unchanged content")
+    if serper_batcher.requests:
+        print(f"🔎 Serper: {serper_batcher.summary()}")
+    for line in cache_summary():
+        print(f"💾 Cache {line}")
+    if ledger is not None:
+        print(f"📒 Job ledger: {ledger.summary(keys)}")
+        ledger.close()
     print(f"{'='*80}\n")
 
 
@@ -0,0 +1,93 @@
+"""Concurrent multi-city scheduling for the CLI entry points."""
+import asyncio
+import time
+import traceback
+from typing import Any, Awaitable, Callable, List, Optional
+
+
+class CityScheduler:
+    """
+    Run several cities' pipelines at once.
+
+    `concurrency` workers pull jobs from a shared queue. Each worker owns a
+    sibling AutonomousScraper (see AutonomousScraper.spawn) with its own
+    Logger and agents. Concurrent cities never mix log entries or sources,
+    but all of them share the run's HTTP pool. Politeness comes from the
+    per-provider limits on that shared pool, not from sleeps between cities.
+
+    Results stream to `on_result` as each city finishes, in completion
+    order rather than submission order.
+    """
+
+    def __init__(self, scraper, concurrency: int = 1):
+        self.scraper = scraper
+        self.concurrency = max(1, concurrency)
+        self.completed = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    async def run(
+        self,
+        jobs: List[Any],
+        worker_fn: Callable[[Any, Any], Awaitable[Any]],
+        on_result: Optional[Callable[[Any, Any], None]] = None,
+    ) -> None:
+        """
+        Process every job with `worker_fn(scraper, job)`.
+
+        Args:
+            jobs: Work items, handed to workers in order.
+            worker_fn: Coroutine run once per job with the worker's scraper.
+            on_result: Called with (job, result) as soon as a job finishes.
+                `result` is None when worker_fn raised.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for job in jobs:
+            queue.put_nowait(job)
+
+        workers = [self.scraper] + [
+            self.scraper.spawn() for _ in range(min(self.concurrency, len(jobs)) - 1)
+        ]
+
+        self.started_at = time.monotonic()
+        try:
+            await asyncio.gather(*(
+                self._worker(scraper, queue, worker_fn, on_result)
+                for scraper in workers
+            ))
+        finally:
+            self.finished_at = time.monotonic()
+
+    async def _worker(self, scraper, queue, worker_fn, on_result):
+        while True:
+            try:
+                job = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+
+            result = None
+            try:
+                result = await worker_fn(scraper, job)
+                self.completed += 1
+            except Exception as e:
+                self.failed += 1
+                print(f"\n❌ ERROR in scheduled job {job!r}: {e}")
+                traceback.print_exc()
+
+            if on_result:
+                on_result(job, result)
+
+    @property
+    def elapsed(self) -> float:
+        """Wall-clock seconds spent in run()."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return end - self.started_at
+
+    def throughput(self, count: Optional[int] = None) -> float:
+        """Items per minute; defaults to completed jobs."""
+        count = self.completed if count is None else count
+        minutes = self.elapsed / 60
+        return count / minutes if minutes > 0 else 0.0
@@ -0,0 +1,142 @@
+"""Batched Serper.dev searches shared by every phase and city."""
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+from .config import SERPER_API_KEY, SERPER_BATCH_SIZE, SERPER_BATCH_WINDOW_MS
+
+SERPER_SEARCH_URL = "https://google.serper.dev/search"
+
+
+def normalize_serper(data) -> Dict:
+    """
+    Convert one Serper.dev answer to the SerpAPI shape search_google
+    returns: {'organic_results': [{'title', 'link', 'snippet'}, ...]}.
+    Answers without 'organic' that carry an error message keep it under
+    'error', so they are not cached.
+    """
+    if not isinstance(data, dict):
+        return {'organic_results': [], 'error': 'malformed Serper response'}
+    normalized = {'organic_results': [
+        {
+            'title': result.get('title', ''),
+            'link': result.get('link', ''),
+            'snippet': result.get('snippet', ''),
+        }
+        for result in data.get('organic', [])
+    ]}
+    if 'organic' not in data and (data.get('message') or data.get('error')):
+        normalized['error'] = data.get('message') or data.get('error')
+    return normalized
+
+
+class SerperBatcher:
+    """
+    Collects Serper searches and sends them as few POSTs as possible.
+
+    search() queues a query and waits. The first query opens a window of
+    `window_seconds`; everything queued before it closes (or until
+    `max_batch` queries are waiting) goes out as one POST whose body is a
+    JSON array, and Serper answers with an array in the same order. Each
+    caller gets its own answer back, normalized. Identical (query, num)
+    pairs in one batch are sent once.
+
+    A failed request fails every search in that batch; search_google
+    turns that into an empty result as before. The batch is sent through
+    the first caller's client, so it still counts as one request against
+    the 'serper' rate limit.
+    """
+
+    def __init__(self, api_key: Optional[str], max_batch: int = SERPER_BATCH_SIZE,
+                 window_seconds: float = SERPER_BATCH_WINDOW_MS / 1000):
+        self.api_key = api_key
+        self.max_batch = max(1, max_batch)
+        self.window_seconds = window_seconds
+        self._pending: Dict[Tuple[str, int], List[asyncio.Future]] = {}
+        self._client = None
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # The loop only keeps weak references to tasks; hold the send
+        # tasks until they finish.
+        self._sending: Set[asyncio.Task] = set()
+        self.queries = 0
+        self.requests = 0
+
+    async def search(self, client, query: str, num_results: int) -> Dict:
+        """Normalized results for one query, sent with whatever else is queued."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # A new asyncio.run(); anything queued on the old loop is gone.
+            self._pending, self._timer, self._loop = {}, None, loop
+        future = loop.create_future()
+        if not self._pending:
+            self._client = client
+        self._pending.setdefault((query, num_results), []).append(future)
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._send(self._client, batch))
+            self._sending.add(task)
+            task.add_done_callback(lambda t: self._sent(t, batch))
+
+    def _sent(self, task: asyncio.Task, batch: Dict[Tuple[str, int], List[asyncio.Future]]):
+        """Drop a finished send task and pass any failure on to its callers."""
+        self._sending.discard(task)
+        error = None if task.cancelled() else task.exception()
+        for futures in batch.values():
+            for future in futures:
+                if future.done():
+                    continue
+                if task.cancelled():
+                    future.cancel()
+                elif error is not None:
+                    future.set_exception(error)
+
+    async def _send(self, client, batch: Dict[Tuple[str, int], List[asyncio.Future]]):
+        items = list(batch)
+        payload = [{'q': query, 'num': num} for query, num in items]
+        headers = {'X-API-KEY': self.api_key, 'Content-Type': 'application/json'}
+        self.queries += len(items)
+        self.requests += 1
+        try:
+            if len(payload) == 1:
+                response = await client.post(SERPER_SEARCH_URL, json=payload[0],
+                                              headers=headers, timeout=10.0)
+                answers = [response.json()]
+            else:
+                response = await client.post(SERPER_SEARCH_URL, json=payload,
+                                              headers=headers, timeout=10.0 + len(payload))
+                answers = response.json()
+                if not isinstance(answers, list) or len(answers) != len(payload):
+                    raise ValueError(
+                        f"Serper batch of {len(payload)} returned "
+                        f"{len(answers) if isinstance(answers, list) else 'no'} answers"
+                    )
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for item, answer in zip(items, answers):
+            result = normalize_serper(answer)
+            if response.status_code != 200:
+                result.setdefault('error', f"HTTP {response.status_code}")
+            for future in batch[item]:
+                if not future.done():
+                    future.set_result(result)
+
+    def summary(self) -> str:
+        return f"{self.queries} query(ies) in {self.requests} request(s)"
+
+
+serper_batcher = SerperBatcher(SERPER_API_KEY)
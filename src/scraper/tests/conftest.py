@@ -0,0 +1,12 @@
+"""Shared test setup: import the package as `scraper`, offline and cache-free."""
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+# config.py refuses to import without API keys; the tests never call out.
+os.environ.setdefault('GEMINI_API_KEY', 'test')
+os.environ.setdefault('GOOGLE_MAPS_API_KEY', 'test')
+os.environ.setdefault('SERPER_API_KEY', 'test')
+os.environ['SCRAPER_CACHE'] = '0'
+os.environ['SCRAPER_ARTIFACTS'] = '0'
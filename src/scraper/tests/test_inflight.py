@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+
+from scraper.inflight import InflightCalls
+
+
+def test_concurrent_callers_share_one_call():
+    calls = InflightCalls()
+    started = []
+
+    async def fetch():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def go():
+        return await asyncio.gather(*(calls.run('k', fetch) for _ in range(3)))
+
+    assert asyncio.run(go()) == ['value'] * 3
+    assert len(started) == 1
+    assert 'k' not in calls
+
+
+def test_waiters_get_the_leaders_exception():
+    calls = InflightCalls()
+    started = []
+
+    async def fetch():
+        started.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError('boom')
+
+    async def go():
+        return await asyncio.gather(*(calls.run('k', fetch) for _ in range(3)),
+                                    return_exceptions=True)
+
+    results = asyncio.run(go())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(started) == 1
+
+
+def test_cancelled_leader_hands_over_to_a_waiter():
+    calls = InflightCalls()
+    started = []
+
+    async def fetch():
+        started.append(1)
+        if len(started) == 1:
+            await asyncio.sleep(10)  # the leader hangs until cancelled
+        return 'retried'
+
+    async def go():
+        leader = asyncio.ensure_future(calls.run('k', fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(calls.run('k', fetch))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.wait_for(waiter, 1)
+
+    assert asyncio.run(go()) == 'retried'
+    assert len(started) == 2
+    assert 'k' not in calls
+
+
+def test_cancelled_waiter_leaves_the_leader_running():
+    calls = InflightCalls()
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return 'value'
+
+    async def go():
+        leader = asyncio.ensure_future(calls.run('k', fetch))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(calls.run('k', fetch))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await leader
+
+    assert asyncio.run(go()) == 'value'
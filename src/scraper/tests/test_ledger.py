@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from scraper.ledger import JobLedger
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = JobLedger(str(tmp_path / 'jobs.sqlite3'), max_attempts=2, backoff_seconds=0)
+    yield ledger
+    ledger.close()
+
+
+def test_register_keeps_existing_jobs_unless_reset(ledger):
+    ledger.register(['a'])
+    ledger.start('a')
+    ledger.finish('a', 'done', 'a.json')
+
+    ledger.register(['a', 'b'])
+    assert ledger.get('a')['status'] == 'done'
+    assert ledger.get('b')['status'] == 'pending'
+
+    ledger.register(['a'], reset=True)
+    job = ledger.get('a')
+    assert (job['status'], job['attempts'], job['artifact_path']) == ('pending', 0, None)
+
+
+def test_should_run_after_fail_and_finish(ledger):
+    ledger.register(['failed', 'done', 'skipped'])
+    for key in ('failed', 'done', 'skipped'):
+        ledger.start(key)
+    ledger.fail('failed', 'boom')
+    ledger.finish('done', 'done')
+    ledger.finish('skipped', 'skipped')
+
+    assert ledger.should_run('failed')
+    assert not ledger.should_run('done')
+    assert not ledger.should_run('skipped')
+    assert ledger.should_run('never-registered')
+    assert [job['key'] for job in ledger.completed(['failed', 'done', 'skipped'])] == ['done', 'skipped']
+
+
+def test_backoff_doubles_per_attempt_up_to_the_cap(tmp_path):
+    ledger = JobLedger(str(tmp_path / 'jobs.sqlite3'), backoff_seconds=100)
+    ledger.register(['a'])
+    waits = []
+    for _ in range(5):
+        ledger.start('a')
+        ledger.fail('a', 'boom')
+        waits.append(ledger.get('a')['next_attempt_at'] - time.time())
+    ledger.close()
+
+    expected = [100, 200, 400, 800, 900]
+    assert all(abs(w - e) < 5 for w, e in zip(waits, expected)), waits
+
+
+def test_run_marks_keys_missing_from_outcomes_as_failed(ledger):
+    ledger.register(['a', 'b'])
+
+    async def job():
+        return 'result', {'a': ('done', 'a.json')}
+
+    assert asyncio.run(ledger.run(['a', 'b'], job)) == 'result'
+    assert ledger.get('a')['status'] == 'done'
+    assert ledger.get('a')['artifact_path'] == 'a.json'
+    assert ledger.get('b')['status'] == 'failed'
+    assert ledger.get('b')['last_error'] == 'no output produced'
+
+
+def test_run_retries_then_raises_when_attempts_run_out(ledger):
+    ledger.register(['a'])
+    calls = []
+
+    async def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError('transient')
+        return 'ok', {'a': ('done', None)}
+
+    assert asyncio.run(ledger.run(['a'], flaky)) == 'ok'
+    assert ledger.get('a')['attempts'] == 2
+
+    ledger.register(['b'])
+
+    async def broken():
+        raise RuntimeError('permanent')
+
+    with pytest.raises(RuntimeError, match='permanent'):
+        asyncio.run(ledger.run(['b'], broken))
+    job = ledger.get('b')
+    assert (job['status'], job['attempts']) == ('failed', 2)
+    assert job['last_error'] == 'RuntimeError: permanent'
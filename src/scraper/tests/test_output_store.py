@@ -0,0 +1,75 @@
+import json
+
+from scraper.output_store import RecordStore
+
+RECORDS = [
+    {'city_slug': 'boston-ma', 'city_name': 'Boston', 'zip_codes': ['02108', '02109']},
+    {'city_slug': 'cambridge-ma', 'city_name': 'Cambridge', 'geo': {'lat': 42.37, 'lng': None}},
+    {'city_slug': 'nuernberg-xx', 'city_name': 'Nürnberg', 'empty': {}, 'nested': [[], [1.5]]},
+]
+
+
+def _lines(path):
+    with open(path, 'rb') as f:
+        return f.read().splitlines()
+
+
+def test_partial_last_line_is_truncated_on_load(tmp_path):
+    path = tmp_path / 'cities.jsonl'
+    with RecordStore(path) as store:
+        store.upsert(RECORDS[0])
+        store.upsert(RECORDS[1])
+    good_size = path.stat().st_size
+    with open(path, 'ab') as f:
+        f.write(b'{"city_slug": "half-writ')
+
+    with RecordStore(path) as store:
+        assert len(store) == 2
+        assert path.stat().st_size == good_size
+        store.upsert(RECORDS[2])
+        assert [r['city_slug'] for r in store.records()] == [r['city_slug'] for r in RECORDS]
+
+
+def test_upsert_replaces_and_moves_record_to_the_end(tmp_path):
+    with RecordStore(tmp_path / 'cities.jsonl') as store:
+        for record in RECORDS:
+            store.upsert(record)
+        updated = dict(RECORDS[0], city_name='Boston (updated)')
+        store.upsert(updated)
+
+        assert len(store) == 3
+        assert list(store.records()) == [RECORDS[1], RECORDS[2], updated]
+        assert store.get('boston-ma') == updated
+        assert store.get('missing') is None
+
+
+def test_commit_compacts_dead_lines(tmp_path):
+    path = tmp_path / 'cities.jsonl'
+    with RecordStore(path) as store:
+        for record in RECORDS:
+            store.upsert(record)
+        store.upsert(RECORDS[0])
+        assert len(_lines(path)) == 4
+
+        store.commit()
+        assert len(_lines(path)) == 3
+        assert list(store.records()) == [RECORDS[1], RECORDS[2], RECORDS[0]]
+
+        # Appends after a compaction land in the new file.
+        store.upsert(RECORDS[1])
+
+    with RecordStore(path) as store:
+        assert list(store.records()) == [RECORDS[2], RECORDS[0], RECORDS[1]]
+
+
+def test_materialize_matches_json_dump(tmp_path):
+    with RecordStore(tmp_path / 'cities.jsonl') as store:
+        store.materialize(tmp_path / 'empty.json', indent=2)
+        for record in RECORDS:
+            store.upsert(record)
+        store.materialize(tmp_path / 'indented.json', indent=2)
+        store.materialize(tmp_path / 'compact.json')
+
+    assert (tmp_path / 'empty.json').read_text() == json.dumps([], indent=2)
+    assert (tmp_path / 'indented.json').read_bytes() == json.dumps(RECORDS, indent=2).encode('utf-8')
+    assert json.loads((tmp_path / 'compact.json').read_bytes()) == RECORDS
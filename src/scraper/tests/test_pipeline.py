@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from scraper.pipeline import PhaseGraph, PipelineAborted
+
+
+def test_nodes_see_their_dependencies_results():
+    async def first(results):
+        return 1
+
+    async def second(results):
+        return results['first'] + 1
+
+    graph = PhaseGraph().add('first', first).add('second', second, deps=('first',))
+    assert asyncio.run(graph.run()) == {'first': 1, 'second': 2}
+    assert graph.critical_path() == ['first', 'second']
+
+
+def test_unknown_dependency_is_rejected():
+    async def node(results):
+        return None
+
+    with pytest.raises(ValueError):
+        PhaseGraph().add('second', node, deps=('first',))
+
+
+def test_failure_cancels_running_nodes_and_skips_dependents():
+    events = []
+
+    async def fails(results):
+        await asyncio.sleep(0.01)
+        raise RuntimeError('phase failed')
+
+    async def slow(results):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            events.append('slow cancelled')
+            raise
+
+    async def dependent(results):
+        events.append('dependent ran')
+
+    graph = (PhaseGraph()
+             .add('fails', fails)
+             .add('slow', slow)
+             .add('dependent', dependent, deps=('fails',)))
+    with pytest.raises(RuntimeError, match='phase failed'):
+        asyncio.run(asyncio.wait_for(graph.run(), 1))
+    assert events == ['slow cancelled']
+    assert graph.timings == {}
+
+
+def test_pipeline_aborted_propagates_with_reason():
+    async def validate(results):
+        raise PipelineAborted('not a real city')
+
+    async def speculative(results):
+        await asyncio.sleep(10)
+
+    graph = PhaseGraph().add('validate', validate).add('speculative', speculative)
+    with pytest.raises(PipelineAborted) as excinfo:
+        asyncio.run(asyncio.wait_for(graph.run(), 1))
+    assert excinfo.value.reason == 'not a real city'
@@ -0,0 +1,55 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from scraper.rate_limiter import RateLimiter, parse_retry_after
+
+
+def _acquire(limiter: RateLimiter, times: int):
+    async def go():
+        for _ in range(times):
+            await limiter.acquire()
+    asyncio.run(go())
+
+
+def test_burst_is_free_then_steady_rate():
+    limiter = RateLimiter(calls_per_second=20, burst=3)
+    _acquire(limiter, 3)
+    assert limiter.waited_seconds == 0
+
+    _acquire(limiter, 1)
+    assert 0 < limiter.waited_seconds <= 0.05
+
+
+def test_penalize_pauses_bucket_and_drains_burst():
+    limiter = RateLimiter(calls_per_second=20, burst=5)
+    limiter.penalize(0.1)
+    assert limiter.throttled == 1
+
+    _acquire(limiter, 1)
+    assert limiter.waited_seconds >= 0.09
+
+    # No burst after the pause: the next call waits for the steady interval.
+    waited = limiter.waited_seconds
+    _acquire(limiter, 1)
+    assert limiter.waited_seconds > waited
+
+
+def test_parse_retry_after_delta_seconds():
+    assert parse_retry_after('120', 5.0) == 120.0
+    assert parse_retry_after(' 7 ', 5.0) == 7.0
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.now(timezone.utc) + timedelta(seconds=60)
+    seconds = parse_retry_after(format_datetime(when, usegmt=True), 5.0)
+    assert 55 <= seconds <= 60
+
+    past = datetime.now(timezone.utc) - timedelta(hours=1)
+    assert parse_retry_after(format_datetime(past, usegmt=True), 5.0) == 0.0
+
+
+def test_parse_retry_after_falls_back_to_default():
+    assert parse_retry_after(None, 5.0) == 5.0
+    assert parse_retry_after('', 5.0) == 5.0
+    assert parse_retry_after('soon', 5.0) == 5.0
@@ -0,0 +1,94 @@
+import asyncio
+
+from scraper.serper import SerperBatcher
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self._payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self._payload
+
+
+class FakeClient:
+    """Answers each query with one organic result titled after it."""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.bodies = []
+
+    async def post(self, url, json, headers, timeout):
+        self.bodies.append(json)
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        items = json if isinstance(json, list) else [json]
+        answers = [{'organic': [{'title': item['q'], 'link': 'https://example.gov',
+                                 'snippet': str(item['num'])}]} for item in items]
+        return FakeResponse(answers if isinstance(json, list) else answers[0])
+
+
+def _search_all(batcher, client, queries):
+    async def go():
+        return await asyncio.gather(
+            *(batcher.search(client, query, num) for query, num in queries),
+            return_exceptions=True,
+        )
+    return asyncio.run(go())
+
+
+def test_results_fan_out_to_each_caller():
+    batcher = SerperBatcher('key', max_batch=10, window_seconds=0.01)
+    client = FakeClient()
+    results = _search_all(batcher, client, [('a', 5), ('b', 3), ('a', 5)])
+
+    assert client.bodies == [[{'q': 'a', 'num': 5}, {'q': 'b', 'num': 3}]]
+    assert [r['organic_results'][0]['title'] for r in results] == ['a', 'b', 'a']
+    assert results[1]['organic_results'][0]['snippet'] == '3'
+    assert (batcher.queries, batcher.requests) == (2, 1)
+
+
+def test_full_batch_is_sent_without_waiting_for_the_window():
+    batcher = SerperBatcher('key', max_batch=2, window_seconds=10)
+    client = FakeClient()
+
+    async def go():
+        return await asyncio.wait_for(asyncio.gather(
+            batcher.search(client, 'a', 5), batcher.search(client, 'b', 5),
+        ), 1)
+
+    results = asyncio.run(go())
+    assert [r['organic_results'][0]['title'] for r in results] == ['a', 'b']
+    assert len(client.bodies) == 1
+
+
+def test_single_query_is_sent_as_an_object():
+    batcher = SerperBatcher('key', window_seconds=0)
+    client = FakeClient()
+    results = _search_all(batcher, client, [('only', 5)])
+
+    assert client.bodies == [{'q': 'only', 'num': 5}]
+    assert results[0]['organic_results'][0]['title'] == 'only'
+
+
+def test_request_error_fans_out_to_every_caller():
+    batcher = SerperBatcher('key', window_seconds=0.01)
+    client = FakeClient(error=RuntimeError('connection reset'))
+    results = _search_all(batcher, client, [('a', 5), ('b', 5), ('a', 5)])
+
+    assert len(client.bodies) == 1
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert not batcher._sending
+
+
+def test_short_batch_answer_fails_the_batch():
+    class ShortClient(FakeClient):
+        async def post(self, url, json, headers, timeout):
+            self.bodies.append(json)
+            return FakeResponse([{'organic': []}])
+
+    batcher = SerperBatcher('key', window_seconds=0.01)
+    results = _search_all(batcher, ShortClient(), [('a', 5), ('b', 5)])
+    assert all(isinstance(r, ValueError) for r in results)
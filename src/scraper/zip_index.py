@@ -0,0 +1,92 @@
+"""Offline ZIP (ZCTA) spatial index built from the Census Gazetteer file."""
+import csv
+import math
+import os
+from typing import Dict, List, Optional, Tuple
+
+from .config import ZCTA_GAZETTEER_PATH
+
+# Grid cell size in degrees (~11 km of latitude). A city viewport spans a
+# handful of cells, so a lookup touches a few dozen points at most.
+_CELL_DEGREES = 0.1
+
+
+class ZipIndex:
+    """
+    Uniform lat/lng grid over ZCTA internal points.
+
+    Loaded from the Census ZCTA Gazetteer (e.g. 2020_Gaz_zcta_national.txt:
+    tab-separated GEOID, ..., INTPTLAT, INTPTLONG). The Gazetteer has no
+    state column, so callers still apply their state prefix rules to what
+    zips_in_viewport returns.
+    """
+
+    def __init__(self, points: List[Tuple[str, float, float]]):
+        self.size = len(points)
+        self._cells: Dict[Tuple[int, int], List[Tuple[str, float, float]]] = {}
+        for point in points:
+            self._cells.setdefault(self._cell(point[1], point[2]), []).append(point)
+
+    @staticmethod
+    def _cell(lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / _CELL_DEGREES), math.floor(lng / _CELL_DEGREES)
+
+    @classmethod
+    def from_gazetteer(cls, path: str) -> 'ZipIndex':
+        """Parse a Gazetteer file (tab- or comma-separated, with header)."""
+        points = []
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            delimiter = '\t' if '\t' in f.readline() else ','
+            f.seek(0)
+            reader = csv.reader(f, delimiter=delimiter)
+            header = [h.strip().upper() for h in next(reader)]
+            zip_col = header.index('GEOID')
+            lat_col = header.index('INTPTLAT')
+            lng_col = header.index('INTPTLONG')
+            for row in reader:
+                try:
+                    zc = row[zip_col].strip().zfill(5)
+                    points.append((zc, float(row[lat_col]), float(row[lng_col])))
+                except (IndexError, ValueError):
+                    continue
+        return cls(points)
+
+    def zips_in_viewport(self, viewport: Dict) -> List[str]:
+        """Sorted ZIPs whose internal point lies inside a Geocoding viewport."""
+        ne = viewport.get('northeast') or {}
+        sw = viewport.get('southwest') or {}
+        if not ne or not sw:
+            return []
+        south, west = sw['lat'], sw['lng']
+        north, east = ne['lat'], ne['lng']
+        (row_lo, col_lo), (row_hi, col_hi) = self._cell(south, west), self._cell(north, east)
+
+        found = set()
+        for row in range(row_lo, row_hi + 1):
+            for col in range(col_lo, col_hi + 1):
+                for zc, lat, lng in self._cells.get((row, col), ()):
+                    if south <= lat <= north and west <= lng <= east:
+                        found.add(zc)
+        return sorted(found)
+
+
+_index: Optional[ZipIndex] = None
+_loaded = False
+
+
+def get_zip_index() -> Optional[ZipIndex]:
+    """
+    The process-wide index, loaded on first use.
+
+    Returns None when ZCTA_GAZETTEER_PATH is unset or unreadable, in which
+    case Phase 1 falls back to reverse geocoding.
+    """
+    global _index, _loaded
+    if not _loaded:
+        _loaded = True
+        if ZCTA_GAZETTEER_PATH and os.path.exists(ZCTA_GAZETTEER_PATH):
+            try:
+                _index = ZipIndex.from_gazetteer(ZCTA_GAZETTEER_PATH)
+            except (OSError, ValueError) as e:
+                print(f"Could not load ZCTA gazetteer {ZCTA_GAZETTEER_PATH}: {e}")
+    return _index